@@ -0,0 +1,116 @@
+"""
+Import time and time to first request of a freshly started API process.
+
+Imports person_tool.main in --runs fresh interpreters and reports how long the
+import took. Then starts `python -m person_tool.main` --runs times on a scratch
+port and measures, from the moment the process is spawned, how long until
+/system/ready first answers 200 and until the first users list request after
+it completes. That first request is timed on its own as well, next to a second
+identical one, to show what is left for it to warm up.
+
+Run from src/api against a scratch database:
+
+    python -m benchmarks.cold_start --runs 5
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from httpx import AsyncClient, HTTPError
+
+from person_tool.config import settings
+
+IMPORT_SCRIPT = (
+    "import time; start = time.perf_counter(); import person_tool.main; "
+    "print(time.perf_counter() - start)"
+)
+
+
+def measure_import() -> float:
+    out: str = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return float(out.split()[-1])
+
+
+async def measure_start(port: int, timeout: float) -> dict[str, float]:
+    env: dict[str, str] = {
+        **os.environ,
+        "APP_PORT": str(port),
+        "APP_RELOAD": "false",
+        "APP_WORKERS": "1",
+        "APP_LOG_LEVEL": "warning",
+    }
+    base: str = settings.app.base_api_url
+    start: float = time.perf_counter()
+    server = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "person_tool.main", env=env
+    )
+    try:
+        async with AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+            while True:
+                if time.perf_counter() - start > timeout:
+                    raise TimeoutError(f"server not ready after {timeout}s")
+                try:
+                    response = await client.get(f"{base}/system/ready")
+                    if response.status_code == 200:
+                        break
+                except HTTPError:
+                    pass
+                await asyncio.sleep(0.01)
+            ready: float = time.perf_counter() - start
+
+            requests: list[float] = []
+            for _ in range(2):
+                sent: float = time.perf_counter()
+                response = await client.get(f"{base}/users/", params={"limit": 50})
+                response.raise_for_status()
+                requests.append(time.perf_counter() - sent)
+    finally:
+        server.terminate()
+        await asyncio.wait_for(server.wait(), 30)
+    return {
+        "ready": ready,
+        "first_request": ready + requests[0],
+        "first_latency": requests[0],
+        "second_latency": requests[1],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+
+    imports: list[float] = [measure_import() for _ in range(args.runs)]
+    starts: list[dict[str, float]] = [
+        asyncio.run(measure_start(args.port, args.timeout)) for _ in range(args.runs)
+    ]
+
+    rows: dict[str, list[float]] = {
+        "import person_tool.main": imports,
+        "spawn -> /system/ready 200": [s["ready"] for s in starts],
+        "spawn -> first request done": [s["first_request"] for s in starts],
+        "first request latency": [s["first_latency"] for s in starts],
+        "second request latency": [s["second_latency"] for s in starts],
+    }
+    print(f"{'measure':<30} {'median ms':>10} {'min ms':>8} {'max ms':>8}")
+    for name, values in rows.items():
+        print(
+            f"{name:<30} {statistics.median(values) * 1000:>10.1f}"
+            f" {min(values) * 1000:>8.1f} {max(values) * 1000:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
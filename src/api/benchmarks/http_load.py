@@ -0,0 +1,696 @@
+"""
+Throughput and p50/p95/p99 latency of every API endpoint under concurrent load.
+
+Seeds people.users, people.jobs and people.user_relationships (recreating the
+schema from db/sql/tables.sql first with --reset), then runs --concurrency
+clients for --duration seconds, each picking its next request from a weighted
+mix of the users, jobs and system routes. Writes use rows the seed set aside,
+so repeated runs against the same data see the same table sizes.
+
+By default requests go through the ASGI app in-process, which isolates the
+repository and serialization layers from the network and server; pass --url
+to load a running server instead. Results are printed per endpoint, saved
+with --output, and compared with an earlier run's JSON with --baseline
+(exiting 1 if any endpoint regressed by more than --tolerance).
+
+Run against a scratch database (--reset drops the people and meta schemas):
+
+    python -m benchmarks.http_load --reset --duration 30 --output run.json
+    python -m benchmarks.http_load --duration 30 --baseline run.json
+    python -m benchmarks.http_load --mix users.get=1,users.list=1 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import collections.abc as c
+import itertools
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+
+from asyncpg import Connection, connect
+from httpx import ASGITransport, AsyncClient, HTTPError, Limits, Response
+
+from person_tool.config import settings
+from person_tool.main import app
+
+SCHEMA = Path(__file__).parent.parent / "person_tool" / "db" / "sql" / "tables.sql"
+API: str = settings.app.base_api_url
+# Rows per batch PATCH, batch DELETE and import request
+BATCH = 50
+
+
+@dataclass
+class Dataset:
+    """Seeded rows the scenarios pick from. Disposable rows are only deleted."""
+
+    users: list[str]
+    user_names: list[str]
+    jobs: list[str]
+    job_titles: list[str]
+    disposable_users: list[str]
+    disposable_jobs: list[str]
+    run: str = field(default_factory=lambda: uuid.uuid4().hex[:8])
+    serial: itertools.count = field(default_factory=itertools.count)
+
+    def new_id(self, prefix: str) -> str:
+        return f"{prefix}-{self.run}-{next(self.serial)}"
+
+
+Send = c.Callable[[AsyncClient, Dataset, random.Random], c.Awaitable[Response]]
+
+
+@dataclass(frozen=True, slots=True)
+class Scenario:
+    route: str
+    weight: int
+    expected: frozenset[int]
+    send: Send
+
+
+def _substring(rng: random.Random, value: str) -> str:
+    start: int = rng.randrange(max(len(value) - 3, 1))
+    return value[start : start + 3]
+
+
+def _take(rng: random.Random, pool: list[str], count: int = 1) -> list[str]:
+    # Falls back to unknown uids (a 404 / not-found path) once the pool runs dry
+    taken: list[str] = [pool.pop() for _ in range(min(count, len(pool)))]
+    return taken + [
+        str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(count - len(taken))
+    ]
+
+
+def _user(data: Dataset) -> dict[str, str]:
+    uid: str = data.new_id("load-u")
+    return {
+        "id": uid,
+        "firstName": "Load",
+        "lastName": uid,
+        "email": f"{uid}@example.com",
+    }
+
+
+def _job(data: Dataset) -> dict[str, str]:
+    return {
+        "id": data.new_id("load-j"),
+        "title": "Load",
+        "description": "load",
+        "status": "open",
+    }
+
+
+def _csv(rows: list[dict[str, str]]) -> str:
+    header: list[str] = list(rows[0])
+    lines = (",".join(row[column] for column in header) for row in rows)
+    return "\n".join((",".join(header), *lines)) + "\n"
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "users.list": Scenario(
+        "GET /users/",
+        10,
+        frozenset({200}),
+        lambda cl, d, r: cl.get(f"{API}/users/", params={"limit": 50}),
+    ),
+    "users.page": Scenario(
+        "GET /users/?cursor",
+        5,
+        frozenset({200}),
+        lambda cl, d, r: cl.get(f"{API}/users/", params={"limit": 50, "cursor": ""}),
+    ),
+    "users.search": Scenario(
+        "GET /users/?firstName",
+        10,
+        frozenset({200, 404}),
+        lambda cl, d, r: cl.get(
+            f"{API}/users/",
+            params={"firstName": _substring(r, r.choice(d.user_names)), "limit": 20},
+        ),
+    ),
+    "users.count": Scenario(
+        "GET /users/?totalCount",
+        2,
+        frozenset({200}),
+        lambda cl, d, r: cl.get(
+            f"{API}/users/", params={"limit": 20, "totalCount": "true"}
+        ),
+    ),
+    "users.get": Scenario(
+        "GET /users/{uid}",
+        20,
+        frozenset({200}),
+        lambda cl, d, r: cl.get(f"{API}/users/{r.choice(d.users)}"),
+    ),
+    "users.jobs": Scenario(
+        "GET /users/{uid}/jobs",
+        10,
+        frozenset({200}),
+        lambda cl, d, r: cl.get(f"{API}/users/{r.choice(d.users)}/jobs"),
+    ),
+    "users.export": Scenario(
+        "GET /users/export",
+        0,
+        frozenset({200}),
+        lambda cl, d, r: cl.get(f"{API}/users/export"),
+    ),
+    "users.create": Scenario(
+        "POST /users/",
+        3,
+        frozenset({201}),
+        lambda cl, d, r: cl.post(f"{API}/users/", json=[_user(d)]),
+    ),
+    "users.import": Scenario(
+        "POST /users/import",
+        1,
+        frozenset({201}),
+        lambda cl, d, r: cl.post(
+            f"{API}/users/import",
+            content=_csv([_user(d) for _ in range(BATCH)]),
+            headers={"Content-Type": "text/csv"},
+        ),
+    ),
+    "users.update": Scenario(
+        "PATCH /users/",
+        3,
+        frozenset({202}),
+        lambda cl, d, r: cl.patch(
+            f"{API}/users/",
+            json={"uid": r.choice(d.users), "lastName": d.new_id("load")},
+        ),
+    ),
+    "users.batch_update": Scenario(
+        "PATCH /users/batch",
+        1,
+        frozenset({200}),
+        lambda cl, d, r: cl.patch(
+            f"{API}/users/batch",
+            json=[
+                {"uid": uid, "lastName": d.new_id("load")}
+                for uid in r.sample(d.users, min(BATCH, len(d.users)))
+            ],
+        ),
+    ),
+    "users.delete": Scenario(
+        "DELETE /users/{uid}",
+        2,
+        frozenset({204, 404}),
+        lambda cl, d, r: cl.delete(f"{API}/users/{_take(r, d.disposable_users)[0]}"),
+    ),
+    "users.batch_delete": Scenario(
+        "DELETE /users/batch",
+        1,
+        frozenset({200}),
+        lambda cl, d, r: cl.request(
+            "DELETE", f"{API}/users/batch", json=_take(r, d.disposable_users, BATCH)
+        ),
+    ),
+    "jobs.list": Scenario(
+        "GET /jobs/",
+        5,
+        frozenset({200}),
+        lambda cl, d, r: cl.get(f"{API}/jobs/", params={"limit": 50}),
+    ),
+    "jobs.page": Scenario(
+        "GET /jobs/?cursor",
+        3,
+        frozenset({200}),
+        lambda cl, d, r: cl.get(f"{API}/jobs/", params={"limit": 50, "cursor": ""}),
+    ),
+    "jobs.search": Scenario(
+        "GET /jobs/?title",
+        5,
+        frozenset({200, 404}),
+        lambda cl, d, r: cl.get(
+            f"{API}/jobs/",
+            params={"title": _substring(r, r.choice(d.job_titles)), "limit": 20},
+        ),
+    ),
+    "jobs.get": Scenario(
+        "GET /jobs/{uid}",
+        10,
+        frozenset({200}),
+        lambda cl, d, r: cl.get(f"{API}/jobs/{r.choice(d.jobs)}"),
+    ),
+    "jobs.export": Scenario(
+        "GET /jobs/export",
+        0,
+        frozenset({200}),
+        lambda cl, d, r: cl.get(f"{API}/jobs/export"),
+    ),
+    "jobs.create": Scenario(
+        "POST /jobs/",
+        2,
+        frozenset({201}),
+        lambda cl, d, r: cl.post(f"{API}/jobs/", json=[_job(d)]),
+    ),
+    "jobs.import": Scenario(
+        "POST /jobs/import",
+        1,
+        frozenset({201}),
+        lambda cl, d, r: cl.post(
+            f"{API}/jobs/import",
+            content=_csv([_job(d) for _ in range(BATCH)]),
+            headers={"Content-Type": "text/csv"},
+        ),
+    ),
+    "jobs.update": Scenario(
+        "PATCH /jobs/",
+        2,
+        frozenset({202}),
+        lambda cl, d, r: cl.patch(
+            f"{API}/jobs/",
+            json={"uid": r.choice(d.jobs), "status": r.choice(("open", "closed"))},
+        ),
+    ),
+    "jobs.batch_update": Scenario(
+        "PATCH /jobs/batch",
+        1,
+        frozenset({200}),
+        lambda cl, d, r: cl.patch(
+            f"{API}/jobs/batch",
+            json=[
+                {"uid": uid, "status": r.choice(("open", "closed"))}
+                for uid in r.sample(d.jobs, min(BATCH, len(d.jobs)))
+            ],
+        ),
+    ),
+    "jobs.delete": Scenario(
+        "DELETE /jobs/{uid}",
+        1,
+        frozenset({204, 404}),
+        lambda cl, d, r: cl.delete(f"{API}/jobs/{_take(r, d.disposable_jobs)[0]}"),
+    ),
+    "jobs.batch_delete": Scenario(
+        "DELETE /jobs/batch",
+        1,
+        frozenset({200}),
+        lambda cl, d, r: cl.request(
+            "DELETE", f"{API}/jobs/batch", json=_take(r, d.disposable_jobs, BATCH)
+        ),
+    ),
+    "system.ready": Scenario(
+        "GET /system/ready",
+        1,
+        frozenset({200}),
+        lambda cl, d, r: cl.get(f"{API}/system/ready"),
+    ),
+    "system.metrics": Scenario(
+        "GET /system/metrics",
+        1,
+        frozenset({200}),
+        lambda cl, d, r: cl.get(f"{API}/system/metrics"),
+    ),
+    "system.cache": Scenario(
+        "GET /system/cache",
+        0,
+        frozenset({200}),
+        lambda cl, d, r: cl.get(f"{API}/system/cache"),
+    ),
+    "system.statements": Scenario(
+        "GET /system/statements",
+        0,
+        frozenset({200}),
+        lambda cl, d, r: cl.get(f"{API}/system/statements"),
+    ),
+}
+
+
+async def reset_schema(conn: Connection, schema: Path) -> None:
+    """Recreate the people and meta schemas from a tables.sql-style script."""
+    # Skip the psql-only CREATE DATABASE / \c preamble; the target is .env's database
+    script: str = "\n".join(
+        line
+        for line in schema.read_text().splitlines()
+        if not line.startswith(("\\", "CREATE DATABASE"))
+    )
+    await conn.execute("DROP SCHEMA IF EXISTS people, meta CASCADE")
+    await conn.execute(script)
+
+
+async def seed(
+    conn: Connection, users: int, jobs: int, jobs_per_user: int, disposable: int
+) -> None:
+    async def fill(
+        prefix: str, table: str, columns: str, values: str, rows: int
+    ) -> None:
+        existing, top = await conn.fetchrow(
+            f"""
+            SELECT count(*), coalesce(max(split_part(id, '-', 3)::int), 0)
+            FROM people.{table} WHERE id LIKE $1
+            """,
+            f"{prefix}-%",
+        )
+        if existing >= rows:
+            return
+        print(f"seeding {rows - existing} {prefix} rows...")
+        # Numbering continues past the highest id, so rows deleted by an earlier
+        # run are replaced without colliding with the ones that are left
+        await conn.execute(
+            f"""
+            INSERT INTO people.{table} (uid, created_at, id, {columns})
+            SELECT k, people.uuid7_time(k), '{prefix}-' || g, {values}
+            FROM (SELECT people.uuid7() AS k, g FROM generate_series($1::int, $2::int) g) s
+            """,
+            top + 1,
+            top + rows - existing,
+        )
+
+    user_values = (
+        "substr(md5(g::text), 1, 12), substr(md5((g * 7)::text), 1, 12), "
+        "'{prefix}-' || g || '@example.com'"
+    )
+    job_values = "'Job ' || substr(md5(g::text), 1, 10), md5((g * 3)::text), 'open'"
+    await fill(
+        "seed-u",
+        "users",
+        "first_name, last_name, email",
+        user_values.format(prefix="seed-u"),
+        users,
+    )
+    await fill(
+        "seed-x",
+        "users",
+        "first_name, last_name, email",
+        user_values.format(prefix="seed-x"),
+        disposable,
+    )
+    await fill("seed-j", "jobs", "title, description, status", job_values, jobs)
+    await fill("seed-y", "jobs", "title, description, status", job_values, disposable)
+    if await conn.fetchval("SELECT EXISTS (SELECT 1 FROM people.user_relationships)"):
+        return
+    await conn.execute(
+        """
+        INSERT INTO people.user_relationships (primary_uid, secondary_uid, relationship_type)
+        SELECT u.uid, j.uid, 'USER_JOB'
+        FROM (SELECT uid, row_number() OVER (ORDER BY uid) AS n
+              FROM people.users WHERE id LIKE 'seed-u-%') u
+        CROSS JOIN generate_series(0, $1 - 1) AS k
+        JOIN (SELECT uid, row_number() OVER (ORDER BY uid) - 1 AS n
+              FROM people.jobs WHERE id LIKE 'seed-j-%') j
+          ON j.n = (u.n * 7919 + k) % $2
+        ON CONFLICT DO NOTHING
+        """,
+        jobs_per_user,
+        jobs,
+    )
+    await conn.execute("ANALYZE people.users, people.jobs, people.user_relationships")
+
+
+async def load_dataset(conn: Connection, sample: int) -> Dataset:
+    async def rows(table: str, column: str, prefix: str, limit: int | None) -> list:
+        return await conn.fetch(
+            f"""
+            SELECT uid::text, {column} FROM people.{table}
+            WHERE id LIKE $1
+            ORDER BY random()
+            LIMIT $2
+            """,
+            f"{prefix}-%",
+            limit,
+        )
+
+    users = await rows("users", "first_name", "seed-u", sample)
+    jobs = await rows("jobs", "title", "seed-j", sample)
+    return Dataset(
+        users=[r[0] for r in users],
+        user_names=[r[1] for r in users],
+        jobs=[r[0] for r in jobs],
+        job_titles=[r[1] for r in jobs],
+        disposable_users=[r[0] for r in await rows("users", "id", "seed-x", None)],
+        disposable_jobs=[r[0] for r in await rows("jobs", "id", "seed-y", None)],
+    )
+
+
+@dataclass(slots=True)
+class Samples:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+
+
+async def drive(
+    client: AsyncClient,
+    mix: dict[str, int],
+    data: Dataset,
+    concurrency: int,
+    seconds: float,
+    seed: int,
+) -> dict[str, Samples]:
+    keys: list[str] = [key for key, weight in mix.items() if weight > 0]
+    weights: list[int] = [mix[key] for key in keys]
+    samples: dict[str, Samples] = {key: Samples() for key in keys}
+    deadline: float = time.perf_counter() + seconds
+
+    async def worker(rng: random.Random) -> None:
+        while time.perf_counter() < deadline:
+            key: str = rng.choices(keys, weights)[0]
+            scenario: Scenario = SCENARIOS[key]
+            start: float = time.perf_counter()
+            try:
+                response: Response = await scenario.send(client, data, rng)
+                ok: bool = response.status_code in scenario.expected
+            except HTTPError:
+                ok = False
+            samples[key].latencies.append(time.perf_counter() - start)
+            samples[key].errors += not ok
+
+    await asyncio.gather(*(worker(random.Random(seed + i)) for i in range(concurrency)))
+    return samples
+
+
+def summarize(samples: dict[str, Samples], elapsed: float) -> dict[str, dict]:
+    def stats(route: str, latencies: list[float], errors: int) -> dict:
+        ms: list[float] = sorted(x * 1000 for x in latencies)
+        q: list[float] = statistics.quantiles(ms, n=100) if len(ms) > 1 else ms * 99
+        return {
+            "route": route,
+            "requests": len(ms),
+            "errors": errors,
+            "throughput": len(ms) / elapsed,
+            "mean_ms": statistics.fmean(ms) if ms else 0.0,
+            "p50_ms": q[49] if ms else 0.0,
+            "p95_ms": q[94] if ms else 0.0,
+            "p99_ms": q[98] if ms else 0.0,
+        }
+
+    endpoints: dict[str, dict] = {
+        key: stats(SCENARIOS[key].route, s.latencies, s.errors)
+        for key, s in samples.items()
+    }
+    endpoints["total"] = stats(
+        "all requests",
+        [x for s in samples.values() for x in s.latencies],
+        sum(s.errors for s in samples.values()),
+    )
+    return endpoints
+
+
+def report(endpoints: dict[str, dict]) -> None:
+    print(
+        f"{'endpoint':<24} {'route':<26} {'req':>7} {'err':>5} {'req/s':>9}"
+        f" {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    )
+    for key, s in endpoints.items():
+        print(
+            f"{key:<24} {s['route']:<26} {s['requests']:>7} {s['errors']:>5}"
+            f" {s['throughput']:>9.1f} {s['p50_ms']:>8.2f} {s['p95_ms']:>8.2f}"
+            f" {s['p99_ms']:>8.2f}"
+        )
+
+
+def compare(
+    endpoints: dict[str, dict], baseline: dict[str, dict], tolerance: float
+) -> list[str]:
+    """
+    Print each endpoint's change against `baseline` and return the ones whose
+    p95 rose, or whose throughput fell, by more than `tolerance` (a fraction).
+    """
+    regressions: list[str] = []
+    print(f"\n{'endpoint':<24} {'p95 base':>9} {'p95 now':>9} {'Δ':>7} {'req/s Δ':>8}")
+    for key, now in endpoints.items():
+        base: dict | None = baseline.get(key)
+        if base is None or not base["requests"] or not now["requests"]:
+            continue
+        p95: float = now["p95_ms"] / base["p95_ms"] - 1 if base["p95_ms"] else 0.0
+        rps: float = now["throughput"] / base["throughput"] - 1
+        flag: str = ""
+        if p95 > tolerance or rps < -tolerance:
+            regressions.append(key)
+            flag = "  REGRESSION"
+        print(
+            f"{key:<24} {base['p95_ms']:>9.2f} {now['p95_ms']:>9.2f}"
+            f" {p95:>+7.0%} {rps:>+8.0%}{flag}"
+        )
+    return regressions
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    mix: dict[str, int] = {}
+    for item in filter(None, value.split(",")):
+        key, _, weight = item.partition("=")
+        if key not in SCENARIOS:
+            raise argparse.ArgumentTypeError(
+                f"unknown endpoint {key!r}; choose from {', '.join(SCENARIOS)}"
+            )
+        mix[key] = int(weight or 1)
+    return mix
+
+
+@dataclass(frozen=True, slots=True)
+class Options:
+    url: str | None
+    reset: bool
+    schema: Path
+    users: int
+    jobs: int
+    jobs_per_user: int
+    disposable: int
+    concurrency: int
+    duration: float
+    warmup: float
+    mix: dict[str, int]
+    seed: int
+
+
+async def run(options: Options) -> dict[str, dict]:
+    conn: Connection = await connect(
+        user=settings.database.user,
+        password=settings.database.password,
+        database=settings.database.db,
+        host=settings.database.host,
+        port=settings.database.port,
+    )
+    try:
+        if options.reset:
+            await reset_schema(conn, options.schema)
+        await seed(
+            conn, options.users, options.jobs, options.jobs_per_user, options.disposable
+        )
+        data: Dataset = await load_dataset(conn, sample=10_000)
+    finally:
+        await conn.close()
+
+    async def measure(client: AsyncClient) -> dict[str, Samples]:
+        if options.warmup:
+            await drive(
+                client,
+                options.mix,
+                data,
+                options.concurrency,
+                options.warmup,
+                options.seed,
+            )
+        return await drive(
+            client,
+            options.mix,
+            data,
+            options.concurrency,
+            options.duration,
+            options.seed,
+        )
+
+    if options.url:
+        limits = Limits(max_connections=options.concurrency)
+        async with AsyncClient(
+            base_url=options.url, limits=limits, timeout=60
+        ) as client:
+            samples = await measure(client)
+    else:
+        async with app.router.lifespan_context(app):
+            transport = ASGITransport(app=app)
+            async with AsyncClient(
+                transport=transport, base_url="http://bench", timeout=60
+            ) as client:
+                samples = await measure(client)
+    return summarize(samples, options.duration)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--url", help="Load a running server instead of the in-process app"
+    )
+    parser.add_argument(
+        "--reset", action="store_true", help="Recreate the schema from --schema first"
+    )
+    parser.add_argument("--schema", type=Path, default=SCHEMA)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--jobs", type=int, default=20_000)
+    parser.add_argument("--jobs-per-user", type=int, default=3)
+    parser.add_argument(
+        "--disposable",
+        type=int,
+        default=20_000,
+        help="Rows per table set aside for DELETE",
+    )
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default={},
+        help="Comma-separated endpoint=weight pairs; replaces the default mix",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the request mix")
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    parser.add_argument(
+        "--baseline", type=Path, help="Compare with an earlier --output"
+    )
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    args = parser.parse_args()
+
+    options = Options(
+        url=args.url,
+        reset=args.reset,
+        schema=args.schema,
+        users=args.users,
+        jobs=args.jobs,
+        jobs_per_user=args.jobs_per_user,
+        disposable=args.disposable,
+        concurrency=args.concurrency,
+        duration=args.duration,
+        warmup=args.warmup,
+        mix=args.mix or {key: s.weight for key, s in SCENARIOS.items()},
+        seed=args.seed,
+    )
+    endpoints: dict[str, dict] = asyncio.run(run(options))
+    report(endpoints)
+
+    if args.output:
+        config = {
+            k: str(v) if isinstance(v, Path) else v for k, v in asdict(options).items()
+        }
+        result = {
+            "created_at": datetime.now(UTC).isoformat(),
+            "python": platform.python_version(),
+            "config": config,
+            "endpoints": endpoints,
+        }
+        args.output.write_text(json.dumps(result, indent=2) + "\n")
+    if args.baseline:
+        baseline: dict = json.loads(args.baseline.read_text())
+        differing: list[str] = [
+            name
+            for name in ("url", "concurrency", "mix", "users", "jobs")
+            if baseline["config"].get(name) != getattr(options, name)
+        ]
+        if differing:
+            print(f"\nnote: baseline was run with different {', '.join(differing)}")
+        regressions = compare(endpoints, baseline["endpoints"], args.tolerance)
+        if regressions:
+            print(
+                f"\n{len(regressions)} endpoint(s) regressed beyond {args.tolerance:.0%}"
+            )
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
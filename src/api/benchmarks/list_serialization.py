@@ -0,0 +1,103 @@
+"""
+Latency of GET /users?limit=1000 before and after the zero-revalidation read path.
+
+"before" is a stand-in route with the previous shape: every row goes through
+UserResponse.model_validate(dict(r)) and FastAPI validates and serializes the
+returned models against response_model. "after" is the real users router,
+which builds rows with model_construct and returns pre-serialized bytes.
+
+Run against a scratch database that has db/sql/schema.pgsql applied:
+
+    python -m benchmarks.list_serialization --requests 200
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from person_tool.config import settings
+from person_tool.db.core import people_management_db
+from person_tool.main import app
+from person_tool.users.models import UserResponse
+
+LIMIT = 1000
+
+legacy = FastAPI()
+
+
+@legacy.get("/users", response_model=list[UserResponse])
+async def legacy_get_users(limit: int = LIMIT) -> list[UserResponse]:
+    async with people_management_db.connection() as con:
+        rows = await con.fetch(
+            """
+            SELECT uid, id, first_name, last_name, email, created_at
+            FROM people.users
+            ORDER BY created_at DESC, uid DESC
+            LIMIT $1
+            """,
+            limit,
+        )
+    return [UserResponse.model_validate(dict(r)) for r in rows]
+
+
+async def seed(rows: int) -> None:
+    async with people_management_db.connection() as con:
+        existing: int = await con.fetchval("SELECT count(*) FROM people.users")
+        if existing >= rows:
+            return
+        await con.execute(
+            """
+            INSERT INTO people.users (id, first_name, last_name, email)
+            SELECT 'bench-' || g, 'First' || g, 'Last' || g,
+                   'bench-' || g || '@example.com'
+            FROM generate_series($1::int, $2::int) AS g
+            """,
+            existing + 1,
+            rows,
+        )
+
+
+async def measure(target: FastAPI, url: str, requests: int) -> list[float]:
+    samples: list[float] = []
+    transport = ASGITransport(app=target)
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(requests):
+            start = time.perf_counter()
+            response = await client.get(url, params={"limit": LIMIT})
+            response.raise_for_status()
+            samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def summary(samples: list[float]) -> str:
+    q = statistics.quantiles(samples, n=100)
+    return f"p50 {q[49]:7.2f} ms  p95 {q[94]:7.2f} ms  mean {statistics.mean(samples):7.2f} ms"
+
+
+async def main(requests: int) -> None:
+    await people_management_db.startup()
+    try:
+        await seed(LIMIT)
+        # Warm up connections and statement caches before measuring
+        await measure(legacy, "/users", 5)
+        await measure(app, f"{settings.app.base_api_url}/users/", 5)
+        before = await measure(legacy, "/users", requests)
+        after = await measure(app, f"{settings.app.base_api_url}/users/", requests)
+    finally:
+        await people_management_db.shutdown()
+
+    print(f"limit={LIMIT}, {requests} sequential requests")
+    print(f"before  {summary(before)}")
+    print(f"after   {summary(after)}")
+    print(f"speedup {statistics.median(before) / statistics.median(after):.1f}x (p50)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(requests=args.requests))
@@ -0,0 +1,97 @@
+"""
+Filtered-search latency on people.users with and without the pg_trgm indexes.
+
+Seeds people.users up to --rows rows, then times UserRepository.get_users for a
+set of substring filters twice: once with index scans disabled for the session
+(the sequential scan every ILIKE filter paid before the trigram indexes) and
+once with the planner free to use them.
+
+Run against a scratch database that has db/sql/schema.pgsql applied:
+
+    python -m benchmarks.trigram_search --rows 1000000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from asyncpg import Connection, connect
+
+from person_tool.config import settings
+from person_tool.users.repository import UserRepository
+
+SEARCHES: list[dict[str, str | None]] = [
+    {"user_id": "12345", "first_name": None, "last_name": None},
+    {"user_id": None, "first_name": "abc", "last_name": None},
+    {"user_id": None, "first_name": None, "last_name": "f00d"},
+    {"user_id": "999", "first_name": "a", "last_name": None},
+]
+
+
+async def seed(conn: Connection, rows: int) -> None:
+    existing: int = await conn.fetchval("SELECT count(*) FROM people.users")
+    if existing >= rows:
+        return
+    print(f"seeding {rows - existing} users...")
+    await conn.execute(
+        """
+        INSERT INTO people.users (id, first_name, last_name, email)
+        SELECT 'bench-' || g,
+               substr(md5(g::text), 1, 12),
+               substr(md5((g * 7)::text), 1, 12),
+               'bench-' || g || '@example.com'
+        FROM generate_series($1::int, $2::int) AS g
+        """,
+        existing + 1,
+        rows,
+    )
+    await conn.execute("ANALYZE people.users")
+
+
+async def measure(repository: UserRepository, repeat: int) -> dict[str, float]:
+    timings: dict[str, float] = {}
+    for search in SEARCHES:
+        samples: list[float] = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            await repository.get_users(**search, limit=10, offset=0)
+            samples.append(time.perf_counter() - start)
+        label = ", ".join(f"{k}={v}" for k, v in search.items() if v is not None)
+        timings[label] = statistics.median(samples) * 1000
+    return timings
+
+
+async def main(rows: int, repeat: int) -> None:
+    conn: Connection = await connect(
+        user=settings.database.user,
+        password=settings.database.password,
+        database=settings.database.db,
+        host=settings.database.host,
+        port=settings.database.port,
+    )
+    try:
+        await seed(conn, rows)
+        repository = UserRepository(conn)
+
+        await conn.execute("SET enable_indexscan = off; SET enable_bitmapscan = off")
+        before = await measure(repository, repeat)
+        await conn.execute("RESET enable_indexscan; RESET enable_bitmapscan")
+        after = await measure(repository, repeat)
+    finally:
+        await conn.close()
+
+    print(f"{'filter':<40} {'seq scan ms':>12} {'trigram ms':>12} {'speedup':>8}")
+    for label in before:
+        print(
+            f"{label:<40} {before[label]:>12.2f} {after[label]:>12.2f}"
+            f" {before[label] / after[label]:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(rows=args.rows, repeat=args.repeat))
@@ -0,0 +1,53 @@
+"""
+Per-id cost of uuid.uuid4(), uuid7() and uuid7_batch().
+
+Mints --count ids with each generator, --repeat times, and reports the best
+run in nanoseconds per id. uuid7_batch is timed both returning UUID objects
+and returning raw 16-byte buffers (as_bytes=True), the form import staging
+copies into the database.
+
+No database needed:
+
+    python -m benchmarks.uuid_generation --count 100000
+"""
+
+import argparse
+import collections.abc as c
+import time
+import uuid
+
+from person_tool.utils.uuid7 import uuid7, uuid7_batch
+
+GENERATORS: dict[str, c.Callable[[int], list]] = {
+    "uuid4()": lambda n: [uuid.uuid4() for _ in range(n)],
+    "uuid7()": lambda n: [uuid7() for _ in range(n)],
+    "uuid7_batch(n)": uuid7_batch,
+    "uuid7_batch(n, as_bytes=True)": lambda n: uuid7_batch(n, as_bytes=True),
+}
+
+
+def measure(generate: c.Callable[[int], list], count: int, repeat: int) -> float:
+    best: float = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        generate(count)
+        best = min(best, time.perf_counter() - start)
+    return best / count * 1e9
+
+
+def main(count: int, repeat: int) -> None:
+    results: dict[str, float] = {
+        name: measure(generate, count, repeat) for name, generate in GENERATORS.items()
+    }
+    baseline: float = results["uuid4()"]
+    print(f"{'generator':<32} {'ns/id':>8} {'vs uuid4':>9}")
+    for name, ns in results.items():
+        print(f"{name:<32} {ns:>8.0f} {baseline / ns:>8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(count=args.count, repeat=args.repeat)
@@ -0,0 +1,100 @@
+"""
+Insert throughput and primary key index size for uuid4 versus uuid7 keys.
+
+Creates a scratch temp table shaped like people.users per key kind, then
+inserts --rows rows into each in batches of --batch, minting keys in Python.
+Random uuid4 keys land all over the btree and split pages as they go. uuid7()
+keys are time-ordered only to the millisecond, so ids minted in the same ms
+still arrive in random order; uuid7_batch(), which the API uses, keeps them
+strictly increasing so every insert appends to the btree's right-hand edge.
+
+Run against a scratch database that has db/sql/schema.pgsql applied:
+
+    python -m benchmarks.uuid_keys --rows 1000000
+"""
+
+import argparse
+import asyncio
+import collections.abc as c
+import time
+import uuid
+from datetime import UTC, datetime
+
+from asyncpg import Connection, connect
+
+from person_tool.config import settings
+from person_tool.utils.uuid7 import uuid7, uuid7_batch
+
+KEYS: dict[str, c.Callable[[int], list[uuid.UUID]]] = {
+    "uuid4": lambda n: [uuid.uuid4() for _ in range(n)],
+    "uuid7": lambda n: [uuid7() for _ in range(n)],
+    "uuid7_batch": uuid7_batch,
+}
+
+
+async def measure(
+    conn: Connection,
+    name: str,
+    keys: c.Callable[[int], list[uuid.UUID]],
+    rows: int,
+    batch: int,
+) -> tuple[float, int]:
+    table: str = f"bench_{name}_keys"
+    await conn.execute(
+        f"""
+        CREATE TEMP TABLE {table} (
+            uid        uuid PRIMARY KEY,
+            id         text        NOT NULL,
+            email      text        NOT NULL,
+            created_at timestamptz NOT NULL
+        )
+        """
+    )
+    now: datetime = datetime.now(UTC)
+    start: float = time.perf_counter()
+    for offset in range(0, rows, batch):
+        count: int = min(batch, rows - offset)
+        await conn.copy_records_to_table(
+            table,
+            records=[
+                (uid, f"bench-{i}", f"bench-{i}@example.com", now)
+                for i, uid in enumerate(keys(count), start=offset)
+            ],
+        )
+    elapsed: float = time.perf_counter() - start
+    size: int = await conn.fetchval(
+        "SELECT pg_relation_size($1::regclass)", f"{table}_pkey"
+    )
+    return elapsed, size
+
+
+async def main(rows: int, batch: int) -> None:
+    conn: Connection = await connect(
+        user=settings.database.user,
+        password=settings.database.password,
+        database=settings.database.db,
+        host=settings.database.host,
+        port=settings.database.port,
+    )
+    try:
+        # Keep the temp tables' indexes from being served out of local buffers
+        # alone, so page splits cost what they would on a real table
+        await conn.execute("SET temp_buffers = '8MB'")
+        results: dict[str, tuple[float, int]] = {
+            name: await measure(conn, name, keys, rows, batch)
+            for name, keys in KEYS.items()
+        }
+    finally:
+        await conn.close()
+
+    print(f"{'key':<12} {'rows/s':>12} {'pkey MB':>10}")
+    for name, (elapsed, size) in results.items():
+        print(f"{name:<12} {rows / elapsed:>12,.0f} {size / 2**20:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=10_000)
+    args = parser.parse_args()
+    asyncio.run(main(rows=args.rows, batch=args.batch))
@@ -0,0 +1,106 @@
+"""
+Throughput of the API served by one uvicorn worker versus --workers workers.
+
+Starts `python -m person_tool.main` with APP_WORKERS=1 and then with
+APP_WORKERS=N on a scratch port, waits for /system/ready, and loads each with
+the http_load request mix over real HTTP. Both runs share the same
+POSTGRES_MAX_POOL_SIZE budget, which the workers split between them.
+
+Run from src/api against a scratch database (seeded by http_load if needed):
+
+    python -m benchmarks.workers --workers 4 --concurrency 64 --duration 20
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from httpx import AsyncClient, HTTPError
+
+from benchmarks.http_load import SCENARIOS, SCHEMA, Options, parse_mix, run
+from person_tool.config import WORKER_SIDE_CONNECTIONS, settings
+
+
+async def wait_ready(url: str, timeout: float = 30.0) -> None:
+    deadline: float = time.perf_counter() + timeout
+    async with AsyncClient(base_url=url) as client:
+        while time.perf_counter() < deadline:
+            try:
+                response = await client.get(f"{settings.app.base_api_url}/system/ready")
+                if response.status_code == 200:
+                    return
+            except HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise TimeoutError(f"server at {url} not ready after {timeout}s")
+
+
+async def measure(workers: int, port: int, options: Options) -> dict:
+    env: dict[str, str] = {
+        **os.environ,
+        "APP_WORKERS": str(workers),
+        "APP_PORT": str(port),
+        "APP_RELOAD": "false",
+        "APP_LOG_LEVEL": "warning",
+    }
+    server = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "person_tool.main", env=env
+    )
+    try:
+        await wait_ready(options.url or "")
+        endpoints: dict[str, dict] = await run(options)
+    finally:
+        server.terminate()
+        await asyncio.wait_for(server.wait(), 30)
+    return endpoints["total"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--jobs", type=int, default=20_000)
+    parser.add_argument("--mix", type=parse_mix, default={})
+    args = parser.parse_args()
+
+    options = Options(
+        url=f"http://127.0.0.1:{args.port}",
+        reset=False,
+        schema=SCHEMA,
+        users=args.users,
+        jobs=args.jobs,
+        jobs_per_user=3,
+        disposable=20_000,
+        concurrency=args.concurrency,
+        duration=args.duration,
+        warmup=args.warmup,
+        mix=args.mix or {key: s.weight for key, s in SCENARIOS.items()},
+        seed=0,
+    )
+    results: dict[int, dict] = {
+        workers: asyncio.run(measure(workers, args.port, options))
+        for workers in dict.fromkeys((1, args.workers))
+    }
+
+    budget: int = settings.database.max_pool_size
+    print(
+        f"{'workers':>7} {'pool/worker':>11} {'req/s':>9} {'p50 ms':>8}"
+        f" {'p95 ms':>8} {'p99 ms':>8} {'speedup':>8}"
+    )
+    for workers, total in results.items():
+        pool: int = budget // workers - WORKER_SIDE_CONNECTIONS
+        print(
+            f"{workers:>7} {pool:>11} {total['throughput']:>9.1f}"
+            f" {total['p50_ms']:>8.2f} {total['p95_ms']:>8.2f} {total['p99_ms']:>8.2f}"
+            f" {total['throughput'] / results[1]['throughput']:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
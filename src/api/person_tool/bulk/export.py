@@ -0,0 +1,64 @@
+import collections.abc as c
+import csv
+import io
+import json
+import typing as t
+from datetime import datetime
+from uuid import UUID
+
+from asyncpg.protocol.protocol import Record  # type: ignore
+from pydantic.alias_generators import to_camel
+
+ExportFormat = t.Literal["ndjson", "csv"]
+
+EXPORT_MEDIA_TYPES: dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# Rows encoded per yielded chunk; keeps writes large without buffering the table
+EXPORT_CHUNK_ROWS = 1000
+
+
+def _plain(value: t.Any) -> t.Any:
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+async def encode_records(
+    records: c.AsyncIterator[Record],
+    *,
+    columns: tuple[str, ...],
+    fmt: ExportFormat,
+) -> c.AsyncIterator[bytes]:
+    """
+    Encode rows as NDJSON or CSV as they arrive, using the API's camelCase
+    field names, and yield them in chunks of `EXPORT_CHUNK_ROWS` rows.
+    """
+    names: list[str] = [to_camel(col) for col in columns]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if fmt == "csv":
+        writer.writerow(names)
+
+    rows = 0
+    async for record in records:
+        values = [_plain(record[col]) for col in columns]
+        if fmt == "csv":
+            writer.writerow(values)
+        else:
+            buffer.write(json.dumps(dict(zip(names, values))))
+            buffer.write("\n")
+        rows += 1
+        if rows % EXPORT_CHUNK_ROWS == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+__all__ = ["EXPORT_MEDIA_TYPES", "ExportFormat", "encode_records"]
@@ -0,0 +1,59 @@
+import collections.abc as c
+import time
+import typing as t
+
+from pydantic import BaseModel, ValidationError
+
+from person_tool.bulk.models import ImportReport
+from person_tool.bulk.parsing import ParsedRecord
+from person_tool.timings import record_timing
+
+IMPORT_BATCH_SIZE = 5000
+
+
+def format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(loc) for loc in e['loc'])}: {e['msg']}" for e in error.errors()
+    )
+
+
+async def stage_records(
+    records: c.AsyncIterator[ParsedRecord],
+    *,
+    model: type[BaseModel],
+    columns: tuple[str, ...],
+    stage: c.Callable[[list[tuple[t.Any, ...]]], c.Awaitable[None]],
+) -> ImportReport:
+    """
+    Validate each parsed record against `model` and hand valid rows to `stage`
+    in batches of `IMPORT_BATCH_SIZE` as `(line, *columns)` tuples, so memory
+    stays flat regardless of payload size.
+    """
+    report = ImportReport()
+    batch: list[tuple[t.Any, ...]] = []
+    validation: float = 0.0
+    async for line, data, error in records:
+        report.received += 1
+        if error is None:
+            start: float = time.perf_counter()
+            try:
+                item = model.model_validate(data)
+            except ValidationError as e:
+                error = format_validation_error(e)
+            else:
+                batch.append((line, *(getattr(item, col) for col in columns)))
+            validation += time.perf_counter() - start
+        if error is not None:
+            raw_id = (data or {}).get("id")
+            report.reject(line, error, id=None if raw_id is None else str(raw_id))
+            continue
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            await stage(batch)
+            batch = []
+    if batch:
+        await stage(batch)
+    record_timing("validation", validation)
+    return report
+
+
+__all__ = ["stage_records"]
@@ -0,0 +1,46 @@
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic.alias_generators import to_camel
+
+MAX_REPORTED_REJECTS = 1000
+# Upper bound on uids per batch update/delete request
+MAX_BATCH_SIZE = 5000
+
+
+class BatchDeleteResponse(BaseModel):
+    deleted: list[UUID]
+    not_found: list[UUID]
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+
+class ImportReject(BaseModel):
+    line: int
+    id: str | None = None
+    reason: str
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+
+class ImportReport(BaseModel):
+    received: int = 0
+    inserted: int = 0
+    rejected: int = 0
+    rejects: list[ImportReject] = Field(
+        default_factory=list,
+        description=f"First {MAX_REPORTED_REJECTS} rejected rows, by line",
+    )
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    def reject(self, line: int, reason: str, id: str | None = None) -> None:
+        self.rejected += 1
+        if len(self.rejects) < MAX_REPORTED_REJECTS:
+            self.rejects.append(ImportReject(line=line, id=id, reason=reason))
+
+    def add_rejects(self, total: int, rejects: list[ImportReject]) -> None:
+        self.rejected += total
+        self.rejects = sorted(self.rejects + rejects, key=lambda r: r.line)[
+            :MAX_REPORTED_REJECTS
+        ]
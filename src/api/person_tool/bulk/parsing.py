@@ -0,0 +1,142 @@
+import collections.abc as c
+import csv
+import json
+import typing as t
+
+NDJSON_CONTENT_TYPES = frozenset(
+    {"application/x-ndjson", "application/ndjson", "application/jsonl"}
+)
+CSV_CONTENT_TYPES = frozenset({"text/csv"})
+
+# (line number, parsed object or None, parse error or None)
+ParsedRecord = tuple[int, dict[str, t.Any] | None, str | None]
+# (text or None, error or None)
+Line = tuple[str | None, str | None]
+
+INVALID_UTF8 = "Invalid UTF-8"
+LINE_TOO_LONG = "Line too long"
+# Far beyond any valid row; bounds what one line can make the server buffer
+MAX_LINE_BYTES = 1024 * 1024
+
+
+def is_supported(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type in NDJSON_CONTENT_TYPES | CSV_CONTENT_TYPES
+
+
+def _decode(line: bytes) -> Line:
+    try:
+        return line.decode().rstrip("\r"), None
+    except UnicodeDecodeError:
+        return None, INVALID_UTF8
+
+
+async def aiter_lines(
+    chunks: c.AsyncIterator[bytes], max_line: int = MAX_LINE_BYTES
+) -> c.AsyncIterator[Line]:
+    """
+    Split a byte stream into text lines, holding at most `max_line` bytes of
+    a partial line and scanning each chunk once. A line that isn't valid
+    UTF-8 or is longer than `max_line` comes out as an error instead, so it
+    can be rejected on its own; the rest of an over-long line is skipped.
+    """
+    parts: list[bytes] = []
+    size = 0
+    skipping = False
+    async for chunk in chunks:
+        start = 0
+        while (end := chunk.find(b"\n", start)) != -1:
+            piece, start = chunk[start:end], end + 1
+            if skipping:
+                # The over-long line was already reported
+                skipping = False
+            elif size + len(piece) > max_line:
+                yield None, LINE_TOO_LONG
+            else:
+                parts.append(piece)
+                yield _decode(b"".join(parts))
+            parts, size = [], 0
+        rest = chunk[start:]
+        if skipping or not rest:
+            continue
+        if size + len(rest) > max_line:
+            yield None, LINE_TOO_LONG
+            parts, size, skipping = [], 0, True
+            continue
+        parts.append(rest)
+        size += len(rest)
+    if parts:
+        yield _decode(b"".join(parts))
+
+
+async def _aiter_ndjson(
+    lines: c.AsyncIterator[Line],
+) -> c.AsyncIterator[ParsedRecord]:
+    line_no = 0
+    async for line, error in lines:
+        line_no += 1
+        if line is None:
+            yield line_no, None, error
+            continue
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_no, None, f"Invalid JSON: {e.msg}"
+            continue
+        if not isinstance(data, dict):
+            yield line_no, None, "Expected a JSON object"
+            continue
+        yield line_no, data, None
+
+
+async def _aiter_csv(
+    lines: c.AsyncIterator[Line],
+) -> c.AsyncIterator[ParsedRecord]:
+    header: list[str] | None = None
+    line_no = 0
+    start = 0
+    pending: list[str] = []
+    async for line, error in lines:
+        line_no += 1
+        if not pending:
+            start = line_no
+        if line is None:
+            # Drops the whole record, even if it began on an earlier line
+            yield start, None, error
+            pending = []
+            continue
+        pending.append(line)
+        # A quoted field spanning lines leaves an odd number of quotes behind
+        if sum(part.count('"') for part in pending) % 2:
+            continue
+        record, pending = "\n".join(pending), []
+        if not record.strip():
+            continue
+        values: list[str] = next(csv.reader([record]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield start, None, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        yield start, dict(zip(header, values)), None
+    if pending:
+        yield start, None, "Unterminated quoted field"
+
+
+def aiter_records(
+    chunks: c.AsyncIterator[bytes], content_type: str
+) -> c.AsyncIterator[ParsedRecord]:
+    """
+    Parse an NDJSON or CSV (with header row) request body into one record per
+    row, reporting rows that can't be parsed instead of failing the stream.
+    """
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    if media_type in CSV_CONTENT_TYPES:
+        return _aiter_csv(aiter_lines(chunks))
+    return _aiter_ndjson(aiter_lines(chunks))
+
+
+__all__ = ["ParsedRecord", "aiter_records", "is_supported"]
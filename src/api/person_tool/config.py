@@ -1,12 +1,19 @@
 import logging
 import typing as t
+from functools import cache
 
-from pydantic import Field
+from dotenv import load_dotenv
+from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 log = logging.getLogger(__name__)
 
 
+# Connections each worker holds to the primary outside its pool: the LISTEN
+# connection for cache invalidations and the health probe's
+WORKER_SIDE_CONNECTIONS = 2
+
+
 class DatabaseSettings(BaseSettings):
     host: str
     port: int
@@ -14,11 +21,28 @@ class DatabaseSettings(BaseSettings):
     user: str
     password: str
     min_pool_size: int
+    # Primary connection budget for all API workers together, including each
+    # worker's LISTEN and health probe connections; see `worker_pool_sizes`
     max_pool_size: int
     command_timeout: t.Optional[float] = Field(default=None)
+    # Read replicas as "host:port" (or "host" to reuse `port`), same credentials
+    replica_hosts: list[str] = Field(default_factory=list)
+    replica_selection: t.Literal["round_robin", "least_busy"] = Field(
+        default="round_robin"
+    )
+    replica_max_lag: float = Field(default=5.0)
+    replica_lag_check_interval: float = Field(default=1.0)
+    # X-Total-Count is counted exactly up to this many rows, estimated past it
+    exact_count_limit: int = Field(default=1000)
+    # Background probe over a reserved connection; /system/ready and /live
+    # answer from its last result instead of checking out a pooled connection
+    health_check_interval: float = Field(default=1.0, gt=0)
+    health_check_timeout: float = Field(default=2.0, gt=0)
+    health_max_staleness: float = Field(default=5.0, gt=0)
+    # Seconds a request may wait for a pooled connection before a 503
+    acquire_timeout: float = Field(default=2.0, gt=0)
 
     model_config = SettingsConfigDict(
-        env_file=".env",
         env_prefix="POSTGRES_",
         case_sensitive=False,
         extra="ignore",
@@ -33,27 +57,126 @@ class ApplicationSettings(BaseSettings):
     reload: bool
     log_level: str
     base_api_url: str
+    # Requests slower than this many seconds are logged with a timing breakdown
+    slow_request_threshold: float = Field(default=1.0)
+    # Server processes, each with its own event loop and connection pools
+    workers: int = Field(default=1, ge=1)
 
     model_config = SettingsConfigDict(
-        env_file=".env",
         env_prefix="APP_",
         case_sensitive=False,
         extra="ignore",
     )
 
 
+class CacheSettings(BaseSettings):
+    max_size: int = Field(default=10_000)
+    ttl: float = Field(default=30.0)
+
+    model_config = SettingsConfigDict(
+        env_prefix="CACHE_",
+        case_sensitive=False,
+        extra="ignore",
+    )
+
+
+class AdmissionSettings(BaseSettings):
+    # Concurrent requests per route class in each worker. Unset limits scale
+    # with the worker's share of the pool; see AdmissionMiddleware
+    read_limit: int | None = Field(default=None, ge=1)
+    write_limit: int | None = Field(default=None, ge=1)
+    bulk_limit: int | None = Field(default=None, ge=1)
+    # Seconds a request may wait for a slot in its class before a 503
+    queue_timeout: float = Field(default=0.5, ge=0)
+    # Sent as Retry-After on every 503 the admission layer returns
+    retry_after: int = Field(default=1, ge=0)
+
+    model_config = SettingsConfigDict(
+        env_prefix="ADMISSION_",
+        case_sensitive=False,
+        extra="ignore",
+    )
+
+
+class DeadlineSettings(BaseSettings):
+    # Seconds a request may run, SQL included, before it is answered with 504
+    timeout: float = Field(default=30.0, gt=0)
+    # Per-route overrides keyed by path under APP_BASE_API_URL, longest
+    # matching prefix first
+    routes: dict[str, float] = Field(
+        default_factory=lambda: {
+            "/users/export": 300.0,
+            "/jobs/export": 300.0,
+            "/users/import": 300.0,
+            "/jobs/import": 300.0,
+        }
+    )
+    # Upper bound on the deadline a client asks for in X-Request-Timeout
+    max_timeout: float = Field(default=300.0, gt=0)
+
+    model_config = SettingsConfigDict(
+        env_prefix="DEADLINE_",
+        case_sensitive=False,
+        extra="ignore",
+    )
+
+
 class Settings(BaseSettings):
     app: ApplicationSettings = Field(default_factory=lambda: ApplicationSettings())  # type: ignore
     database: DatabaseSettings = Field(default_factory=lambda: DatabaseSettings())  # type: ignore
+    cache: CacheSettings = Field(default_factory=lambda: CacheSettings())
+    admission: AdmissionSettings = Field(default_factory=lambda: AdmissionSettings())
+    deadline: DeadlineSettings = Field(default_factory=lambda: DeadlineSettings())
+
+    model_config = SettingsConfigDict(extra="ignore")
+
+    @model_validator(mode="after")
+    def _check_pool_budget(self) -> "Settings":
+        needed: int = self.worker_count * (1 + WORKER_SIDE_CONNECTIONS)
+        if self.database.max_pool_size < needed:
+            raise ValueError(
+                f"POSTGRES_MAX_POOL_SIZE ({self.database.max_pool_size}) must be at "
+                f"least {needed}: each of the {self.worker_count} workers needs a "
+                f"pooled connection plus {WORKER_SIDE_CONNECTIONS} of its own"
+            )
+        return self
+
+    @property
+    def worker_count(self) -> int:
+        # uvicorn runs a single process when reloading, whatever `workers` says
+        return 1 if self.app.reload else self.app.workers
+
+    def worker_pool_sizes(self) -> tuple[int, int]:
+        """
+        (min_size, max_size) for each pool in this process: an equal share of
+        `max_pool_size` per worker, less the `WORKER_SIDE_CONNECTIONS` every
+        worker opens outside its pool, so all workers together stay within it.
+        """
+        share: int = self.database.max_pool_size // self.worker_count
+        max_size: int = share - WORKER_SIDE_CONNECTIONS
+        return min(self.database.min_pool_size, max_size), max_size
+
+
+ENV_FILE = ".env"
+LOG_FORMAT_DEBUG = "%(levelname)s:%(message)s:%(pathname)s:%(funcName)s:%(lineno)d"
 
-    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
+@cache
+def get_settings() -> Settings:
+    """
+    The process-wide settings, built once and cached.
 
-LOG_FORMAT_DEBUG = "%(levelname)s:%(message)s:%(pathname)s:%(funcName)s:%(lineno)d"
+    `.env` is read once here into the environment, without overriding
+    variables that are already set, instead of once per nested settings class.
+    Importing `person_tool.main` still builds them: the app, its routes and
+    the entity caches are configured from settings at import.
+    """
+    load_dotenv(ENV_FILE, override=False)
+    return Settings()
 
 
 def configure_logging(level: str | None = None) -> None:
-    lvl = level if level else settings.app.log_level
+    lvl = level if level else get_settings().app.log_level
 
     numeric = {
         "DEBUG": logging.DEBUG,
@@ -66,6 +189,15 @@ def configure_logging(level: str | None = None) -> None:
     logging.basicConfig(level=numeric, format=fmt)
 
 
-settings = Settings()
+settings: Settings
+
+
+def __getattr__(name: str) -> t.Any:
+    # `from person_tool.config import settings` resolves to the cached
+    # `get_settings()` instead of a second instance built at import
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
-__all__ = ["settings", "configure_logging"]
+__all__ = ["configure_logging", "get_settings", "settings"]
@@ -1,14 +1,62 @@
+import asyncio
+import collections.abc as c
+import logging
+import time
 import typing as t
 from contextlib import asynccontextmanager
 
-from asyncpg import Connection, Pool, create_pool  # type: ignore
+from asyncpg import Connection, Pool, connect, create_pool  # type: ignore
 
-from person_tool.config import settings
+from person_tool import deadlines, metrics
+from person_tool.config import WORKER_SIDE_CONNECTIONS, settings
+from person_tool.db.health import HealthMonitor
+from person_tool.db.replicas import (
+    REPLICA_LAG_QUERY,
+    Replica,
+    ReplicaSet,
+    parse_lsn,
+    read_consistency,
+)
+from person_tool.db.statements import PreparedConnection
+from person_tool.timings import record_query, record_timing
+
+log = logging.getLogger(__name__)
+
+ENTITY_CHANGED_CHANNEL = "people_entity_changed"
+PRIMARY_POOL = "primary"
+# Seconds between attempts to reopen a lost LISTEN connection, doubling
+LISTENER_RETRY_DELAY = 0.5
+LISTENER_RETRY_MAX_DELAY = 30.0
+
+
+class PoolTimeoutError(Exception):
+    """No pooled connection became free within `POSTGRES_ACQUIRE_TIMEOUT`."""
+
+    def __init__(self, pool: str) -> None:
+        super().__init__(f"Timed out waiting for a connection from pool {pool!r}")
+        self.pool: str = pool
 
 
 class PeopleManagementDatabase:
     def __init__(self):
         self._pool: Pool | None = None
+        self._listener: Connection | None = None
+        self._callbacks: dict[str, list[c.Callable[[str], None]]] = {}
+        self._gap_callbacks: list[c.Callable[[], None]] = []
+        self._reconnect: asyncio.Task | None = None
+        self._replicas: ReplicaSet | None = None
+        self._lag_monitor: asyncio.Task | None = None
+        self._ready: bool = False
+        self._health: HealthMonitor | None = None
+        self._health_monitor: asyncio.Task | None = None
+
+    @property
+    def ready(self) -> bool:
+        """
+        True once startup() has opened and warmed up every pool, until
+        shutdown() begins.
+        """
+        return self._ready
 
     @property
     def pool(self) -> Pool:
@@ -16,53 +64,331 @@ class PeopleManagementDatabase:
             raise RuntimeError("Database not started. Call startup() first.")
         return self._pool
 
+    @property
+    def health(self) -> HealthMonitor | None:
+        return self._health
+
+    @property
+    def replicas(self) -> ReplicaSet | None:
+        return self._replicas
+
+    @staticmethod
+    def _connect_kwargs(host: str | None = None) -> dict[str, t.Any]:
+        port: int = settings.database.port
+        if host and ":" in host:
+            host, _, replica_port = host.rpartition(":")
+            port = int(replica_port)
+        return {
+            "user": settings.database.user,
+            "password": settings.database.password,
+            "database": settings.database.db,
+            "host": host or settings.database.host,
+            "port": port,
+            # Sent with the startup packet instead of a SET per new connection
+            "server_settings": {"timezone": "UTC"},
+        }
+
+    def add_listener(
+        self,
+        channel: str,
+        callback: c.Callable[[str], None],
+        *,
+        on_gap: c.Callable[[], None] | None = None,
+    ) -> None:
+        """
+        Register `callback` for NOTIFY payloads on `channel`. Callbacks are
+        served by a dedicated connection opened in startup().
+
+        If that connection is lost it is reopened with backoff, and `on_gap`
+        is called both when it drops and once it listens again, as any
+        notification sent in between is never delivered.
+        """
+        self._callbacks.setdefault(channel, []).append(callback)
+        if on_gap is not None:
+            self._gap_callbacks.append(on_gap)
+
     async def startup(self):
         # noinspection PyUnusedLocal
-        async def _init(init_con: Connection) -> None:
-            await init_con.execute("SET TIME ZONE 'UTC'")
-
-        self._pool = await create_pool(
-            user=settings.database.user,
-            password=settings.database.password,
-            database=settings.database.db,
-            host=settings.database.host,
-            port=settings.database.port,
-            min_size=settings.database.min_pool_size,
-            max_size=settings.database.max_pool_size,
-            command_timeout=settings.database.command_timeout,
-            init=_init,
+        async def _init(init_con: PreparedConnection) -> None:
+            await init_con.prepare_registry()
+            await init_con.warm_up()
+            # Query loggers survive the reset on release, so one per connection
+            # times every query ServiceFactory runs, COMMIT included
+            init_con.add_query_logger(record_query)
+
+        min_size, max_size = settings.worker_pool_sizes()
+
+        async def _create_pool(host: str | None = None) -> Pool:
+            # asyncpg opens the `min_size` floor concurrently, each connection
+            # prepared and warmed up by `_init` before the pool is returned
+            return await create_pool(
+                **self._connect_kwargs(host),
+                min_size=min_size,
+                max_size=max_size,
+                command_timeout=settings.database.command_timeout,
+                init=_init,
+                connection_class=PreparedConnection,
+            )
+
+        start: float = time.perf_counter()
+        hosts: list[str] = settings.database.replica_hosts
+        primary, *replica_pools = await asyncio.gather(
+            _create_pool(),
+            *(_create_pool(host) for host in hosts),
+            return_exceptions=True,
         )
+        replicas: list[Replica] = []
+        for host, pool in zip(hosts, replica_pools):
+            if isinstance(pool, Pool):
+                replicas.append(Replica(name=host, pool=pool))
+            else:
+                # Reads fall back to the primary; the replica stays out of
+                # rotation until the next restart
+                log.error("Replica %s unavailable, starting without it: %r", host, pool)
+        if not isinstance(primary, Pool):
+            await asyncio.gather(*(r.pool.close() for r in replicas))
+            raise primary
+        self._pool = primary
         async with self.connection() as con:
             await con.fetchval("SELECT 1")
+        await self._start_listener()
+        if replicas:
+            self._replicas = ReplicaSet(
+                replicas=replicas,
+                selection=settings.database.replica_selection,
+                max_lag=settings.database.replica_max_lag,
+            )
+            await self._check_replica_lag()
+            self._lag_monitor = asyncio.create_task(self._monitor_replica_lag())
+        self._health = HealthMonitor(
+            # Reserved for probes: outside the pool, one of WORKER_SIDE_CONNECTIONS
+            lambda: connect(**self._connect_kwargs()),
+            lambda: self._pool,
+            interval=settings.database.health_check_interval,
+            timeout=settings.database.health_check_timeout,
+            max_staleness=settings.database.health_max_staleness,
+        )
+        await self._health.probe()
+        self._health_monitor = asyncio.create_task(self._health.run())
+        self._ready = True
+        log.info(
+            "Database pools ready in %.0f ms (%d warm connections each)",
+            (time.perf_counter() - start) * 1000,
+            min_size,
+        )
+        log.info(
+            "Primary connection budget: %d worker(s) x (%d pooled + %d side) "
+            "of POSTGRES_MAX_POOL_SIZE=%d",
+            settings.worker_count,
+            max_size,
+            WORKER_SIDE_CONNECTIONS,
+            settings.database.max_pool_size,
+        )
+
+    async def _start_listener(self) -> None:
+        if not self._callbacks:
+            return
+        self._listener = await self._listen()
+
+    async def _listen(self) -> Connection:
+        # LISTEN needs its own connection: pooled ones are reset on release
+        con: Connection = await connect(**self._connect_kwargs())
+        try:
+            for channel in self._callbacks:
+                await con.add_listener(channel, self._dispatch)
+        except BaseException:
+            con.terminate()
+            raise
+        con.add_termination_listener(self._on_listener_terminated)
+        return con
+
+    # noinspection PyUnusedLocal
+    def _dispatch(self, con: Connection, pid: int, channel: str, payload: str) -> None:
+        for callback in self._callbacks.get(channel, ()):
+            try:
+                callback(payload)
+            except Exception:
+                log.exception("Listener for channel %s failed", channel)
+
+    def _notify_gap(self) -> None:
+        for callback in self._gap_callbacks:
+            try:
+                callback()
+            except Exception:
+                log.exception("Notification gap callback failed")
+
+    def _on_listener_terminated(self, con: Connection) -> None:
+        if self._listener is not con:
+            return
+        log.warning("Notification listener connection lost, reconnecting")
+        self._listener = None
+        self._notify_gap()
+        self._reconnect = asyncio.create_task(self._reconnect_listener())
+
+    async def _reconnect_listener(self) -> None:
+        delay: float = LISTENER_RETRY_DELAY
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                self._listener = await self._listen()
+            except Exception as e:
+                log.warning("Notification listener reconnect failed: %r", e)
+                delay = min(delay * 2, LISTENER_RETRY_MAX_DELAY)
+                continue
+            # Anything cached while nobody was listening may have changed since
+            self._notify_gap()
+            log.info("Notification listener reconnected")
+            return
+
+    async def _check_replica_lag(self) -> None:
+        assert self._replicas is not None
+
+        async def _probe(replica: Replica) -> None:
+            try:
+                async with replica.pool.acquire() as con:
+                    row = await con.fetchrow(REPLICA_LAG_QUERY)
+            except Exception as e:
+                if replica.lag is not None:
+                    log.warning("Replica %s unavailable: %s", replica.name, e)
+                replica.lag = replica.replay_lsn = None
+                return
+            replica.lag = row["lag"]
+            replica.replay_lsn = parse_lsn(row["replay_lsn"])
+
+        await asyncio.gather(*(_probe(r) for r in self._replicas.replicas))
+
+    async def _monitor_replica_lag(self) -> None:
+        while True:
+            await asyncio.sleep(settings.database.replica_lag_check_interval)
+            try:
+                await self._check_replica_lag()
+            except Exception:
+                # Keep checking: a stopped monitor freezes every replica's lag
+                log.exception("Replica lag check failed")
+
+    def _read_pool(self) -> tuple[str, Pool]:
+        """
+        A replica pool for reads when one is eligible, otherwise the primary.
+        Requests carrying a read token only go to replicas that have replayed
+        past it.
+        """
+        if self._replicas is None:
+            return PRIMARY_POOL, self.pool
+        consistency = read_consistency.get()
+        replica: Replica | None = self._replicas.choose(
+            consistency.min_lsn if consistency else None
+        )
+        return (replica.name, replica.pool) if replica else (PRIMARY_POOL, self.pool)
+
+    def _pools(self) -> c.Iterator[tuple[str, Pool]]:
+        if self._pool is not None:
+            yield PRIMARY_POOL, self._pool
+        if self._replicas is not None:
+            yield from ((r.name, r.pool) for r in self._replicas.replicas)
+
+    def collect_pool_metrics(self) -> None:
+        for name, pool in self._pools():
+            metrics.db_pool_size.labels(name).set(pool.get_size())
+            metrics.db_pool_idle.labels(name).set(pool.get_idle_size())
+            metrics.db_pool_max_size.labels(name).set(pool.get_max_size())
+            metrics.db_pool_saturation.labels(name).set(
+                (pool.get_size() - pool.get_idle_size()) / pool.get_max_size()
+            )
+
+    @staticmethod
+    async def _acquire(name: str, pool: Pool) -> Connection:
+        timeout: float = settings.database.acquire_timeout
+        left: float | None = deadlines.remaining()
+        if left is not None and left < timeout:
+            if left <= 0:
+                raise deadlines.DeadlineExceededError()
+            timeout = left
+        start: float = time.perf_counter()
+        try:
+            con = await pool.acquire(timeout=timeout)
+        except TimeoutError:
+            if timeout < settings.database.acquire_timeout:
+                raise deadlines.DeadlineExceededError() from None
+            metrics.db_pool_acquire_timeouts.labels(name).inc()
+            raise PoolTimeoutError(name) from None
+        wait: float = time.perf_counter() - start
+        metrics.db_pool_checkout_wait.labels(name).observe(wait)
+        record_timing("pool_wait", wait)
+        metrics.db_pool_checkouts.labels(name).inc()
+        return con
 
     async def shutdown(self) -> None:
+        self._ready = False
+        if self._health_monitor:
+            self._health_monitor.cancel()
+            await asyncio.gather(self._health_monitor, return_exceptions=True)
+            self._health_monitor = None
+        if self._lag_monitor:
+            self._lag_monitor.cancel()
+            self._lag_monitor = None
+        if self._replicas:
+            await asyncio.gather(*(r.pool.close() for r in self._replicas.replicas))
+            self._replicas = None
+        if self._reconnect:
+            self._reconnect.cancel()
+            self._reconnect = None
+        if self._listener:
+            # Cleared first so closing it isn't taken for a lost connection
+            listener, self._listener = self._listener, None
+            await listener.close()
         if self._pool:
             await self._pool.close()
             self._pool = None
 
     @asynccontextmanager
-    async def connection(self) -> t.AsyncIterator[Connection]:
-        con = await self.pool.acquire()
+    async def connection(self, replica: bool = False) -> t.AsyncIterator[Connection]:
+        name, pool = self._read_pool() if replica else (PRIMARY_POOL, self.pool)
+        con = await self._acquire(name, pool)
         try:
             yield con
         finally:
-            await self.pool.release(con)
+            await pool.release(con)
 
     @asynccontextmanager
-    async def transaction(self) -> t.AsyncIterator[Connection]:
-        con = await self.pool.acquire()
-        tr = con.transaction()
+    async def transaction(
+        self, readonly: bool = False, replica: bool = False
+    ) -> t.AsyncIterator[Connection]:
+        name, pool = (
+            self._read_pool() if readonly and replica else (PRIMARY_POOL, self.pool)
+        )
+        con = await self._acquire(name, pool)
+        tr = con.transaction(
+            readonly=readonly, isolation="repeatable_read" if readonly else None
+        )
         await tr.start()
         try:
-            yield con
+            try:
+                yield con
+            except BaseException:
+                # Including cancellation on a deadline or disconnect, which would
+                # otherwise leave the pool to reset a connection mid-transaction
+                await tr.rollback()
+                raise
+            # Not guarded by the rollback: after a failed or cancelled COMMIT
+            # the transaction can't be rolled back, and the pool resets the
+            # connection on release
             await tr.commit()
-        except Exception:
-            await tr.rollback()
-            raise
+            if not readonly and self._replicas is not None:
+                await self._record_write(con)
         finally:
-            await self.pool.release(con)
+            await pool.release(con)
+
+    @staticmethod
+    async def _record_write(con: Connection) -> None:
+        # The WAL position after our commit becomes the client's read token
+        consistency = read_consistency.get()
+        if consistency is not None:
+            consistency.write_lsn = await con.fetchval(
+                "SELECT pg_current_wal_lsn()::text"
+            )
 
 
 people_management_db = PeopleManagementDatabase()
+metrics.registry.add_collector(people_management_db.collect_pool_metrics)
 
-__all__ = ["people_management_db"]
+__all__ = ["ENTITY_CHANGED_CHANNEL", "PoolTimeoutError", "people_management_db"]
@@ -0,0 +1,63 @@
+import json
+import typing as t
+from dataclasses import dataclass
+
+from asyncpg import Connection  # type: ignore
+
+
+@dataclass(frozen=True, slots=True)
+class TotalCount:
+    count: int
+    exact: bool
+
+
+async def _estimate(conn: Connection, table: str, where: str, args: list) -> int:
+    if where == "TRUE":
+        # Kept current by autovacuum/ANALYZE; -1 until the table is first analyzed
+        reltuples: float = await conn.fetchval(
+            "SELECT reltuples FROM pg_class WHERE oid = $1::regclass", table
+        )
+        if reltuples >= 0:
+            return int(reltuples)
+    plan: str = await conn.fetchval(
+        f"EXPLAIN (FORMAT JSON) SELECT 1 FROM {table} WHERE {where}", *args
+    )
+    return int(json.loads(plan)[0]["Plan"]["Plan Rows"])
+
+
+async def total_count(
+    conn: Connection,
+    table: str,
+    where: str,
+    args: list[t.Any],
+    *,
+    exact_limit: int,
+) -> TotalCount:
+    """
+    Rows of `table` matching `where`, for paging UIs.
+
+    Starts from the statistics: `pg_class.reltuples` for an unfiltered table,
+    the planner's row estimate otherwise. Only when that says `exact_limit`
+    rows or fewer are the rows actually counted, and then with a LIMIT so a
+    bad estimate can't turn into a full scan. Past the limit the estimate is
+    returned and flagged as approximate.
+    """
+    estimate: int = await _estimate(conn, table, where, args)
+    if estimate > exact_limit:
+        return TotalCount(count=estimate, exact=False)
+    n: int = len(args)
+    counted: int = await conn.fetchval(
+        f"""
+        SELECT count(*) FROM (
+            SELECT 1 FROM {table} WHERE {where} LIMIT ${n + 1}
+        ) s
+        """,
+        *args,
+        exact_limit + 1,
+    )
+    if counted > exact_limit:
+        return TotalCount(count=max(estimate, counted), exact=False)
+    return TotalCount(count=counted, exact=True)
+
+
+__all__ = ["TotalCount", "total_count"]
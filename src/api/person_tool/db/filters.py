@@ -0,0 +1,171 @@
+import typing as t
+from datetime import datetime
+from uuid import UUID
+
+from person_tool.utils.uuid7 import uuid7_min
+
+
+def ilike_filters(filters: dict[str, t.Any]) -> tuple[str, list[t.Any]]:
+    """
+    Build a `col ILIKE '%' || $n || '%'` predicate for every filter that was
+    actually supplied, numbering the parameters from $1.
+
+    Unused filters are left out of the SQL instead of being guarded with
+    `$n IS NULL OR ...`, so the planner sees a plain ILIKE it can serve from
+    the pg_trgm GIN indexes even when asyncpg switches to a generic plan.
+    """
+    clauses: list[str] = []
+    args: list[t.Any] = []
+    for column, value in filters.items():
+        if value is None:
+            continue
+        args.append(value)
+        clauses.append(f"{column} ILIKE '%' || ${len(args)} || '%'")
+    return " AND ".join(clauses) or "TRUE", args
+
+
+def _v7_bounds(
+    args: list[t.Any],
+    key: str,
+    created_after: datetime | None,
+    created_before: datetime | None,
+) -> list[str]:
+    clauses: list[str] = []
+    if created_after is not None:
+        args.append(uuid7_min(created_after))
+        clauses.append(f"{key} >= ${len(args)}")
+    if created_before is not None:
+        args.append(uuid7_min(created_before))
+        clauses.append(f"{key} < ${len(args)}")
+    return clauses
+
+
+def _legacy_bounds(
+    args: list[t.Any],
+    alias: str,
+    created_after: datetime | None,
+    created_before: datetime | None,
+) -> list[str]:
+    clauses: list[str] = []
+    if created_after is not None:
+        args.append(created_after)
+        clauses.append(f"{alias}created_at >= ${len(args)}")
+    if created_before is not None:
+        args.append(created_before)
+        clauses.append(f"{alias}created_at < ${len(args)}")
+    return clauses
+
+
+def created_range(
+    where: str,
+    args: list[t.Any],
+    *,
+    created_after: datetime | None,
+    created_before: datetime | None,
+) -> tuple[str, list[t.Any]]:
+    """
+    AND a `[created_after, created_before)` window onto `where`, continuing
+    the parameter numbering of `args`. uuid7 keys carry their row's creation
+    time, so for them the window is a PK range; rows still keyed with uuid4
+    are matched on created_at instead.
+    """
+    args = list(args)
+    v7: list[str] = _v7_bounds(args, "uid", created_after, created_before)
+    if not v7:
+        return where, args
+    legacy: list[str] = _legacy_bounds(args, "", created_after, created_before)
+    window: str = (
+        f"((people.is_uuid7(uid) AND {' AND '.join(v7)})"
+        f" OR (NOT people.is_uuid7(uid) AND {' AND '.join(legacy)}))"
+    )
+    return window if where == "TRUE" else f"{where} AND {window}", args
+
+
+def newest_first_order(alias: str = "") -> str:
+    """
+    ORDER BY list for newest-first listings: uuid7 rows by key, then the
+    older uuid4-keyed rows by created_at.
+    """
+    return (
+        f"people.is_uuid7({alias}uid) DESC,"
+        f" CASE WHEN people.is_uuid7({alias}uid) THEN NULL"
+        f" ELSE {alias}created_at END DESC,"
+        f" {alias}uid DESC"
+    )
+
+
+def newest_first(
+    select: str,
+    where: str,
+    args: list[t.Any],
+    *,
+    alias: str = "",
+    key: str | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    after: tuple[datetime, UUID] | None = None,
+    limit: int | None = None,
+    offset: int = 0,
+) -> tuple[str, list[t.Any]]:
+    """
+    A newest-first listing of `select` (a SELECT ... FROM with `uid` and
+    `created_at` among its output columns) filtered by `where`, optionally
+    within a created window, past a keyset cursor and paged.
+
+    uuid7 rows are read newest first off an index on `key` (the row's uid by
+    default, or a column joined to it), which for a table is the partial
+    index over its uuid7 keys. The older uuid4-keyed rows come from the
+    partial (created_at, uid) index that covers only them. Each branch stops
+    at the page size, so a page sorts at most two pages' worth of rows.
+    Without `limit` the branches are streamed one after the other, unsorted,
+    for exports.
+    """
+    args = list(args)
+    key = key or f"{alias}uid"
+    v7: list[str] = [f"people.is_uuid7({key})", where]
+    legacy: list[str] = [f"NOT people.is_uuid7({key})", where]
+    v7 += _v7_bounds(args, key, created_after, created_before)
+    legacy += _legacy_bounds(args, alias, created_after, created_before)
+    if after is not None:
+        created_at, uid = after
+        args.append(uid)
+        if uid.version == 7:
+            v7.append(f"{key} < ${len(args)}")
+        else:
+            args.append(created_at)
+            v7.append("FALSE")
+            legacy.append(
+                f"({alias}created_at, {alias}uid) < (${len(args)}, ${len(args) - 1})"
+            )
+    branch_limit: str = ""
+    if limit is not None:
+        args.append(limit + offset)
+        branch_limit = f"LIMIT ${len(args)}"
+    union: str = f"""
+        ({select}
+         WHERE {" AND ".join(v7)}
+         ORDER BY {key} DESC {branch_limit})
+        UNION ALL
+        ({select}
+         WHERE {" AND ".join(legacy)}
+         ORDER BY {alias}created_at DESC, {alias}uid DESC {branch_limit})
+    """
+    if limit is None:
+        return union, args
+    args += [limit, offset]
+    return (
+        f"""
+        SELECT * FROM ({union}) page
+        ORDER BY {newest_first_order()}
+        LIMIT ${len(args) - 1} OFFSET ${len(args)}
+        """,
+        args,
+    )
+
+
+__all__ = [
+    "created_range",
+    "ilike_filters",
+    "newest_first",
+    "newest_first_order",
+]
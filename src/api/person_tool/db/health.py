@@ -0,0 +1,127 @@
+import asyncio
+import collections.abc as c
+import logging
+import time
+from dataclasses import dataclass
+
+from asyncpg import Connection, Pool  # type: ignore
+
+from person_tool import metrics
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class HealthState:
+    """
+    Outcome of the latest probe. Times are `time.monotonic()` readings;
+    `checked_at` moves on every probe, `healthy_at` only on successful ones.
+    """
+
+    healthy: bool = False
+    latency: float | None = None
+    error: str | None = None
+    checked_at: float | None = None
+    healthy_at: float | None = None
+    pool_size: int = 0
+    pool_idle: int = 0
+    pool_max_size: int = 0
+
+    @property
+    def pool_saturation(self) -> float:
+        """Share of the pool's maximum size checked out at the last probe."""
+        if not self.pool_max_size:
+            return 0.0
+        return (self.pool_size - self.pool_idle) / self.pool_max_size
+
+
+class HealthMonitor:
+    """
+    Probes the database every `interval` seconds over a connection of its
+    own, outside the pool, so probes never queue behind requests for a pooled
+    connection. Readiness and liveness are answered from the recorded state.
+
+    Ready means the last probe succeeded less than `max_staleness` seconds
+    ago. Alive means probes are still being made on schedule, i.e. the event
+    loop isn't wedged, whatever the database answered.
+    """
+
+    def __init__(
+        self,
+        connect: c.Callable[[], c.Awaitable[Connection]],
+        pool: c.Callable[[], Pool | None],
+        *,
+        interval: float,
+        timeout: float,
+        max_staleness: float,
+    ) -> None:
+        self._connect = connect
+        self._pool = pool
+        self.interval: float = interval
+        self.timeout: float = timeout
+        self.max_staleness: float = max_staleness
+        self.state: HealthState = HealthState()
+        self._conn: Connection | None = None
+
+    async def probe(self) -> None:
+        state: HealthState = self.state
+        start: float = time.perf_counter()
+        try:
+            if self._conn is None or self._conn.is_closed():
+                self._conn = await asyncio.wait_for(self._connect(), self.timeout)
+            await self._conn.fetchval("SELECT 1", timeout=self.timeout)
+        except Exception as e:
+            if state.healthy or state.checked_at is None:
+                log.warning("Database health probe failed: %r", e)
+            state.healthy = False
+            state.error = str(e) or type(e).__name__
+            self._discard()
+        else:
+            state.latency = time.perf_counter() - start
+            state.healthy = True
+            state.error = None
+            state.healthy_at = time.monotonic()
+            metrics.db_health_probe_duration.labels().observe(state.latency)
+        state.checked_at = time.monotonic()
+        pool: Pool | None = self._pool()
+        if pool is not None:
+            state.pool_size = pool.get_size()
+            state.pool_idle = pool.get_idle_size()
+            state.pool_max_size = pool.get_max_size()
+        metrics.db_health_up.labels().set(int(state.healthy))
+
+    async def run(self) -> None:
+        try:
+            while True:
+                await asyncio.sleep(self.interval)
+                try:
+                    await self.probe()
+                except Exception:
+                    # A bug in one probe must not stop the probes: liveness
+                    # would fail and restart a worker that is otherwise fine
+                    log.exception("Database health probe crashed")
+        finally:
+            self._discard()
+
+    def _discard(self) -> None:
+        if self._conn is not None:
+            # A probe that timed out may have left a query running; don't wait
+            self._conn.terminate()
+            self._conn = None
+
+    def is_ready(self) -> bool:
+        healthy_at: float | None = self.state.healthy_at
+        return (
+            self.state.healthy
+            and healthy_at is not None
+            and time.monotonic() - healthy_at <= self.max_staleness
+        )
+
+    def is_alive(self) -> bool:
+        checked_at: float | None = self.state.checked_at
+        # A probe can take up to `timeout`, then sleeps `interval`
+        limit: float = self.interval + self.timeout + self.max_staleness
+        return checked_at is not None and time.monotonic() - checked_at <= limit
+
+
+__all__ = ["HealthMonitor", "HealthState"]
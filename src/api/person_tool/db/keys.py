@@ -0,0 +1,24 @@
+import typing as t
+
+from person_tool.utils.uuid7 import uuid7_batch
+
+
+def keyed(rows: list[dict[str, t.Any]]) -> list[dict[str, t.Any]]:
+    """
+    JSON insert payload rows, each given a fresh uuid7 key as 32 hex digits.
+    The INSERT derives created_at from the key with people.uuid7_time().
+    """
+    uids: list[bytes] = uuid7_batch(len(rows), as_bytes=True)
+    return [{"uid": uid.hex(), **row} for uid, row in zip(uids, rows)]
+
+
+def stamped(rows: list[tuple]) -> list[tuple]:
+    """
+    COPY records prefixed with a fresh uuid7 key as its raw 16 bytes, for a
+    bytea staging column. The merge turns it back into a uuid server-side.
+    """
+    uids: list[bytes] = uuid7_batch(len(rows), as_bytes=True)
+    return [(uid, *row) for uid, row in zip(uids, rows)]
+
+
+__all__ = ["keyed", "stamped"]
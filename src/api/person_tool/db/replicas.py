@@ -0,0 +1,110 @@
+import contextvars
+import itertools
+import typing as t
+from dataclasses import dataclass, field
+
+from asyncpg import Pool  # type: ignore
+
+READ_TOKEN_HEADER = "X-Read-Token"
+
+# Replay position and lag in one round trip. A server that is not in recovery
+# (e.g. a second standalone instance in development) reports zero lag.
+REPLICA_LAG_QUERY = """
+    SELECT
+        CASE WHEN pg_is_in_recovery() THEN pg_last_wal_replay_lsn()
+             ELSE pg_current_wal_lsn() END::text AS replay_lsn,
+        CASE WHEN NOT pg_is_in_recovery()
+                  OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+             ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+        END::float8 AS lag
+"""
+
+ReplicaSelection = t.Literal["round_robin", "least_busy"]
+
+
+def parse_lsn(lsn: str) -> int:
+    """
+    Parse a Postgres LSN ("16/B374D848") into a comparable integer.
+    Raises ValueError for anything else.
+    """
+    hi, sep, lo = lsn.partition("/")
+    if not sep:
+        raise ValueError(f"Invalid LSN: {lsn!r}")
+    return (int(hi, 16) << 32) | int(lo, 16)
+
+
+@dataclass(slots=True)
+class ReadConsistency:
+    """
+    Per-request read-your-writes state. `min_lsn` comes from the client's
+    read token; `write_lsn` is set once the request commits a write.
+    """
+
+    min_lsn: int | None = None
+    write_lsn: str | None = None
+
+
+read_consistency: contextvars.ContextVar[ReadConsistency | None] = (
+    contextvars.ContextVar("read_consistency", default=None)
+)
+
+
+def requires_fresh_read() -> bool:
+    """True when the current request carries a read token."""
+    consistency: ReadConsistency | None = read_consistency.get()
+    return consistency is not None and consistency.min_lsn is not None
+
+
+@dataclass(slots=True)
+class Replica:
+    name: str
+    pool: Pool
+    # None until the first lag probe succeeds, and after one fails
+    lag: float | None = None
+    replay_lsn: int | None = None
+
+    @property
+    def in_use(self) -> int:
+        return self.pool.get_size() - self.pool.get_idle_size()
+
+    def is_eligible(self, max_lag: float, min_lsn: int | None) -> bool:
+        if self.lag is None or self.lag > max_lag:
+            return False
+        return min_lsn is None or (
+            self.replay_lsn is not None and self.replay_lsn >= min_lsn
+        )
+
+
+@dataclass
+class ReplicaSet:
+    replicas: list[Replica]
+    selection: ReplicaSelection
+    max_lag: float
+    _turn: t.Iterator[int] = field(default_factory=itertools.count, repr=False)
+
+    def choose(self, min_lsn: int | None = None) -> Replica | None:
+        """
+        Pick a replica that is within `max_lag` and has replayed past
+        `min_lsn`, or None to fall back to the primary.
+        """
+        eligible: list[Replica] = [
+            r for r in self.replicas if r.is_eligible(self.max_lag, min_lsn)
+        ]
+        if not eligible:
+            return None
+        if self.selection == "least_busy":
+            return min(eligible, key=lambda r: r.in_use)
+        return eligible[next(self._turn) % len(eligible)]
+
+
+__all__ = [
+    "READ_TOKEN_HEADER",
+    "REPLICA_LAG_QUERY",
+    "ReadConsistency",
+    "Replica",
+    "ReplicaSelection",
+    "ReplicaSet",
+    "parse_lsn",
+    "read_consistency",
+    "requires_fresh_read",
+]
@@ -2,6 +2,7 @@ CREATE DATABASE "PeopleDb";
 \c "PeopleDb";
 
 CREATE EXTENSION IF NOT EXISTS pgcrypto;
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
 
 CREATE SCHEMA IF NOT EXISTS meta;
 
@@ -16,9 +17,41 @@ INSERT INTO meta.relationship_types(relationship_type, description) VALUES
 
 CREATE SCHEMA IF NOT EXISTS people;
 
+-- Time-ordered uuid7 keys. The API mints its own, with created_at taken from
+-- the key, so newest-first and created_at windows are ranges on the primary key
+CREATE FUNCTION people.uuid7() RETURNS uuid
+    LANGUAGE sql VOLATILE AS
+$$
+SELECT encode(
+    set_bit(set_bit(
+        overlay(uuid_send(gen_random_uuid())
+            PLACING substring(int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3)
+            FROM 1 FOR 6),
+        52, 1), 53, 1),
+    'hex')::uuid
+$$;
+
+-- The creation time a uuid7 key carries: its leading 48 bits, in ms
+CREATE FUNCTION people.uuid7_time(uid uuid) RETURNS timestamptz
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE AS
+$$
+SELECT timestamptz 'epoch'
+           + ('x' || left(replace(uid::text, '-', ''), 12))::bit(48)::bigint * interval '1 millisecond'
+$$;
+
+-- Rows keyed before uuid7 keys were introduced carry random uuid4 keys that
+-- say nothing about creation time. Every one of them predates every uuid7
+-- row, so listings page through uuid7 rows by key and then through these by
+-- created_at, off the partial indexes below that cover only them.
+CREATE FUNCTION people.is_uuid7(uid uuid) RETURNS boolean
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE AS
+$$
+SELECT get_byte(uuid_send(uid), 6) >> 4 = 7
+$$;
+
 CREATE TABLE people.users
 (
-    uid        uuid PRIMARY KEY      DEFAULT gen_random_uuid(),
+    uid        uuid PRIMARY KEY      DEFAULT people.uuid7(),
     id         varchar(64)  NOT NULL,
     first_name varchar(100) NOT NULL,
     last_name  varchar(100) NOT NULL,
@@ -30,9 +63,18 @@ ALTER TABLE people.users
     ADD CONSTRAINT users_id_unique UNIQUE (id),
     ADD CONSTRAINT users_email_unique UNIQUE (email);
 
+CREATE INDEX users_id_trgm_idx ON people.users USING gin (id gin_trgm_ops);
+CREATE INDEX users_first_name_trgm_idx ON people.users USING gin (first_name gin_trgm_ops);
+CREATE INDEX users_last_name_trgm_idx ON people.users USING gin (last_name gin_trgm_ops);
+CREATE INDEX users_legacy_created_at_uid_idx ON people.users (created_at DESC, uid DESC)
+    WHERE NOT people.is_uuid7(uid);
+-- Listings read uuid7 rows newest first from here rather than the PK, whose
+-- top end is mostly random uuid4 keys
+CREATE INDEX users_v7_uid_idx ON people.users (uid) WHERE people.is_uuid7(uid);
+
 CREATE TABLE people.jobs
 (
-    uid          uuid PRIMARY KEY      DEFAULT gen_random_uuid(),
+    uid          uuid PRIMARY KEY      DEFAULT people.uuid7(),
     id           varchar(64)  NOT NULL,
     title        varchar(200) NOT NULL,
     description  text         NOT NULL,
@@ -40,6 +82,13 @@ CREATE TABLE people.jobs
     created_at   timestamptz  NOT NULL DEFAULT now()
 );
 
+CREATE INDEX jobs_id_trgm_idx ON people.jobs USING gin (id gin_trgm_ops);
+CREATE INDEX jobs_title_trgm_idx ON people.jobs USING gin (title gin_trgm_ops);
+CREATE INDEX jobs_status_trgm_idx ON people.jobs USING gin (status gin_trgm_ops);
+CREATE INDEX jobs_legacy_created_at_uid_idx ON people.jobs (created_at DESC, uid DESC)
+    WHERE NOT people.is_uuid7(uid);
+CREATE INDEX jobs_v7_uid_idx ON people.jobs (uid) WHERE people.is_uuid7(uid);
+
 CREATE TABLE people.user_relationships
 (
     uid uuid PRIMARY KEY      DEFAULT gen_random_uuid(),
@@ -48,4 +97,198 @@ CREATE TABLE people.user_relationships
     relationship_type varchar(50) NOT NULL REFERENCES meta.relationship_types(relationship_type) ON DELETE NO ACTION,
     created_at timestamptz NOT NULL DEFAULT now(),
     UNIQUE (primary_uid, secondary_uid, relationship_type)
-)
+);
+
+-- A user's uuid7-keyed jobs are paged newest-first straight off this index;
+-- the few still keyed with uuid4 are found through the UNIQUE index above
+-- and sorted by created_at
+CREATE INDEX user_relationships_primary_uid_type_idx
+    ON people.user_relationships (primary_uid, relationship_type, secondary_uid)
+    WHERE people.is_uuid7(secondary_uid);
+
+CREATE INDEX user_relationships_secondary_uid_idx
+    ON people.user_relationships (secondary_uid);
+
+-- Publishes '<table>:<uid>' so every API worker can drop its cached copy
+CREATE FUNCTION people.notify_entity_changed() RETURNS trigger
+    LANGUAGE plpgsql AS
+$$
+BEGIN
+    PERFORM pg_notify('people_entity_changed', TG_TABLE_NAME || ':' || OLD.uid);
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER users_notify_entity_changed
+    AFTER UPDATE OR DELETE ON people.users
+    FOR EACH ROW EXECUTE FUNCTION people.notify_entity_changed();
+
+CREATE TRIGGER jobs_notify_entity_changed
+    AFTER UPDATE OR DELETE ON people.jobs
+    FOR EACH ROW EXECUTE FUNCTION people.notify_entity_changed();
+
+-- Job counts by status and headcount (USER_JOB rows) per job, kept current by
+-- the statement-level triggers below so /jobs/stats never scans. Each
+-- statement folds its transition table into one delta per key, so a bulk
+-- import touches a counter row once, not once per job.
+-- Every job write lands on one of a handful of status rows, so each status
+-- is split over 16 shards picked by backend pid: concurrent writers from
+-- different connections update different rows instead of queueing on one.
+-- Readers sum the shards. Headcounts stay one row per job, where only
+-- writers to the same job contend.
+CREATE TABLE people.job_status_counts
+(
+    status varchar(50) NOT NULL,
+    shard  smallint    NOT NULL,
+    count  bigint      NOT NULL,
+    PRIMARY KEY (status, shard)
+);
+
+CREATE TABLE people.job_headcounts
+(
+    job_uid   uuid PRIMARY KEY,
+    headcount bigint NOT NULL
+);
+
+CREATE FUNCTION people.count_job_statuses() RETURNS trigger
+    LANGUAGE plpgsql AS
+$$
+BEGIN
+    -- Keys in order, so concurrent writers lock counter rows in the same order
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO people.job_status_counts AS c (status, shard, count)
+        SELECT status, pg_backend_pid() % 16, count(*)
+        FROM new_rows GROUP BY status ORDER BY status
+        ON CONFLICT (status, shard) DO UPDATE SET count = c.count + EXCLUDED.count;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO people.job_status_counts AS c (status, shard, count)
+        SELECT status, pg_backend_pid() % 16, -count(*)
+        FROM old_rows GROUP BY status ORDER BY status
+        ON CONFLICT (status, shard) DO UPDATE SET count = c.count + EXCLUDED.count;
+        DELETE FROM people.job_headcounts h USING old_rows o WHERE h.job_uid = o.uid;
+    ELSE
+        INSERT INTO people.job_status_counts AS c (status, shard, count)
+        SELECT status, pg_backend_pid() % 16, sum(delta)
+        FROM (SELECT status, -1 AS delta FROM old_rows
+              UNION ALL
+              SELECT status, 1 FROM new_rows) d
+        GROUP BY status
+        HAVING sum(delta) <> 0
+        ORDER BY status
+        ON CONFLICT (status, shard) DO UPDATE SET count = c.count + EXCLUDED.count;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+-- Every USER_JOB relationship is counted whether or not its job exists yet:
+-- relationships carry no foreign key, so one may be written before its job.
+-- Deleting a job drops its headcount row, and decrements skip jobs without
+-- one, so relationships removed after their job, in the same statement or
+-- later, don't bring the row back negative. A relationship written while its
+-- job is being deleted can still leave an orphan row; the drift check
+-- reports those and rebuild_job_stats() clears them.
+CREATE FUNCTION people.count_job_headcounts() RETURNS trigger
+    LANGUAGE plpgsql AS
+$$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO people.job_headcounts AS h (job_uid, headcount)
+        SELECT secondary_uid, count(*)
+        FROM new_rows
+        WHERE relationship_type = 'USER_JOB'
+        GROUP BY secondary_uid ORDER BY secondary_uid
+        ON CONFLICT (job_uid) DO UPDATE SET headcount = h.headcount + EXCLUDED.headcount;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO people.job_headcounts AS h (job_uid, headcount)
+        SELECT r.secondary_uid, -count(*)
+        FROM old_rows r
+        WHERE r.relationship_type = 'USER_JOB'
+          AND EXISTS (SELECT 1 FROM people.job_headcounts c WHERE c.job_uid = r.secondary_uid)
+        GROUP BY r.secondary_uid ORDER BY r.secondary_uid
+        ON CONFLICT (job_uid) DO UPDATE SET headcount = h.headcount + EXCLUDED.headcount;
+    ELSE
+        INSERT INTO people.job_headcounts AS h (job_uid, headcount)
+        SELECT d.job_uid, sum(d.delta)
+        FROM (SELECT secondary_uid AS job_uid, -1 AS delta
+              FROM old_rows WHERE relationship_type = 'USER_JOB'
+              UNION ALL
+              SELECT secondary_uid, 1
+              FROM new_rows WHERE relationship_type = 'USER_JOB') d
+        GROUP BY d.job_uid
+        HAVING sum(d.delta) > 0
+            OR (sum(d.delta) < 0
+                AND EXISTS (SELECT 1 FROM people.job_headcounts c WHERE c.job_uid = d.job_uid))
+        ORDER BY d.job_uid
+        ON CONFLICT (job_uid) DO UPDATE SET headcount = h.headcount + EXCLUDED.headcount;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+-- TRUNCATE skips row-level bookkeeping, so the counters are cleared with it
+CREATE FUNCTION people.clear_job_stats() RETURNS trigger
+    LANGUAGE plpgsql AS
+$$
+BEGIN
+    IF TG_TABLE_NAME = 'jobs' THEN
+        DELETE FROM people.job_status_counts;
+    END IF;
+    DELETE FROM people.job_headcounts;
+    RETURN NULL;
+END;
+$$;
+
+-- Transition tables allow one event per trigger, hence three of each
+CREATE TRIGGER jobs_count_statuses_insert
+    AFTER INSERT ON people.jobs REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION people.count_job_statuses();
+
+CREATE TRIGGER jobs_count_statuses_update
+    AFTER UPDATE ON people.jobs REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION people.count_job_statuses();
+
+CREATE TRIGGER jobs_count_statuses_delete
+    AFTER DELETE ON people.jobs REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION people.count_job_statuses();
+
+CREATE TRIGGER jobs_clear_stats
+    AFTER TRUNCATE ON people.jobs
+    FOR EACH STATEMENT EXECUTE FUNCTION people.clear_job_stats();
+
+CREATE TRIGGER user_relationships_count_headcounts_insert
+    AFTER INSERT ON people.user_relationships REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION people.count_job_headcounts();
+
+CREATE TRIGGER user_relationships_count_headcounts_update
+    AFTER UPDATE ON people.user_relationships
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION people.count_job_headcounts();
+
+CREATE TRIGGER user_relationships_count_headcounts_delete
+    AFTER DELETE ON people.user_relationships REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION people.count_job_headcounts();
+
+CREATE TRIGGER user_relationships_clear_stats
+    AFTER TRUNCATE ON people.user_relationships
+    FOR EACH STATEMENT EXECUTE FUNCTION people.clear_job_stats();
+
+-- Recomputes both counter tables from scratch: the repair for any drift, and
+-- the backfill for a database that had jobs before the triggers existed.
+-- Writers to either table wait until it commits; readers don't.
+CREATE FUNCTION people.rebuild_job_stats() RETURNS void
+    LANGUAGE plpgsql AS
+$$
+BEGIN
+    LOCK TABLE people.jobs, people.user_relationships IN SHARE MODE;
+    DELETE FROM people.job_status_counts;
+    INSERT INTO people.job_status_counts (status, shard, count)
+    SELECT status, 0, count(*) FROM people.jobs GROUP BY status;
+    DELETE FROM people.job_headcounts;
+    INSERT INTO people.job_headcounts (job_uid, headcount)
+    SELECT r.secondary_uid, count(*)
+    FROM people.user_relationships r JOIN people.jobs j ON j.uid = r.secondary_uid
+    WHERE r.relationship_type = 'USER_JOB'
+    GROUP BY r.secondary_uid;
+END;
+$$;
@@ -0,0 +1,163 @@
+import time
+import typing as t
+from dataclasses import dataclass
+from uuid import UUID
+
+from asyncpg import Connection  # type: ignore
+from asyncpg.protocol.protocol import Record  # type: ignore
+
+# Fixed-shape hot queries, prepared once on every pooled connection
+STATEMENTS: dict[str, str] = {
+    "users_get_by_id": """
+        SELECT uid, id, first_name, last_name, email, created_at, xmin::text AS version
+        FROM people.users WHERE uid = $1
+    """,
+    "users_get_by_ids": """
+        SELECT uid, id, first_name, last_name, email, created_at, xmin::text AS version
+        FROM people.users WHERE uid = ANY($1::uuid[])
+    """,
+    "users_get_version": """
+        SELECT xmin::text FROM people.users WHERE uid = $1
+    """,
+    "users_update": """
+        UPDATE people.users
+        SET
+            id         = COALESCE($2, id),
+            first_name = COALESCE($3, first_name),
+            last_name  = COALESCE($4, last_name),
+            email      = COALESCE($5, email)
+        WHERE uid = $1 AND ($6::text[] IS NULL OR xmin::text = ANY($6))
+        RETURNING uid, id, first_name, last_name, email, created_at, xmin::text AS version
+    """,
+    "users_delete": """
+        DELETE FROM people.users WHERE uid = $1
+    """,
+    "jobs_get_by_id": """
+        SELECT uid, id, title, description, status, created_at, xmin::text AS version
+        FROM people.jobs WHERE uid = $1
+    """,
+    "jobs_get_by_ids": """
+        SELECT uid, id, title, description, status, created_at, xmin::text AS version
+        FROM people.jobs WHERE uid = ANY($1::uuid[])
+    """,
+    "jobs_get_version": """
+        SELECT xmin::text FROM people.jobs WHERE uid = $1
+    """,
+    "jobs_update": """
+        UPDATE people.jobs
+        SET
+            id          = COALESCE($2, id),
+            title       = COALESCE($3, title),
+            description = COALESCE($4, description),
+            status      = COALESCE($5, status)
+        WHERE uid = $1 AND ($6::text[] IS NULL OR xmin::text = ANY($6))
+        RETURNING uid, id, title, description, status, created_at, xmin::text AS version
+    """,
+    "jobs_delete": """
+        DELETE FROM people.jobs WHERE uid = $1
+    """,
+}
+
+_NIL = UUID(int=0)
+
+# Arguments that match no rows, for every registry entry; `prepare_registry`
+# runs the writes too, so it rolls them back
+PREPARE_ARGS: dict[str, tuple[t.Any, ...]] = {
+    "users_get_by_id": (_NIL,),
+    "users_get_by_ids": ([_NIL],),
+    "users_get_version": (_NIL,),
+    "users_update": (_NIL, None, None, None, None, None),
+    "users_delete": (_NIL,),
+    "jobs_get_by_id": (_NIL,),
+    "jobs_get_by_ids": ([_NIL],),
+    "jobs_get_version": (_NIL,),
+    "jobs_update": (_NIL, None, None, None, None, None),
+    "jobs_delete": (_NIL,),
+}
+
+# Read-only registry entries run once on every new connection, with arguments
+# that match no rows, so its first request doesn't also pay for loading the
+# catalog and relation caches of the tables it touches
+WARMUP: dict[str, tuple[t.Any, ...]] = {
+    "users_get_by_id": (_NIL,),
+    "users_get_by_ids": ([_NIL],),
+    "users_get_version": (_NIL,),
+    "jobs_get_by_id": (_NIL,),
+    "jobs_get_by_ids": ([_NIL],),
+    "jobs_get_version": (_NIL,),
+}
+
+
+@dataclass
+class StatementStats:
+    prepares: int = 0
+    prepare_seconds: float = 0.0
+    executions: int = 0
+    execute_seconds: float = 0.0
+
+
+statement_stats: dict[str, StatementStats] = {
+    name: StatementStats() for name in STATEMENTS
+}
+
+
+class PreparedConnection(Connection):
+    """
+    asyncpg connection that prepares the `STATEMENTS` registry up front.
+
+    Each statement is run once through the public query API, with arguments
+    that match no rows and inside a rolled-back transaction, which leaves it
+    in asyncpg's per-connection statement cache. That cache survives pool
+    releases (RESET ALL keeps prepared statements), so each one is parsed and
+    planned once per connection instead of on its first use by a request.
+    `prepare()` isn't used: its PreparedStatement objects are scoped to a
+    single pool checkout and refuse to run once the connection is released.
+    """
+
+    async def prepare_registry(self) -> None:
+        tr = self.transaction()
+        await tr.start()
+        try:
+            for name, sql in STATEMENTS.items():
+                start = time.perf_counter()
+                await self.fetch(sql, *PREPARE_ARGS[name])
+                stats = statement_stats[name]
+                stats.prepares += 1
+                stats.prepare_seconds += time.perf_counter() - start
+        finally:
+            await tr.rollback()
+
+    async def warm_up(self) -> None:
+        # Bypasses `_run_prepared` so warm-up runs don't show in statement_stats
+        for name, args in WARMUP.items():
+            await self.fetch(STATEMENTS[name], *args)
+
+    async def _run_prepared(self, name: str, method: str, *args: t.Any) -> t.Any:
+        start = time.perf_counter()
+        try:
+            return await getattr(self, method)(STATEMENTS[name], *args)
+        finally:
+            stats = statement_stats[name]
+            stats.executions += 1
+            stats.execute_seconds += time.perf_counter() - start
+
+    async def fetch_prepared(self, name: str, *args: t.Any) -> list[Record]:
+        return await self._run_prepared(name, "fetch", *args)
+
+    async def fetchrow_prepared(self, name: str, *args: t.Any) -> Record | None:
+        return await self._run_prepared(name, "fetchrow", *args)
+
+    async def fetchval_prepared(self, name: str, *args: t.Any) -> t.Any:
+        return await self._run_prepared(name, "fetchval", *args)
+
+    async def execute_prepared(self, name: str, *args: t.Any) -> str:
+        return await self._run_prepared(name, "execute", *args)
+
+
+__all__ = [
+    "PREPARE_ARGS",
+    "STATEMENTS",
+    "WARMUP",
+    "PreparedConnection",
+    "statement_stats",
+]
@@ -0,0 +1,28 @@
+import contextvars
+import time
+
+DEADLINE_HEADER = "X-Request-Timeout"
+
+
+class DeadlineExceededError(Exception):
+    """The request's deadline passed before it got a pooled connection."""
+
+
+# time.monotonic() by which the current request must be answered
+request_deadline: contextvars.ContextVar[float | None] = contextvars.ContextVar(
+    "request_deadline", default=None
+)
+
+
+def remaining() -> float | None:
+    """Seconds left until the current request's deadline, None without one."""
+    deadline: float | None = request_deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+__all__ = [
+    "DEADLINE_HEADER",
+    "DeadlineExceededError",
+    "remaining",
+    "request_deadline",
+]
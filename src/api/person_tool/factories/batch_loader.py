@@ -0,0 +1,75 @@
+import asyncio
+import collections.abc as c
+import contextvars
+
+
+class BatchLoader[K: c.Hashable, V]:
+    """
+    Coalesces concurrent single-key lookups into one batched call.
+
+    Keys requested within `window` seconds of the first pending key (or until
+    `max_batch_size` distinct keys are pending) are handed to `batch_fn` in a
+    single call. Every caller gets the value for its own key, or None when the
+    key is missing from the batch result.
+
+    `batch_fn` runs in an empty context rather than a copy of whichever
+    caller happened to start the batch, so that request's deadline and
+    timings neither bound nor absorb work done for every caller.
+    """
+
+    def __init__(
+        self,
+        batch_fn: c.Callable[[list[K]], c.Awaitable[dict[K, V]]],
+        *,
+        window: float = 0.001,
+        max_batch_size: int = 500,
+    ) -> None:
+        self._batch_fn = batch_fn
+        self._window: float = window
+        self._max_batch_size: int = max_batch_size
+        self._pending: dict[K, list[asyncio.Future[V | None]]] = {}
+        self._handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def load(self, key: K) -> V | None:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[V | None] = loop.create_future()
+        self._pending.setdefault(key, []).append(future)
+        if len(self._pending) >= self._max_batch_size:
+            self._dispatch()
+        elif self._handle is None:
+            self._handle = loop.call_later(self._window, self._dispatch)
+        return await future
+
+    def _dispatch(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        batch, self._pending = self._pending, {}
+        task = asyncio.create_task(self._run(batch), context=contextvars.Context())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: dict[K, list[asyncio.Future[V | None]]]) -> None:
+        try:
+            results: dict[K, V] = await self._batch_fn(list(batch))
+        except BaseException as e:
+            for futures in batch.values():
+                for future in futures:
+                    if future.done():
+                        continue
+                    if isinstance(e, Exception):
+                        future.set_exception(e)
+                    else:
+                        future.cancel()
+            if not isinstance(e, Exception):
+                raise
+            return
+        for key, futures in batch.items():
+            value: V | None = results.get(key)
+            for future in futures:
+                if not future.done():
+                    future.set_result(value)
+
+
+__all__ = ["BatchLoader"]
@@ -0,0 +1,104 @@
+import collections.abc as c
+import logging
+import time
+import typing as t
+from collections import OrderedDict
+from uuid import UUID
+
+log = logging.getLogger(__name__)
+
+
+class EntityCache[V]:
+    """
+    Bounded LRU cache with a per-entry TTL for rows of a single table, keyed
+    by uid.
+
+    Entries are invalidated locally by the write paths and, for every worker,
+    by `notify` when Postgres publishes a `<table>:<uid>` payload on the
+    entity-changed channel.
+    """
+
+    registry: t.ClassVar[dict[str, "EntityCache[t.Any]"]] = {}
+
+    def __init__(
+        self,
+        table: str,
+        *,
+        max_size: int,
+        ttl: float,
+        clock: c.Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.table: str = table
+        self.max_size: int = max_size
+        self.ttl: float = ttl
+        self._clock = clock
+        self._entries: OrderedDict[UUID, tuple[float, V]] = OrderedDict()
+        self.generation: int = 0
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.expirations: int = 0
+        self.invalidations: int = 0
+
+        EntityCache.registry[table] = self
+
+    def get(self, uid: UUID) -> V | None:
+        entry = self._entries.get(uid)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[uid]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(uid)
+        self.hits += 1
+        return value
+
+    def set(self, uid: UUID, value: V, *, generation: int) -> None:
+        """
+        Store `value` unless an invalidation happened after `generation` was
+        read, which would mean `value` may predate a write.
+        """
+        if self.max_size <= 0 or generation != self.generation:
+            return
+        self._entries[uid] = (self._clock() + self.ttl, value)
+        self._entries.move_to_end(uid)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, uid: UUID) -> None:
+        self.generation += 1
+        if self._entries.pop(uid, None) is not None:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+
+    def notify(self, payload: str) -> None:
+        table, _, uid = payload.partition(":")
+        if table != self.table:
+            return
+        try:
+            self.invalidate(UUID(uid))
+        except ValueError:
+            log.warning("Ignoring malformed invalidation payload: %s", payload)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+__all__ = ["EntityCache"]
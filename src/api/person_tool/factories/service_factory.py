@@ -7,8 +7,6 @@ from asyncpg.exceptions import InternalServerError
 from person_tool.db.core import people_management_db
 from person_tool.jobs.repository import JobRepository
 from person_tool.jobs.service import JobService
-from person_tool.system.repository import SystemRepository
-from person_tool.system.service import SystemService
 from person_tool.users.repository import UserRepository
 from person_tool.users.service import UserService
 
@@ -23,19 +21,29 @@ class ServiceFactory:
     Ensures all services share the same connection/transaction.
     """
 
-    def __init__(self, use_transaction: bool = False) -> None:
+    def __init__(
+        self,
+        use_transaction: bool = False,
+        readonly: bool = False,
+        use_replica: bool = True,
+    ) -> None:
         self.use_transaction: bool = use_transaction
+        self.readonly: bool = readonly
+        # Plain connections and read-only transactions go to a replica when one
+        # is configured and caught up; writes always go to the primary
+        self.use_replica: bool = use_replica
         self._conn: Connection | None = None
 
         self._user_service: UserService | None = None
         self._job_service: JobService | None = None
-        self._system_service: SystemService | None = None
 
     async def __aenter__(self):
         self._ctx = (
-            people_management_db.transaction()
+            people_management_db.transaction(
+                readonly=self.readonly, replica=self.use_replica
+            )
             if self.use_transaction
-            else people_management_db.connection()
+            else people_management_db.connection(replica=self.use_replica)
         )
 
         self._conn = await self._ctx.__aenter__()
@@ -65,18 +73,14 @@ class ServiceFactory:
             self._job_service = JobService(repository=jobs_repository)
         return self._job_service
 
-    @property
-    def system_service(self) -> SystemService:
-        if not self._system_service:
-            self._system_service = SystemService(SystemRepository(self.connection))
-        return self._system_service
-
 
 @asynccontextmanager
 async def service_factory(
-    *, use_transaction: bool = False
+    *, use_transaction: bool = False, readonly: bool = False, use_replica: bool = True
 ) -> c.AsyncGenerator[ServiceFactory, None]:
-    async with ServiceFactory(use_transaction=use_transaction) as sf:
+    async with ServiceFactory(
+        use_transaction=use_transaction, readonly=readonly, use_replica=use_replica
+    ) as sf:
         yield sf
 
 
@@ -1,12 +1,52 @@
+import collections.abc as c
+from datetime import datetime
 from uuid import UUID
 
+from fastapi import status
+from fastapi.exceptions import HTTPException
+
+from person_tool.bulk.export import ExportFormat
+from person_tool.bulk.models import BatchDeleteResponse, ImportReport
+from person_tool.bulk.parsing import ParsedRecord
+from person_tool.config import settings
+from person_tool.db.core import ENTITY_CHANGED_CHANNEL, people_management_db
+from person_tool.db.counts import TotalCount
+from person_tool.db.replicas import requires_fresh_read
+from person_tool.factories.batch_loader import BatchLoader
+from person_tool.factories.entity_cache import EntityCache
 from person_tool.factories.service_factory import service_factory
-from person_tool.jobs.models import CreateJobRequest, JobResponse, UpdateJobRequest
+from person_tool.jobs.models import (
+    CreateJobRequest,
+    JobBatchUpdateResponse,
+    JobHeadcountPage,
+    JobPage,
+    JobResponse,
+    JobStats,
+    UpdateJobRequest,
+)
+
+
+async def _load_jobs(uids: list[UUID]) -> dict[UUID, JobResponse]:
+    # Cache fills read the primary: a lagging replica could otherwise repopulate
+    # an entry right after its NOTIFY invalidation
+    async with service_factory(use_transaction=False, use_replica=False) as sf:
+        return await sf.jobs_service.get_jobs_by_ids(uids=uids)
+
+
+job_loader: BatchLoader[UUID, JobResponse] = BatchLoader(_load_jobs)
+job_cache: EntityCache[JobResponse] = EntityCache(
+    "jobs", max_size=settings.cache.max_size, ttl=settings.cache.ttl
+)
+people_management_db.add_listener(
+    ENTITY_CHANGED_CHANNEL, job_cache.notify, on_gap=job_cache.clear
+)
 
 
 class JobApplication:
     def __init__(self) -> None:
         self.service_factory = service_factory
+        self.job_loader = job_loader
+        self.job_cache = job_cache
 
     async def get_jobs(
         self,
@@ -14,6 +54,8 @@ class JobApplication:
         job_id: str | None,
         title: str | None,
         job_status: str | None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
         limit: int = 10,
         offset: int = 0,
     ) -> list[JobResponse]:
@@ -22,14 +64,87 @@ class JobApplication:
                 job_id=job_id,
                 title=title,
                 job_status=job_status,
+                created_after=created_after,
+                created_before=created_before,
                 limit=limit,
                 offset=offset,
             )
         return jobs
 
-    async def get_job_by_id(self, uid: UUID) -> JobResponse:
+    async def get_jobs_page(
+        self,
+        *,
+        job_id: str | None,
+        title: str | None,
+        job_status: str | None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+        after: tuple[datetime, UUID] | None,
+        limit: int = 10,
+    ) -> JobPage:
+        async with self.service_factory(use_transaction=False) as sf:
+            page: JobPage = await sf.jobs_service.get_jobs_page(
+                job_id=job_id,
+                title=title,
+                job_status=job_status,
+                created_after=created_after,
+                created_before=created_before,
+                after=after,
+                limit=limit,
+            )
+        return page
+
+    async def count_jobs(
+        self,
+        *,
+        job_id: str | None,
+        title: str | None,
+        job_status: str | None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+    ) -> TotalCount:
         async with self.service_factory(use_transaction=False) as sf:
-            job: JobResponse = await sf.jobs_service.get_job_by_id(uid=uid)
+            total: TotalCount = await sf.jobs_service.count_jobs(
+                job_id=job_id,
+                title=title,
+                job_status=job_status,
+                created_after=created_after,
+                created_before=created_before,
+                exact_limit=settings.database.exact_count_limit,
+            )
+        return total
+
+    async def get_job_stats(self) -> JobStats:
+        async with self.service_factory(use_transaction=False) as sf:
+            stats: JobStats = await sf.jobs_service.get_job_stats()
+        return stats
+
+    async def get_headcounts_page(
+        self, *, after: tuple[datetime, UUID] | None, limit: int = 50
+    ) -> JobHeadcountPage:
+        async with self.service_factory(use_transaction=False) as sf:
+            page: JobHeadcountPage = await sf.jobs_service.get_headcounts_page(
+                after=after, limit=limit
+            )
+        return page
+
+    async def get_job_by_id(self, uid: UUID) -> JobResponse:
+        if requires_fresh_read():
+            # Read-your-writes: skip the shared cache and batch
+            async with self.service_factory(use_transaction=False) as sf:
+                return await sf.jobs_service.get_job_by_id(uid=uid)
+        job: JobResponse | None = self.job_cache.get(uid)
+        if job:
+            return job
+        generation: int = self.job_cache.generation
+        # Concurrent lookups share one `uid = ANY($1)` query and one checkout
+        job = await self.job_loader.load(uid)
+        if not job:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Job with uid: {uid} not found",
+            )
+        self.job_cache.set(uid, job, generation=generation)
         return job
 
     async def create_jobs(self, data: list[CreateJobRequest]) -> list[JobResponse]:
@@ -37,11 +152,57 @@ class JobApplication:
             jobs: list[JobResponse] = await sf.jobs_service.create_jobs(data=data)
         return jobs
 
-    async def update_job(self, data: UpdateJobRequest) -> JobResponse:
+    async def export_jobs(self, fmt: ExportFormat) -> c.AsyncIterator[bytes]:
+        # The connection stays checked out, in one read-only snapshot, for as
+        # long as the response is streaming
+        async with self.service_factory(use_transaction=True, readonly=True) as sf:
+            async for chunk in sf.jobs_service.export_jobs(fmt=fmt):
+                yield chunk
+
+    async def import_jobs(self, records: c.AsyncIterator[ParsedRecord]) -> ImportReport:
+        async with self.service_factory(use_transaction=True) as sf:
+            report: ImportReport = await sf.jobs_service.import_jobs(records=records)
+        return report
+
+    async def get_job_version(self, uid: UUID) -> str | None:
+        """
+        Current row version for conditional GETs, from the cache when it holds
+        the row, otherwise with a version-only query.
+        """
+        if not requires_fresh_read():
+            cached: JobResponse | None = self.job_cache.get(uid)
+            if cached:
+                return cached.version
+        async with self.service_factory(use_transaction=False) as sf:
+            return await sf.jobs_service.get_job_version(uid=uid)
+
+    async def update_jobs(self, data: list[UpdateJobRequest]) -> JobBatchUpdateResponse:
         async with self.service_factory(use_transaction=True) as sf:
-            job: JobResponse = await sf.jobs_service.update_job(data=data)
+            response: JobBatchUpdateResponse = await sf.jobs_service.update_jobs(
+                data=data
+            )
+        for job in response.updated:
+            self.job_cache.invalidate(job.uid)
+        return response
+
+    async def update_job(
+        self, data: UpdateJobRequest, if_match: list[str] | None = None
+    ) -> JobResponse:
+        async with self.service_factory(use_transaction=True) as sf:
+            job: JobResponse = await sf.jobs_service.update_job(
+                data=data, if_match=if_match
+            )
+        self.job_cache.invalidate(data.uid)
         return job
 
+    async def delete_jobs(self, uids: list[UUID]) -> BatchDeleteResponse:
+        async with self.service_factory(use_transaction=True) as sf:
+            response: BatchDeleteResponse = await sf.jobs_service.delete_jobs(uids=uids)
+        for uid in response.deleted:
+            self.job_cache.invalidate(uid)
+        return response
+
     async def delete_job(self, uid: UUID) -> None:
         async with self.service_factory(use_transaction=True) as sf:
             await sf.jobs_service.delete_job(uid=uid)
+        self.job_cache.invalidate(uid)
@@ -39,3 +39,52 @@ class UpdateJobRequest(BaseModel):
 class JobResponse(JobBase):
     uid: UUID
     created_at: datetime
+    # Row xmin, surfaced as the ETag rather than in the body
+    version: str | None = Field(default=None, exclude=True)
+
+
+class JobBatchUpdateResponse(BaseModel):
+    updated: list[JobResponse]
+    not_found: list[UUID]
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+
+class JobPage(BaseModel):
+    items: list[JobResponse]
+    next_cursor: str | None = None
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+
+class JobStatusCount(BaseModel):
+    status: str
+    count: int
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+
+class JobStats(BaseModel):
+    total: int
+    by_status: list[JobStatusCount]
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+
+class JobHeadcount(BaseModel):
+    uid: UUID
+    id: str
+    title: str
+    status: str
+    created_at: datetime
+    # USER_JOB relationships pointing at the job
+    headcount: int
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+
+class JobHeadcountPage(BaseModel):
+    items: list[JobHeadcount]
+    next_cursor: str | None = None
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
@@ -0,0 +1,65 @@
+"""
+Check the trigger-maintained job counters behind /jobs/stats and rebuild them.
+
+Recounts jobs by status and USER_JOB relationships per job, prints every
+counter that has drifted or outlived its job, and then rebuilds both counter
+tables from scratch unless --dry-run is given. The rebuild holds a SHARE lock on people.jobs and
+people.user_relationships, so writers wait for it while readers carry on.
+Also the way to backfill the counters of a database that had jobs before the
+triggers were added.
+
+Run from src/api against the database configured in `.env`:
+
+    python -m person_tool.jobs.repair_stats --dry-run
+    python -m person_tool.jobs.repair_stats
+"""
+
+import argparse
+import asyncio
+import sys
+
+from asyncpg import Connection, connect  # type: ignore
+from asyncpg.protocol.protocol import Record  # type: ignore
+
+from person_tool.config import settings
+from person_tool.jobs.repository import JobRepository
+
+
+async def repair(dry_run: bool) -> int:
+    conn: Connection = await connect(
+        user=settings.database.user,
+        password=settings.database.password,
+        database=settings.database.db,
+        host=settings.database.host,
+        port=settings.database.port,
+    )
+    try:
+        repository = JobRepository(conn)  # type: ignore[arg-type]
+        drift: list[Record] = await repository.get_stats_drift()
+        for row in drift:
+            print(
+                f"{row['counter']:<10} {row['key']:<40}"
+                f" counted {row['counted']:>8} actual {row['actual']:>8}"
+            )
+        print(f"{len(drift)} counters drifted")
+        if drift and not dry_run:
+            await repository.rebuild_stats()
+            print("Counters rebuilt")
+    finally:
+        await conn.close()
+    return len(drift)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--dry-run", action="store_true", help="report drift without rebuilding"
+    )
+    args = parser.parse_args()
+    drifted: int = asyncio.run(repair(dry_run=args.dry_run))
+    # Non-zero on a dry run that found drift, for use from cron or CI
+    sys.exit(1 if drifted and args.dry_run else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,39 @@
+import collections.abc as c
 import json
+from datetime import datetime
 from uuid import UUID
 
-from asyncpg import Connection  # type: ignore
 from asyncpg.protocol.protocol import Record  # type: ignore
 
-from person_tool.jobs.models import CreateJobRequest, JobResponse, UpdateJobRequest
+from person_tool.db.counts import TotalCount, total_count
+from person_tool.db.filters import created_range, ilike_filters, newest_first
+from person_tool.db.keys import keyed, stamped
+from person_tool.db.statements import PreparedConnection
+from person_tool.jobs.models import (
+    CreateJobRequest,
+    JobHeadcount,
+    JobResponse,
+    JobStatusCount,
+    UpdateJobRequest,
+)
+
+JOBS_EXPORT_COLUMNS: tuple[str, ...] = (
+    "uid",
+    "id",
+    "title",
+    "description",
+    "status",
+    "created_at",
+)
+JOBS_SELECT: str = (
+    "SELECT uid, id, title, description, status, created_at, xmin::text AS version"
+    " FROM people.jobs"
+)
 
 
 class JobRepository:
-    def __init__(self, conn: Connection) -> None:
-        self.conn: Connection = conn
+    def __init__(self, conn: PreparedConnection) -> None:
+        self.conn: PreparedConnection = conn
 
     async def get_jobs(
         self,
@@ -17,84 +41,290 @@ class JobRepository:
         job_id: str | None,
         title: str | None,
         status: str | None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
         limit: int = 10,
         offset: int = 0,
     ) -> list[JobResponse] | None:
+        where, args = ilike_filters({"id": job_id, "title": title, "status": status})
+        query, args = newest_first(
+            JOBS_SELECT,
+            where,
+            args,
+            created_after=created_after,
+            created_before=created_before,
+            limit=limit,
+            offset=offset,
+        )
+        result: list[Record] = await self.conn.fetch(query, *args)
+        if not result:
+            return None
+        return [JobResponse.model_construct(**r) for r in result]
+
+    async def get_jobs_after(
+        self,
+        *,
+        job_id: str | None,
+        title: str | None,
+        status: str | None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+        after: tuple[datetime, UUID] | None,
+        limit: int = 10,
+    ) -> list[JobResponse] | None:
+        where, args = ilike_filters({"id": job_id, "title": title, "status": status})
+        query, args = newest_first(
+            JOBS_SELECT,
+            where,
+            args,
+            created_after=created_after,
+            created_before=created_before,
+            after=after,
+            limit=limit,
+        )
+        result: list[Record] = await self.conn.fetch(query, *args)
+        if not result:
+            return None
+        return [JobResponse.model_construct(**r) for r in result]
+
+    async def count_jobs(
+        self,
+        *,
+        job_id: str | None,
+        title: str | None,
+        status: str | None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+        exact_limit: int,
+    ) -> TotalCount:
+        where, args = ilike_filters({"id": job_id, "title": title, "status": status})
+        where, args = created_range(
+            where, args, created_after=created_after, created_before=created_before
+        )
+        return await total_count(
+            self.conn, "people.jobs", where, args, exact_limit=exact_limit
+        )
+
+    async def get_status_counts(self) -> list[JobStatusCount]:
         result: list[Record] = await self.conn.fetch(
             """
-            SELECT uid, id, title, description, status, created_at
-            FROM people.jobs
-            WHERE ($1::text IS NULL OR id ILIKE '%' || $1 || '%')
-              AND ($2::text IS NULL OR title ILIKE '%' || $2 || '%')
-              AND ($3::text IS NULL OR status ILIKE '%' || $3 || '%')
-            ORDER BY created_at DESC
-            LIMIT $4 OFFSET $5
+            SELECT status, sum(count)::bigint AS count
+            FROM people.job_status_counts
+            GROUP BY status
+            HAVING sum(count) > 0
+            ORDER BY count DESC, status
+            """
+        )
+        return [JobStatusCount.model_construct(**r) for r in result]
+
+    async def get_headcounts_after(
+        self, *, after: tuple[datetime, UUID] | None, limit: int
+    ) -> list[JobHeadcount] | None:
+        query, args = newest_first(
+            """
+            SELECT j.uid, j.id, j.title, j.status, j.created_at,
+                   COALESCE(h.headcount, 0) AS headcount
+            FROM people.jobs j
+            LEFT JOIN people.job_headcounts h ON h.job_uid = j.uid
             """,
-            job_id,
-            title,
-            status,
-            limit,
-            offset,
+            "TRUE",
+            [],
+            alias="j.",
+            after=after,
+            limit=limit,
         )
+        result: list[Record] = await self.conn.fetch(query, *args)
         if not result:
             return None
-        return [JobResponse.model_validate(dict(r)) for r in result]
+        return [JobHeadcount.model_construct(**r) for r in result]
 
-    async def get_job_by_id(self, uid: UUID) -> JobResponse | None:
-        result: Record | None = await self.conn.fetchrow(
+    async def get_stats_drift(self) -> list[Record]:
+        """
+        Counter rows that disagree with a recount of the tables, as
+        (counter, key, counted, actual), plus headcount rows left behind for
+        jobs that no longer exist, as 'orphan'. Scans both tables.
+        """
+        return await self.conn.fetch(
+            """
+            SELECT 'status' AS counter, status AS key,
+                   COALESCE(c.count, 0) AS counted, COALESCE(a.count, 0) AS actual
+            FROM (
+                SELECT status, sum(count)::bigint AS count
+                FROM people.job_status_counts GROUP BY status
+            ) c
+            FULL JOIN (
+                SELECT status, count(*) FROM people.jobs GROUP BY status
+            ) a USING (status)
+            WHERE COALESCE(c.count, 0) <> COALESCE(a.count, 0)
+            UNION ALL
+            SELECT 'headcount', job_uid::text,
+                   COALESCE(h.headcount, 0), COALESCE(a.headcount, 0)
+            FROM (
+                SELECT h.job_uid, h.headcount
+                FROM people.job_headcounts h
+                JOIN people.jobs j ON j.uid = h.job_uid
+            ) h
+            FULL JOIN (
+                SELECT r.secondary_uid AS job_uid, count(*) AS headcount
+                FROM people.user_relationships r
+                JOIN people.jobs j ON j.uid = r.secondary_uid
+                WHERE r.relationship_type = 'USER_JOB'
+                GROUP BY r.secondary_uid
+            ) a USING (job_uid)
+            WHERE COALESCE(h.headcount, 0) <> COALESCE(a.headcount, 0)
+            UNION ALL
+            SELECT 'orphan', h.job_uid::text, h.headcount, 0
+            FROM people.job_headcounts h
+            WHERE NOT EXISTS (SELECT 1 FROM people.jobs j WHERE j.uid = h.job_uid)
             """
-            SELECT uid, id, title, description, status, created_at
-            FROM people.jobs WHERE uid = $1
-            """,
-            uid,
         )
-        return JobResponse.model_validate(dict(result)) if result else None
+
+    async def rebuild_stats(self) -> None:
+        await self.conn.execute("SELECT people.rebuild_job_stats()")
+
+    async def get_job_by_id(self, uid: UUID) -> JobResponse | None:
+        result: Record | None = await self.conn.fetchrow_prepared("jobs_get_by_id", uid)
+        return JobResponse.model_construct(**result) if result else None
+
+    async def get_jobs_by_ids(self, uids: list[UUID]) -> list[JobResponse]:
+        result: list[Record] = await self.conn.fetch_prepared("jobs_get_by_ids", uids)
+        return [JobResponse.model_construct(**r) for r in result]
 
     async def create_jobs(
         self,
         data: list[CreateJobRequest],
     ) -> list[JobResponse]:
-        payload: str = json.dumps([d.model_dump() for d in data])
+        payload: str = json.dumps(keyed([d.model_dump() for d in data]))
         result: list[Record] = await self.conn.fetch(
             """
                 WITH payload AS (
                     SELECT * FROM jsonb_to_recordset($1::jsonb)
-                AS t(id text, title text, description text, status text)
+                AS t(uid uuid, id text, title text, description text, status text)
                 )
-                INSERT INTO people.jobs (id, title, description, status)
-                SELECT id, title, description, status
+                INSERT INTO people.jobs (uid, created_at, id, title, description, status)
+                SELECT uid, people.uuid7_time(uid), id, title, description, status
                 FROM payload
-                RETURNING uid, id, title, description, status, created_at;
+                RETURNING uid, id, title, description, status, created_at, xmin::text AS version;
                 """,
             payload,
         )
-        return [JobResponse.model_validate(dict(r)) for r in result]
+        return [JobResponse.model_construct(**r) for r in result]
+
+    async def iter_jobs(self) -> c.AsyncIterator[Record]:
+        """
+        Stream every job through a server-side cursor. Must run inside a
+        transaction.
+        """
+        query, args = newest_first(
+            f"SELECT {', '.join(JOBS_EXPORT_COLUMNS)} FROM people.jobs", "TRUE", []
+        )
+        async for record in self.conn.cursor(query, *args, prefetch=1000):
+            yield record
+
+    async def create_import_table(self) -> None:
+        await self.conn.execute(
+            """
+            CREATE TEMP TABLE jobs_import (
+                uid         bytea NOT NULL,
+                line        int   NOT NULL,
+                id          text  NOT NULL,
+                title       text  NOT NULL,
+                description text  NOT NULL,
+                status      text  NOT NULL
+            ) ON COMMIT DROP
+            """
+        )
+
+    async def stage_jobs(self, rows: list[tuple]) -> None:
+        await self.conn.copy_records_to_table(
+            "jobs_import",
+            records=stamped(rows),
+            columns=(
+                "uid",
+                "line",
+                "id",
+                "title",
+                "description",
+                "status",
+            ),
+        )
 
-    async def update_job(self, data: UpdateJobRequest) -> JobResponse | None:
-        row: Record | None = await self.conn.fetchrow(
+    async def merge_jobs_import(self) -> int:
+        status: str = await self.conn.execute(
+            """
+            INSERT INTO people.jobs (uid, created_at, id, title, description, status)
+            SELECT uid, people.uuid7_time(uid), id, title, description, status
+            FROM (
+                SELECT encode(uid, 'hex')::uuid AS uid, line, id, title, description, status
+                FROM jobs_import
+            ) s
+            ORDER BY line
             """
-            UPDATE people.jobs
+        )
+        return int(status.rsplit(" ", 1)[-1])
+
+    async def update_jobs(self, data: list[UpdateJobRequest]) -> list[JobResponse]:
+        """
+        Apply many partial updates in one statement; unset fields keep their
+        current value. Uids with no matching row are simply absent from the result.
+        """
+        payload: str = json.dumps([d.model_dump(mode="json") for d in data])
+        result: list[Record] = await self.conn.fetch(
+            """
+            UPDATE people.jobs j
             SET
-                id          = COALESCE($2, id),
-                title       = COALESCE($3, title),
-                description = COALESCE($4, description),
-                status      = COALESCE($5, status)
-            WHERE uid = $1
-            RETURNING uid, id, title, description, status, created_at;
+                id          = COALESCE(p.id, j.id),
+                title       = COALESCE(p.title, j.title),
+                description = COALESCE(p.description, j.description),
+                status      = COALESCE(p.status, j.status)
+            FROM jsonb_to_recordset($1::jsonb)
+                AS p(uid uuid, id text, title text, description text, status text)
+            WHERE j.uid = p.uid
+            RETURNING j.uid, j.id, j.title, j.description, j.status, j.created_at,
+                      j.xmin::text AS version
             """,
+            payload,
+        )
+        return [JobResponse.model_construct(**r) for r in result]
+
+    async def update_job(
+        self, data: UpdateJobRequest, if_match: list[str] | None = None
+    ) -> JobResponse | None:
+        row: Record | None = await self.conn.fetchrow_prepared(
+            "jobs_update",
             data.uid,
             data.id,
             data.title,
             data.description,
             data.status,
+            if_match,
         )
-        return JobResponse.model_validate(dict(row)) if row else None
+        return JobResponse.model_construct(**row) if row else None
 
-    async def delete_job(self, uid: UUID) -> str:
-        result = await self.conn.execute(
+    async def get_job_version(self, uid: UUID) -> str | None:
+        return await self.conn.fetchval_prepared("jobs_get_version", uid)
+
+    async def delete_jobs(self, uids: list[UUID]) -> list[UUID]:
+        """
+        Delete every job in `uids`, and the relationships on either side of
+        them, in one statement. Returns the uids that were deleted.
+        """
+        result: list[Record] = await self.conn.fetch(
             """
-            DELETE FROM people.jobs WHERE uid = $1
+            WITH deleted AS (
+                DELETE FROM people.jobs WHERE uid = ANY($1::uuid[]) RETURNING uid
+            ), relationships AS (
+                -- Keyed on the rows actually deleted: a uid of another kind
+                -- must not take that entity's relationships with it
+                DELETE FROM people.user_relationships
+                WHERE primary_uid IN (SELECT uid FROM deleted)
+                   OR secondary_uid IN (SELECT uid FROM deleted)
+            )
+            SELECT uid FROM deleted
             """,
-            uid,
+            uids,
         )
-        return result
+        return [r["uid"] for r in result]
+
+    async def delete_job(self, uid: UUID) -> str:
+        return await self.conn.execute_prepared("jobs_delete", uid)
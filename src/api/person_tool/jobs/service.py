@@ -1,10 +1,28 @@
+import collections.abc as c
+from datetime import datetime
 from uuid import UUID
 
 from fastapi import status
 from fastapi.exceptions import HTTPException
 
-from person_tool.jobs.models import CreateJobRequest, JobResponse, UpdateJobRequest
-from person_tool.jobs.repository import JobRepository
+from person_tool.bulk.export import ExportFormat, encode_records
+from person_tool.bulk.ingest import stage_records
+from person_tool.bulk.models import BatchDeleteResponse, ImportReport
+from person_tool.bulk.parsing import ParsedRecord
+from person_tool.db.counts import TotalCount
+from person_tool.jobs.models import (
+    CreateJobRequest,
+    JobBatchUpdateResponse,
+    JobHeadcount,
+    JobHeadcountPage,
+    JobPage,
+    JobResponse,
+    JobStats,
+    JobStatusCount,
+    UpdateJobRequest,
+)
+from person_tool.jobs.repository import JOBS_EXPORT_COLUMNS, JobRepository
+from person_tool.utils.cursor import encode_cursor
 
 
 class JobService:
@@ -17,6 +35,8 @@ class JobService:
         job_id: str | None,
         title: str | None,
         job_status: str | None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
         limit: int = 10,
         offset: int = 0,
     ) -> list[JobResponse]:
@@ -24,6 +44,8 @@ class JobService:
             job_id=job_id,
             title=title,
             status=job_status,
+            created_after=created_after,
+            created_before=created_before,
             limit=limit,
             offset=offset,
         )
@@ -34,6 +56,77 @@ class JobService:
             )
         return jobs
 
+    async def get_jobs_page(
+        self,
+        *,
+        job_id: str | None,
+        title: str | None,
+        job_status: str | None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+        after: tuple[datetime, UUID] | None,
+        limit: int = 10,
+    ) -> JobPage:
+        jobs: list[JobResponse] | None = await self.repository.get_jobs_after(
+            job_id=job_id,
+            title=title,
+            status=job_status,
+            created_after=created_after,
+            created_before=created_before,
+            after=after,
+            limit=limit + 1,
+        )
+        if not jobs:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Jobs not found",
+            )
+        next_cursor: str | None = None
+        if len(jobs) > limit:
+            jobs = jobs[:limit]
+            next_cursor = encode_cursor(jobs[-1].created_at, jobs[-1].uid)
+        return JobPage(items=jobs, next_cursor=next_cursor)
+
+    async def count_jobs(
+        self,
+        *,
+        job_id: str | None,
+        title: str | None,
+        job_status: str | None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+        exact_limit: int,
+    ) -> TotalCount:
+        return await self.repository.count_jobs(
+            job_id=job_id,
+            title=title,
+            status=job_status,
+            created_after=created_after,
+            created_before=created_before,
+            exact_limit=exact_limit,
+        )
+
+    async def get_job_stats(self) -> JobStats:
+        counts: list[JobStatusCount] = await self.repository.get_status_counts()
+        return JobStats(total=sum(c.count for c in counts), by_status=counts)
+
+    async def get_headcounts_page(
+        self, *, after: tuple[datetime, UUID] | None, limit: int = 50
+    ) -> JobHeadcountPage:
+        items: list[JobHeadcount] | None = await self.repository.get_headcounts_after(
+            after=after, limit=limit + 1
+        )
+        if not items:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Jobs not found",
+            )
+        next_cursor: str | None = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = encode_cursor(items[-1].created_at, items[-1].uid)
+        return JobHeadcountPage(items=items, next_cursor=next_cursor)
+
     async def get_job_by_id(self, uid: UUID) -> JobResponse:
         job: JobResponse | None = await self.repository.get_job_by_id(uid=uid)
         if not job:
@@ -43,19 +136,68 @@ class JobService:
             )
         return job
 
+    async def get_jobs_by_ids(self, uids: list[UUID]) -> dict[UUID, JobResponse]:
+        jobs: list[JobResponse] = await self.repository.get_jobs_by_ids(uids=uids)
+        return {job.uid: job for job in jobs}
+
     async def create_jobs(self, data: list[CreateJobRequest]) -> list[JobResponse]:
         response: list[JobResponse] = await self.repository.create_jobs(data=data)
         return response
 
-    async def update_job(self, data: UpdateJobRequest) -> JobResponse:
-        job: JobResponse | None = await self.repository.update_job(data=data)
+    def export_jobs(self, fmt: ExportFormat) -> c.AsyncIterator[bytes]:
+        return encode_records(
+            self.repository.iter_jobs(), columns=JOBS_EXPORT_COLUMNS, fmt=fmt
+        )
+
+    async def import_jobs(self, records: c.AsyncIterator[ParsedRecord]) -> ImportReport:
+        await self.repository.create_import_table()
+        report: ImportReport = await stage_records(
+            records,
+            model=CreateJobRequest,
+            columns=("id", "title", "description", "status"),
+            stage=self.repository.stage_jobs,
+        )
+        report.inserted = await self.repository.merge_jobs_import()
+        return report
+
+    async def get_job_version(self, uid: UUID) -> str | None:
+        return await self.repository.get_job_version(uid=uid)
+
+    async def update_jobs(self, data: list[UpdateJobRequest]) -> JobBatchUpdateResponse:
+        updated: list[JobResponse] = await self.repository.update_jobs(data=data)
+        found: set[UUID] = {job.uid for job in updated}
+        return JobBatchUpdateResponse(
+            updated=updated,
+            not_found=[d.uid for d in data if d.uid not in found],
+        )
+
+    async def update_job(
+        self, data: UpdateJobRequest, if_match: list[str] | None = None
+    ) -> JobResponse:
+        job: JobResponse | None = await self.repository.update_job(
+            data=data, if_match=if_match
+        )
         if not job:
+            if if_match is not None and await self.repository.get_job_version(
+                uid=data.uid
+            ):
+                raise HTTPException(
+                    status_code=status.HTTP_412_PRECONDITION_FAILED,
+                    detail=f"Job with uid: {data.uid} has been modified",
+                )
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Job with uid: {data.uid} not found",
             )
         return job
 
+    async def delete_jobs(self, uids: list[UUID]) -> BatchDeleteResponse:
+        deleted: list[UUID] = await self.repository.delete_jobs(uids=uids)
+        found: set[UUID] = set(deleted)
+        return BatchDeleteResponse(
+            deleted=deleted, not_found=[uid for uid in uids if uid not in found]
+        )
+
     async def delete_job(self, uid: UUID) -> None:
         result: str = await self.repository.delete_job(uid=uid)
         if result != "DELETE 1":
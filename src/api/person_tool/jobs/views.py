@@ -1,25 +1,66 @@
 import typing as t
+from datetime import datetime
 from uuid import UUID
 
-from fastapi import APIRouter, Body, Depends, Path, Query, status
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Header,
+    Path,
+    Query,
+    Request,
+    Response,
+    status,
+)
 from fastapi.exceptions import HTTPException
+from fastapi.responses import StreamingResponse
 
+from person_tool.bulk.export import EXPORT_MEDIA_TYPES, ExportFormat
+from person_tool.bulk.models import (
+    MAX_BATCH_SIZE,
+    BatchDeleteResponse,
+    ImportReport,
+)
+from person_tool.bulk.parsing import aiter_records, is_supported
 from person_tool.dependencies import provide_job_application
 from person_tool.jobs.application import JobApplication
-from person_tool.jobs.models import CreateJobRequest, JobResponse, UpdateJobRequest
+from person_tool.jobs.models import (
+    CreateJobRequest,
+    JobBatchUpdateResponse,
+    JobHeadcountPage,
+    JobPage,
+    JobResponse,
+    JobStats,
+    UpdateJobRequest,
+)
+from person_tool.responses import (
+    ModelJSONResponse,
+    not_modified,
+    total_count_headers,
+)
+from person_tool.utils.cursor import decode_cursor
+from person_tool.utils.etag import (
+    collection_etag,
+    entity_etag,
+    if_match_versions,
+    if_none_match,
+)
 
 router = APIRouter()
 
 
 @router.get(
     path="/",
+    response_model=list[JobResponse] | JobPage,
     status_code=status.HTTP_200_OK,
     summary="Get jobs by query params",
     responses={
         status.HTTP_200_OK: {
-            "model": list[JobResponse],
+            "model": list[JobResponse] | JobPage,
             "description": "Gets jobs from the db by query parameters",
         },
+        status.HTTP_400_BAD_REQUEST: {"description": "Invalid cursor"},
         status.HTTP_404_NOT_FOUND: {"description": "Jobs not found"},
     },
 )
@@ -34,23 +75,165 @@ async def get_jobs(
     job_status: str | None = Query(
         default=None, alias="status", examples=["active", "inactive", "pending"]
     ),
-    limit: int = 10,
-    offset: int = 0,
-) -> list[JobResponse]:
+    created_after: t.Annotated[
+        datetime | None,
+        Query(
+            alias="createdAfter",
+            description="Only rows created at or after this time (UTC if no offset)",
+        ),
+    ] = None,
+    created_before: t.Annotated[
+        datetime | None,
+        Query(
+            alias="createdBefore",
+            description="Only rows created before this time (UTC if no offset)",
+        ),
+    ] = None,
+    limit: int = Query(default=10, ge=1, le=1000),
+    offset: int = Query(default=0, ge=0),
+    cursor: str | None = Query(
+        default=None,
+        description="Keyset cursor. Pass an empty value for the first page, "
+        "then the returned nextCursor. Ignores offset.",
+    ),
+    total_count: bool = Query(
+        default=False,
+        alias="totalCount",
+        description="Add an X-Total-Count header: exact for small results, "
+        "estimated from table statistics otherwise. X-Total-Count-Exact says which.",
+    ),
+    if_none_match_header: str | None = Header(default=None, alias="If-None-Match"),
+) -> Response:
     """
     Get jobs by query params
     """
-    return await application.get_jobs(
+
+    async def total_headers() -> dict[str, str]:
+        if not total_count:
+            return {}
+        return total_count_headers(
+            await application.count_jobs(
+                job_id=job_id,
+                title=title,
+                job_status=job_status,
+                created_after=created_after,
+                created_before=created_before,
+            )
+        )
+
+    if cursor is not None:
+        try:
+            after = decode_cursor(cursor) if cursor else None
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+            ) from e
+        page: JobPage = await application.get_jobs_page(
+            job_id=job_id,
+            title=title,
+            job_status=job_status,
+            created_after=created_after,
+            created_before=created_before,
+            after=after,
+            limit=limit,
+        )
+        etag: str = collection_etag(page.items, page.next_cursor)
+        totals: dict[str, str] = await total_headers()
+        if if_none_match(if_none_match_header, etag):
+            return not_modified(etag, totals)
+        return ModelJSONResponse(page, headers={"ETag": etag, **totals})
+    jobs: list[JobResponse] = await application.get_jobs(
         job_id=job_id,
         title=title,
         job_status=job_status,
+        created_after=created_after,
+        created_before=created_before,
         limit=limit,
         offset=offset,
     )
+    etag: str = collection_etag(jobs)
+    totals: dict[str, str] = await total_headers()
+    if if_none_match(if_none_match_header, etag):
+        return not_modified(etag, totals)
+    return ModelJSONResponse(jobs, headers={"ETag": etag, **totals})
+
+
+@router.get(
+    path="/export",
+    status_code=status.HTTP_200_OK,
+    summary="Export all jobs",
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {
+            "content": {"application/x-ndjson": {}, "text/csv": {}},
+            "description": "Streams every job as NDJSON or CSV",
+        },
+    },
+)
+async def export_jobs(
+    application: t.Annotated[JobApplication, Depends(provide_job_application)],
+    fmt: t.Annotated[ExportFormat, Query(alias="format")] = "ndjson",
+) -> StreamingResponse:
+    """
+    Stream all jobs, newest first, from a server-side cursor
+    """
+    return StreamingResponse(
+        application.export_jobs(fmt=fmt),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="jobs.{fmt}"'},
+    )
+
+
+@router.get(
+    path="/stats",
+    response_model=JobStats,
+    status_code=status.HTTP_200_OK,
+    summary="Job counts by status",
+)
+async def get_job_stats(
+    application: t.Annotated[JobApplication, Depends(provide_job_application)],
+) -> ModelJSONResponse:
+    """
+    Number of jobs in each status, read from trigger-maintained counters
+    """
+    return ModelJSONResponse(await application.get_job_stats())
+
+
+@router.get(
+    path="/stats/headcount",
+    response_model=JobHeadcountPage,
+    status_code=status.HTTP_200_OK,
+    summary="Headcount per job",
+    responses={
+        status.HTTP_400_BAD_REQUEST: {"description": "Invalid cursor"},
+        status.HTTP_404_NOT_FOUND: {"description": "Jobs not found"},
+    },
+)
+async def get_job_headcounts(
+    application: t.Annotated[JobApplication, Depends(provide_job_application)],
+    limit: int = Query(default=50, ge=1, le=1000),
+    cursor: str | None = Query(
+        default=None, description="nextCursor from the previous page"
+    ),
+) -> ModelJSONResponse:
+    """
+    A page of jobs, newest first, each with the number of users holding it
+    """
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from e
+    page: JobHeadcountPage = await application.get_headcounts_page(
+        after=after, limit=limit
+    )
+    return ModelJSONResponse(page)
 
 
 @router.get(
     path="/{uid}",
+    response_model=JobResponse,
     status_code=status.HTTP_200_OK,
     summary="Get job by uid",
     responses={
@@ -58,17 +241,27 @@ async def get_jobs(
             "model": JobResponse,
             "description": "Gets a job from the db by uid",
         },
+        status.HTTP_304_NOT_MODIFIED: {"description": "Job unchanged"},
         status.HTTP_404_NOT_FOUND: {"description": "Job not found"},
     },
 )
 async def get_job_by_id(
     application: t.Annotated[JobApplication, Depends(provide_job_application)],
     uid: UUID = Path(..., title="Job id to retrieve"),
-) -> JobResponse:
+    if_none_match_header: str | None = Header(default=None, alias="If-None-Match"),
+) -> Response:
     """
     Retrieve a job by id
     """
-    return await application.get_job_by_id(uid=uid)
+    if if_none_match_header:
+        version: str | None = await application.get_job_version(uid=uid)
+        if version and if_none_match(if_none_match_header, entity_etag(version)):
+            return not_modified(entity_etag(version))
+    job: JobResponse = await application.get_job_by_id(uid=uid)
+    headers: dict[str, str] = {}
+    if job.version:
+        headers["ETag"] = entity_etag(job.version)
+    return ModelJSONResponse(job, headers=headers)
 
 
 @router.post(
@@ -101,6 +294,87 @@ async def create_jobs(
     return await application.create_jobs(data=data)
 
 
+@router.post(
+    path="/import",
+    status_code=status.HTTP_201_CREATED,
+    summary="Bulk import jobs",
+    responses={
+        status.HTTP_201_CREATED: {
+            "model": ImportReport,
+            "description": "Imports jobs from a streamed NDJSON or CSV body",
+        },
+        status.HTTP_415_UNSUPPORTED_MEDIA_TYPE: {
+            "description": "Body must be application/x-ndjson or text/csv"
+        },
+    },
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/x-ndjson": {"schema": {"type": "string"}},
+                "text/csv": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def import_jobs(
+    application: t.Annotated[JobApplication, Depends(provide_job_application)],
+    request: Request,
+) -> ImportReport:
+    """
+    Stream jobs from an NDJSON body (one object per line) or a CSV body with a
+    header row, staging them with COPY and merging them in one transaction.
+    Rows that fail validation or collide with existing data are reported by line.
+    """
+    content_type: str = request.headers.get("content-type", "")
+    if not is_supported(content_type):
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Body must be application/x-ndjson or text/csv",
+        )
+    return await application.import_jobs(
+        records=aiter_records(request.stream(), content_type)
+    )
+
+
+@router.patch(
+    path="/batch",
+    response_model=JobBatchUpdateResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Update many jobs",
+    responses={
+        status.HTTP_200_OK: {
+            "model": JobBatchUpdateResponse,
+            "description": "Updated jobs, and the uids that were not found",
+        },
+        status.HTTP_400_BAD_REQUEST: {
+            "description": f"Duplicate uids, or more than {MAX_BATCH_SIZE} updates"
+        },
+    },
+)
+async def update_jobs(
+    application: t.Annotated[JobApplication, Depends(provide_job_application)],
+    data: t.Annotated[
+        list[UpdateJobRequest], Body(title="Partial updates, one per uid")
+    ],
+) -> ModelJSONResponse:
+    """
+    Apply a batch of partial updates in one statement and transaction
+    """
+    if len(data) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot update more than {MAX_BATCH_SIZE} jobs at once",
+        )
+    if len({d.uid for d in data}) != len(data):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Each uid may only appear once per batch",
+        )
+    response: JobBatchUpdateResponse = await application.update_jobs(data=data)
+    return ModelJSONResponse(response)
+
+
 @router.patch(
     path="/",
     status_code=status.HTTP_202_ACCEPTED,
@@ -110,19 +384,61 @@ async def create_jobs(
             "description": "Job updated",
         },
         status.HTTP_404_NOT_FOUND: {"description": "Job not found"},
+        status.HTTP_412_PRECONDITION_FAILED: {
+            "description": "Job changed since the If-Match ETag was issued"
+        },
     },
 )
 async def update_job(
     application: t.Annotated[JobApplication, Depends(provide_job_application)],
+    response: Response,
     data: UpdateJobRequest = Body(...),
+    if_match: str | None = Header(default=None, alias="If-Match"),
 ) -> JobResponse:
     """
-    Update a job
+    Update a job. With `If-Match`, only if it still has that ETag
     """
-    job: JobResponse = await application.update_job(data=data)
+    job: JobResponse = await application.update_job(
+        data=data, if_match=if_match_versions(if_match)
+    )
+    if job.version:
+        response.headers["ETag"] = entity_etag(job.version)
     return job
 
 
+@router.delete(
+    path="/batch",
+    response_model=BatchDeleteResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Delete many jobs",
+    responses={
+        status.HTTP_200_OK: {
+            "model": BatchDeleteResponse,
+            "description": "Deleted uids, and the uids that were not found",
+        },
+        status.HTTP_400_BAD_REQUEST: {
+            "description": f"More than {MAX_BATCH_SIZE} uids"
+        },
+    },
+)
+async def delete_jobs(
+    application: t.Annotated[JobApplication, Depends(provide_job_application)],
+    uids: t.Annotated[list[UUID], Body(title="Job uids to delete")],
+) -> ModelJSONResponse:
+    """
+    Delete a batch of jobs, and their relationships, in one transaction
+    """
+    if len(uids) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot delete more than {MAX_BATCH_SIZE} jobs at once",
+        )
+    response: BatchDeleteResponse = await application.delete_jobs(
+        uids=list(dict.fromkeys(uids))
+    )
+    return ModelJSONResponse(response)
+
+
 @router.delete(
     path="/{uid}",
     status_code=status.HTTP_204_NO_CONTENT,
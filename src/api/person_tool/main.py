@@ -1,11 +1,14 @@
-import uvicorn
 from fastapi import FastAPI
 from fastapi.responses import FileResponse, RedirectResponse
 
 from person_tool.config import configure_logging, settings
 from person_tool.jobs.views import router as job_router
 from person_tool.lifespan import lifespan
-from person_tool.middlewares.measure_response_time import add_process_time_header
+from person_tool.middlewares.admission import AdmissionMiddleware
+from person_tool.middlewares.deadlines import DeadlineMiddleware
+from person_tool.middlewares.metrics import MetricsMiddleware
+from person_tool.middlewares.read_your_writes import ReadYourWritesMiddleware
+from person_tool.middlewares.server_timing import ServerTimingMiddleware
 from person_tool.system.views import router as system_router
 from person_tool.users.views import router as user_router
 
@@ -21,7 +24,13 @@ app: FastAPI = FastAPI(
 )
 
 
-app.middleware("http")(add_process_time_header)
+# Innermost, so shed requests still show up in metrics and Server-Timing
+app.add_middleware(AdmissionMiddleware)
+# Outside admission, so time spent queueing for a slot counts too
+app.add_middleware(DeadlineMiddleware)
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(ServerTimingMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 
 @app.get("/", include_in_schema=False)
@@ -50,10 +59,18 @@ app.include_router(
 
 
 if __name__ == "__main__":
+    # Only the launcher needs uvicorn; workers import this module by name
+    import uvicorn
+
     uvicorn.run(
         "person_tool.main:app",
         host=settings.app.host,
         port=settings.app.port,
         reload=settings.app.reload,
         log_level=settings.app.log_level,
+        # Each worker runs `lifespan`, opening its own share of the pool budget
+        workers=settings.worker_count,
+        # uvloop and httptools when installed (uvicorn[standard]), else asyncio/h11
+        loop="auto",
+        http="auto",
     )
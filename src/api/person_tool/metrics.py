@@ -0,0 +1,273 @@
+import abc
+import collections.abc as c
+import math
+from bisect import bisect_left
+
+# Seconds; covers a cached lookup (~1ms) up to a slow export
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = (f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric(abc.ABC):
+    kind: str = "untyped"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()) -> None:
+        self.name: str = name
+        self.help: str = help
+        self.label_names: tuple[str, ...] = labels
+
+    @abc.abstractmethod
+    def samples(self) -> c.Iterator[str]: ...
+
+    def render(self) -> c.Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.kind}"
+        yield from self.samples()
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value: float = 0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Counter(_Metric):
+    """Monotonic counter; use rate() for per-second figures."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()) -> None:
+        super().__init__(name, help, labels)
+        self._children: dict[tuple[str, ...], _Value] = {}
+
+    def labels(self, *values: str) -> _Value:
+        child: _Value | None = self._children.get(values)
+        if child is None:
+            child = self._children[values] = _Value()
+        return child
+
+    def samples(self) -> c.Iterator[str]:
+        for values, child in self._children.items():
+            labels: str = _format_labels(self.label_names, values)
+            yield f"{self.name}{labels} {_format_value(child.value)}"
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+
+class _Buckets:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self.bounds: tuple[float, ...] = bounds
+        self.counts: list[int] = [0] * (len(bounds) + 1)
+        self.sum: float = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+
+class Histogram(_Metric):
+    """
+    Fixed-bucket histogram. observe() is a bisect and two additions; the
+    cumulative counts are only built when rendering.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labels)
+        self.buckets: tuple[float, ...] = buckets
+        self._children: dict[tuple[str, ...], _Buckets] = {}
+
+    def labels(self, *values: str) -> _Buckets:
+        child: _Buckets | None = self._children.get(values)
+        if child is None:
+            child = self._children[values] = _Buckets(self.buckets)
+        return child
+
+    def samples(self) -> c.Iterator[str]:
+        names: tuple[str, ...] = (*self.label_names, "le")
+        for values, child in self._children.items():
+            cumulative: int = 0
+            for bound, count in zip((*self.buckets, math.inf), child.counts):
+                cumulative += count
+                labels: str = _format_labels(names, (*values, _format_value(bound)))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.label_names, values)
+            yield f"{self.name}_sum{labels} {_format_value(child.sum)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: list[_Metric] = []
+        self._collectors: list[c.Callable[[], None]] = []
+
+    def register[M: _Metric](self, metric: M) -> M:
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: c.Callable[[], None]) -> None:
+        """Register a callback that refreshes point-in-time gauges before a scrape."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            collector()
+        return "\n".join(line for m in self._metrics for line in m.render()) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_request_duration = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "Request latency by route template",
+        labels=("method", "route", "status"),
+    )
+)
+http_requests_in_flight = registry.register(
+    Gauge(
+        "http_requests_in_flight",
+        "Requests currently being served",
+        labels=("method",),
+    )
+)
+db_pool_checkout_wait = registry.register(
+    Histogram(
+        "db_pool_checkout_wait_seconds",
+        "Time spent waiting for a pooled connection",
+        labels=("pool",),
+    )
+)
+db_pool_checkouts = registry.register(
+    Counter(
+        "db_pool_checkouts_total",
+        "Connections checked out of the pool",
+        labels=("pool",),
+    )
+)
+db_pool_acquire_timeouts = registry.register(
+    Counter(
+        "db_pool_acquire_timeouts_total",
+        "Checkouts abandoned after POSTGRES_ACQUIRE_TIMEOUT",
+        labels=("pool",),
+    )
+)
+db_pool_size = registry.register(
+    Gauge("db_pool_size", "Open connections in the pool", labels=("pool",))
+)
+db_pool_idle = registry.register(
+    Gauge("db_pool_idle", "Idle connections in the pool", labels=("pool",))
+)
+db_pool_max_size = registry.register(
+    Gauge("db_pool_max_size", "Configured maximum pool size", labels=("pool",))
+)
+db_pool_saturation = registry.register(
+    Gauge(
+        "db_pool_saturation",
+        "Checked-out connections as a share of the maximum pool size",
+        labels=("pool",),
+    )
+)
+db_health_up = registry.register(
+    Gauge("db_health_up", "1 if the last database health probe succeeded")
+)
+db_health_probe_duration = registry.register(
+    Histogram(
+        "db_health_probe_duration_seconds",
+        "Round trip of the database health probe on its reserved connection",
+    )
+)
+admission_in_flight = registry.register(
+    Gauge(
+        "admission_in_flight",
+        "Admitted requests currently being served, by route class",
+        labels=("route_class",),
+    )
+)
+admission_rejections = registry.register(
+    Counter(
+        "admission_rejections_total",
+        "Requests shed with a 503, by route class and reason",
+        labels=("route_class", "reason"),
+    )
+)
+request_cancellations = registry.register(
+    Counter(
+        "request_cancellations_total",
+        "Requests cut short by a client disconnect or their deadline",
+        labels=("reason",),
+    )
+)
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    "admission_in_flight",
+    "admission_rejections",
+    "db_health_probe_duration",
+    "db_health_up",
+    "db_pool_acquire_timeouts",
+    "db_pool_checkout_wait",
+    "db_pool_checkouts",
+    "db_pool_idle",
+    "db_pool_max_size",
+    "db_pool_saturation",
+    "db_pool_size",
+    "http_request_duration",
+    "http_requests_in_flight",
+    "registry",
+    "request_cancellations",
+]
@@ -0,0 +1,136 @@
+import asyncio
+import typing as t
+
+from starlette import status
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from person_tool.config import settings
+from person_tool.db.core import PoolTimeoutError
+from person_tool.metrics import admission_in_flight, admission_rejections
+
+RouteClass = t.Literal["read", "write", "bulk"]
+
+# Path segments of the import, export and batch endpoints, which hold a
+# connection for much longer than a single-row read or write
+BULK_SEGMENTS: frozenset[str] = frozenset({"import", "export", "batch"})
+READ_METHODS: frozenset[str] = frozenset({"GET", "HEAD"})
+
+
+def route_class(scope: Scope) -> RouteClass | None:
+    """
+    The admission class of a request, or None for requests that never touch
+    the pool (system endpoints, docs) and are always admitted.
+    """
+    prefix: str = settings.app.base_api_url
+    path: str = scope["path"]
+    if not path.startswith(f"{prefix}/") or path.startswith(f"{prefix}/system"):
+        return None
+    if BULK_SEGMENTS.intersection(path.split("/")):
+        return "bulk"
+    return "read" if scope["method"] in READ_METHODS else "write"
+
+
+def default_limits(pool_size: int) -> dict[RouteClass, int]:
+    # Reads are often cache hits that never check out a connection, so they
+    # may outnumber the pool; bulk requests each hold one for seconds
+    return {
+        "read": 4 * pool_size,
+        "write": 2 * pool_size,
+        "bulk": max(1, pool_size // 4),
+    }
+
+
+class AdmissionMiddleware:
+    """
+    Bounds concurrent requests per route class and sheds the rest.
+
+    A request waits at most `ADMISSION_QUEUE_TIMEOUT` for a slot in its class,
+    and once admitted at most `POSTGRES_ACQUIRE_TIMEOUT` for each pooled
+    connection. Either running out answers 503 with `Retry-After`, so under
+    overload clients are told to back off instead of queueing indefinitely.
+    Limits are per worker and default to multiples of the worker's share of
+    the pool.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        _, pool_size = settings.worker_pool_sizes()
+        defaults: dict[RouteClass, int] = default_limits(pool_size)
+        configured: dict[RouteClass, int | None] = {
+            "read": settings.admission.read_limit,
+            "write": settings.admission.write_limit,
+            "bulk": settings.admission.bulk_limit,
+        }
+        self.limits: dict[RouteClass, int] = {
+            name: limit or defaults[name] for name, limit in configured.items()
+        }
+        self._slots: dict[RouteClass, asyncio.Semaphore] = {
+            name: asyncio.Semaphore(limit) for name, limit in self.limits.items()
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        name: RouteClass | None = route_class(scope)
+        if name is None:
+            await self.app(scope, receive, send)
+            return
+
+        slots: asyncio.Semaphore = self._slots[name]
+        if not await self._admit(slots):
+            admission_rejections.labels(name, "concurrency_limit").inc()
+            await self._reject(
+                scope, receive, send, f"Too many concurrent {name} requests"
+            )
+            return
+
+        started: bool = False
+
+        async def send_tracking_start(message: Message) -> None:
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+            await send(message)
+
+        in_flight = admission_in_flight.labels(name)
+        in_flight.inc()
+        try:
+            await self.app(scope, receive, send_tracking_start)
+        except PoolTimeoutError:
+            admission_rejections.labels(name, "pool_timeout").inc()
+            if started:
+                raise
+            await self._reject(
+                scope, receive, send, "Timed out waiting for a database connection"
+            )
+        finally:
+            in_flight.dec()
+            slots.release()
+
+    @staticmethod
+    async def _admit(slots: asyncio.Semaphore) -> bool:
+        if not slots.locked():
+            await slots.acquire()
+            return True
+        timeout: float = settings.admission.queue_timeout
+        if not timeout:
+            return False
+        try:
+            await asyncio.wait_for(slots.acquire(), timeout)
+        except TimeoutError:
+            return False
+        return True
+
+    @staticmethod
+    async def _reject(scope: Scope, receive: Receive, send: Send, detail: str) -> None:
+        response = JSONResponse(
+            {"detail": detail},
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": str(settings.admission.retry_after)},
+        )
+        await response(scope, receive, send)
+
+
+__all__ = ["AdmissionMiddleware", "route_class"]
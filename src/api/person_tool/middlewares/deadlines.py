@@ -0,0 +1,131 @@
+import asyncio
+import logging
+import time
+
+from starlette import status
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from person_tool.config import settings
+from person_tool.deadlines import (
+    DEADLINE_HEADER,
+    DeadlineExceededError,
+    request_deadline,
+)
+from person_tool.metrics import request_cancellations
+
+log = logging.getLogger(__name__)
+
+
+def route_timeout(path: str) -> float:
+    """The configured deadline for `path`: longest matching route prefix wins."""
+    prefix: str = settings.app.base_api_url
+    path = path.removeprefix(prefix)
+    matches: list[str] = [
+        route for route in settings.deadline.routes if path.startswith(route)
+    ]
+    if not matches:
+        return settings.deadline.timeout
+    return settings.deadline.routes[max(matches, key=len)]
+
+
+def requested_timeout(headers: Headers) -> float | None:
+    value: str | None = headers.get(DEADLINE_HEADER)
+    if value is None:
+        return None
+    try:
+        timeout: float = float(value)
+    except ValueError:
+        return None
+    return min(timeout, settings.deadline.max_timeout) if timeout > 0 else None
+
+
+class DeadlineMiddleware:
+    """
+    Gives each request a deadline, from `X-Request-Timeout` (seconds, capped
+    at `DEADLINE_MAX_TIMEOUT`) or else the route's configured timeout. Pool
+    checkouts wait no longer than the time left, and a request that runs out
+    is answered 504.
+
+    The request runs in its own task while this middleware keeps reading the
+    ASGI receive channel. When the deadline passes, or the client disconnects
+    before the response is complete, that task is cancelled: asyncpg then
+    cancels the running query on the server and the connection goes back to
+    the pool straight away, without a per-request `statement_timeout`.
+    Messages are handed to the request through a queue of one, so an upload
+    is still read only as fast as the request consumes it.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timeout: float = requested_timeout(Headers(scope=scope)) or route_timeout(
+            scope["path"]
+        )
+        started: bool = False
+        complete: bool = False
+        disconnected: bool = False
+        messages: asyncio.Queue[Message] = asyncio.Queue(maxsize=1)
+
+        async def send_tracking(message: Message) -> None:
+            nonlocal started, complete
+            if message["type"] == "http.response.start":
+                started = True
+            elif message["type"] == "http.response.body":
+                complete = not message.get("more_body", False)
+            await send(message)
+
+        reset = request_deadline.set(time.monotonic() + timeout)
+        try:
+            # Created after the deadline is set, so the task's context has it
+            handler = asyncio.create_task(self.app(scope, messages.get, send_tracking))
+        finally:
+            request_deadline.reset(reset)
+
+        async def watch_disconnect() -> None:
+            nonlocal disconnected
+            while True:
+                message: Message = await receive()
+                if message["type"] == "http.disconnect":
+                    if not complete and not handler.done():
+                        disconnected = True
+                        handler.cancel()
+                    await messages.put(message)
+                    return
+                # Waits for the request to take the previous message
+                await messages.put(message)
+
+        watcher = asyncio.create_task(watch_disconnect())
+        deadline = asyncio.timeout(timeout)
+        try:
+            async with deadline:
+                # Cancelling this await on timeout cancels the handler too
+                await handler
+        except asyncio.CancelledError:
+            if not disconnected:
+                handler.cancel()
+                raise
+            request_cancellations.labels("disconnect").inc()
+            log.info("Client disconnected, cancelled %s", scope["path"])
+        except (TimeoutError, DeadlineExceededError) as e:
+            if isinstance(e, TimeoutError) and not deadline.expired():
+                raise
+            request_cancellations.labels("deadline").inc()
+            if started:
+                raise
+            response = JSONResponse(
+                {"detail": f"Request did not complete within {timeout:g}s"},
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            )
+            await response(scope, receive, send)
+        finally:
+            watcher.cancel()
+
+
+__all__ = ["DeadlineMiddleware"]
@@ -0,0 +1,63 @@
+import time
+
+from starlette.routing import BaseRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from person_tool.metrics import http_request_duration, http_requests_in_flight
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Path template of the matched route, e.g. "/api/users/{uid}". Routes from
+    included routers may only know their path relative to the router prefix,
+    in which case the prefix is taken from the request path.
+    """
+    route: BaseRoute | None = scope.get("route")
+    template: str | None = getattr(route, "path", None)
+    if template is None:
+        return "unmatched"
+    path: str = scope["path"]
+    regex = getattr(route, "path_regex", None)
+    if regex is None or regex.match(path):
+        return template
+    start: int = path.find("/", 1)
+    while start != -1:
+        if regex.match(path[start:]):
+            return path[:start] + template
+        start = path.find("/", start + 1)
+    return template
+
+
+class MetricsMiddleware:
+    """
+    Records per-route latency and in-flight requests. Routes are labelled by
+    their path template so that path parameters don't explode cardinality.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method: str = scope["method"]
+        status_code: int = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_flight = http_requests_in_flight.labels(method)
+        in_flight.inc()
+        start: float = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_flight.dec()
+            http_request_duration.labels(
+                method, route_template(scope), str(status_code)
+            ).observe(time.perf_counter() - start)
@@ -0,0 +1,43 @@
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from person_tool.db.replicas import (
+    READ_TOKEN_HEADER,
+    ReadConsistency,
+    parse_lsn,
+    read_consistency,
+)
+
+
+class ReadYourWritesMiddleware:
+    """
+    Hands out the primary's WAL position after a write as an `X-Read-Token`
+    response header. Requests that send it back are only routed to replicas
+    that have replayed that far, falling back to the primary otherwise.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token: str | None = Headers(scope=scope).get(READ_TOKEN_HEADER)
+        try:
+            min_lsn: int | None = parse_lsn(token) if token else None
+        except ValueError:
+            min_lsn = None
+        consistency = ReadConsistency(min_lsn=min_lsn)
+
+        async def send_with_token(message: Message) -> None:
+            if message["type"] == "http.response.start" and consistency.write_lsn:
+                MutableHeaders(scope=message)[READ_TOKEN_HEADER] = consistency.write_lsn
+            await send(message)
+
+        reset = read_consistency.set(consistency)
+        try:
+            await self.app(scope, receive, send_with_token)
+        finally:
+            read_consistency.reset(reset)
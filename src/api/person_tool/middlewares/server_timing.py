@@ -0,0 +1,55 @@
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from person_tool.config import settings
+from person_tool.timings import RequestTimings, request_timings
+
+log = logging.getLogger(__name__)
+
+
+class ServerTimingMiddleware:
+    """
+    Breaks each request down into pool wait, SQL, validation and serialization
+    time. The breakdown is sent as a `Server-Timing` header, alongside the
+    total in `X-Process-Time`, and logged for requests slower than
+    `APP_SLOW_REQUEST_THRESHOLD`.
+
+    Streaming bodies are not wrapped: the headers carry the time to first
+    byte, and the slow-request log the full duration.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        start: float = time.perf_counter()
+
+        async def send_with_timings(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                elapsed: float = time.perf_counter() - start
+                headers = MutableHeaders(scope=message)
+                headers["Server-Timing"] = timings.server_timing(elapsed)
+                headers["X-Process-Time"] = str(elapsed)
+            await send(message)
+
+        reset = request_timings.set(timings)
+        try:
+            await self.app(scope, receive, send_with_timings)
+        finally:
+            request_timings.reset(reset)
+            elapsed: float = time.perf_counter() - start
+            if elapsed >= settings.app.slow_request_threshold:
+                log.warning(
+                    "Slow request %s %s: %s",
+                    scope["method"],
+                    scope["path"],
+                    timings.server_timing(elapsed),
+                )
@@ -0,0 +1,38 @@
+import typing as t
+
+from fastapi.responses import Response
+from pydantic_core import to_json
+
+from person_tool.db.counts import TotalCount
+from person_tool.timings import timed
+
+
+class ModelJSONResponse(Response):
+    """
+    Serializes pydantic models, or lists of them, straight to JSON bytes with
+    pydantic-core, using their camelCase aliases.
+
+    Returning a Response from an endpoint makes FastAPI skip its own
+    response_model validation and serialization pass, so only use this for
+    data that is already typed, like rows built from our own database.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: t.Any) -> bytes:
+        with timed("serialization"):
+            return to_json(content, by_alias=True)
+
+
+def not_modified(etag: str, headers: dict[str, str] | None = None) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, **(headers or {})})
+
+
+def total_count_headers(total: TotalCount) -> dict[str, str]:
+    return {
+        "X-Total-Count": str(total.count),
+        "X-Total-Count-Exact": "true" if total.exact else "false",
+    }
+
+
+__all__ = ["ModelJSONResponse", "not_modified", "total_count_headers"]
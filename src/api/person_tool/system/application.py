@@ -1,11 +1,90 @@
-from person_tool.factories.service_factory import service_factory
+import time
+from dataclasses import asdict
+
+from fastapi import status
+from fastapi.exceptions import HTTPException
+
+from person_tool.db.core import people_management_db
+from person_tool.db.health import HealthMonitor
+from person_tool.db.statements import statement_stats
+from person_tool.factories.entity_cache import EntityCache
+from person_tool.metrics import registry
+from person_tool.system.models import CacheStats, HealthStatus, PreparedStatementStats
 
 
 class SystemApplication:
-    def __init__(self) -> None:
-        self.service_factory = service_factory
+    """
+    Readiness and liveness come from the health monitor's last probe, so they
+    never check out a pooled connection and keep answering while the pool is
+    exhausted.
+    """
+
+    @staticmethod
+    def check_system_readiness() -> bool:
+        health: HealthMonitor | None = people_management_db.health
+        if not people_management_db.ready or health is None:
+            # Pools still opening and warming up, or already draining
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Database pools are not ready",
+            )
+        if not health.is_ready():
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Database unhealthy: {health.state.error or 'no recent probe'}",
+            )
+        return True
+
+    @staticmethod
+    def check_system_liveness() -> bool:
+        health: HealthMonitor | None = people_management_db.health
+        if health is not None and not health.is_alive():
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Database health probes have stopped running",
+            )
+        return True
+
+    @staticmethod
+    def get_health() -> HealthStatus:
+        health: HealthMonitor | None = people_management_db.health
+        if health is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Database pools are not ready",
+            )
+        state = health.state
+        return HealthStatus(
+            ready=people_management_db.ready and health.is_ready(),
+            alive=health.is_alive(),
+            healthy=state.healthy,
+            latency_ms=state.latency * 1000 if state.latency is not None else None,
+            error=state.error,
+            checked_seconds_ago=(
+                time.monotonic() - state.checked_at
+                if state.checked_at is not None
+                else None
+            ),
+            pool_size=state.pool_size,
+            pool_idle=state.pool_idle,
+            pool_max_size=state.pool_max_size,
+            pool_saturation=state.pool_saturation,
+        )
+
+    @staticmethod
+    def get_cache_stats() -> list[CacheStats]:
+        return [
+            CacheStats(table=table, **cache.stats())
+            for table, cache in EntityCache.registry.items()
+        ]
+
+    @staticmethod
+    def get_statement_stats() -> list[PreparedStatementStats]:
+        return [
+            PreparedStatementStats(name=name, **asdict(stats))
+            for name, stats in statement_stats.items()
+        ]
 
-    async def check_system_readiness(self) -> bool:
-        async with self.service_factory(use_transaction=False) as sf:
-            check: bool = await sf.system_service.check_system_readiness()
-        return check
+    @staticmethod
+    def get_metrics() -> str:
+        return registry.render()
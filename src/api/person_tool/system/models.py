@@ -0,0 +1,41 @@
+from pydantic import BaseModel, ConfigDict
+from pydantic.alias_generators import to_camel
+
+
+class CacheStats(BaseModel):
+    table: str
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    invalidations: int
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+
+class PreparedStatementStats(BaseModel):
+    name: str
+    prepares: int
+    prepare_seconds: float
+    executions: int
+    execute_seconds: float
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+
+class HealthStatus(BaseModel):
+    ready: bool
+    alive: bool
+    healthy: bool
+    latency_ms: float | None
+    error: str | None
+    # Since the last probe, successful or not; None before the first one
+    checked_seconds_ago: float | None
+    pool_size: int
+    pool_idle: int
+    pool_max_size: int
+    pool_saturation: float
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
@@ -1,9 +1,11 @@
 import typing as t
 
 from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
 
 from person_tool.dependencies import provide_system_application
 from person_tool.system.application import SystemApplication
+from person_tool.system.models import CacheStats, HealthStatus, PreparedStatementStats
 
 router = APIRouter()
 
@@ -13,6 +15,60 @@ async def check_system_readiness(
     application: t.Annotated[SystemApplication, Depends(provide_system_application)],
 ):
     """
-    Check the readiness of the system
+    Check the readiness of the system, from the last background database probe
     """
-    return await application.check_system_readiness()
+    return application.check_system_readiness()
+
+
+@router.get("/live")
+async def check_system_liveness(
+    application: t.Annotated[SystemApplication, Depends(provide_system_application)],
+):
+    """
+    Check the process is alive: background database probes are still running
+    on schedule, whether or not the database answers them
+    """
+    return application.check_system_liveness()
+
+
+@router.get("/health")
+async def get_health(
+    application: t.Annotated[SystemApplication, Depends(provide_system_application)],
+) -> HealthStatus:
+    """
+    Last database probe result, its latency and the pool saturation it saw
+    """
+    return application.get_health()
+
+
+@router.get("/cache")
+async def get_cache_stats(
+    application: t.Annotated[SystemApplication, Depends(provide_system_application)],
+) -> list[CacheStats]:
+    """
+    Hit, miss and eviction counts of the in-process entity caches
+    """
+    return application.get_cache_stats()
+
+
+@router.get("/statements")
+async def get_statement_stats(
+    application: t.Annotated[SystemApplication, Depends(provide_system_application)],
+) -> list[PreparedStatementStats]:
+    """
+    Prepare and execute counters of the per-connection prepared statements
+    """
+    return application.get_statement_stats()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics(
+    application: t.Annotated[SystemApplication, Depends(provide_system_application)],
+) -> PlainTextResponse:
+    """
+    Request latency, in-flight requests and connection pool usage in the
+    Prometheus text format
+    """
+    return PlainTextResponse(
+        application.get_metrics(), media_type="text/plain; version=0.0.4"
+    )
@@ -1,24 +1,22 @@
-from typing import AsyncGenerator
+from collections.abc import Iterator
 
 import pytest
 from fastapi.testclient import TestClient
-from httpx import AsyncClient
-from main import app
 
 
 @pytest.fixture
-async def test_client() -> AsyncGenerator[AsyncClient, None]:
-    async with TestClient(
-        app=app,
-        base_url="http://test",
-        backend="asyncio",
-    ) as client:
+def test_client() -> Iterator[TestClient]:
+    # Imported here so unit tests collect without the POSTGRES_*/APP_* settings
+    from person_tool.main import app
+
+    with TestClient(app=app, base_url="http://test") as client:
         yield client
 
 
 @pytest.fixture
 def override_get_database_connection():
     """Fixture to override database connection for tests"""
+    from person_tool.main import app
 
     async def mock_get_database_connection():
         return None
@@ -0,0 +1,107 @@
+import asyncio
+import collections.abc as c
+import uuid
+
+import pytest
+from asyncpg import Connection, connect  # type: ignore
+from pydantic import ValidationError
+
+from person_tool.jobs.repository import JobRepository
+from person_tool.users.repository import UserRepository
+
+
+async def _connect() -> Connection:
+    from person_tool.config import get_settings
+
+    settings = get_settings()
+    return await connect(
+        user=settings.database.user,
+        password=settings.database.password,
+        database=settings.database.db,
+        host=settings.database.host,
+        port=settings.database.port,
+    )
+
+
+def run_in_rollback(test: c.Callable[[Connection], c.Awaitable[None]]) -> None:
+    """Run `test` against the configured database, undoing its writes."""
+
+    async def main() -> None:
+        try:
+            conn: Connection = await _connect()
+        except (OSError, ValidationError) as e:
+            pytest.skip(f"database not available: {e}")
+        try:
+            tr = conn.transaction()
+            await tr.start()
+            try:
+                await test(conn)
+            finally:
+                await tr.rollback()
+        finally:
+            await conn.close()
+
+    asyncio.run(main())
+
+
+async def _user_with_job(conn: Connection) -> tuple[uuid.UUID, uuid.UUID]:
+    tag: str = uuid.uuid4().hex[:12]
+    user: uuid.UUID = await conn.fetchval(
+        "INSERT INTO people.users (id, first_name, last_name, email)"
+        " VALUES ($1, 'Test', 'User', $2) RETURNING uid",
+        f"del-{tag}",
+        f"del-{tag}@example.com",
+    )
+    job: uuid.UUID = await conn.fetchval(
+        "INSERT INTO people.jobs (id, title, description, status)"
+        " VALUES ($1, 'Test job', 'Test', 'open') RETURNING uid",
+        f"del-{tag}",
+    )
+    await conn.execute(
+        "INSERT INTO people.user_relationships"
+        " (primary_uid, secondary_uid, relationship_type)"
+        " VALUES ($1, $2, 'USER_JOB')",
+        user,
+        job,
+    )
+    return user, job
+
+
+async def _relationships(conn: Connection, user: uuid.UUID) -> int:
+    return await conn.fetchval(
+        "SELECT count(*) FROM people.user_relationships WHERE primary_uid = $1",
+        user,
+    )
+
+
+def test_delete_users_leaves_relationships_of_foreign_uids():
+    async def test(conn: Connection) -> None:
+        user, job = await _user_with_job(conn)
+        deleted = await UserRepository(conn).delete_users([job, uuid.uuid4()])  # type: ignore[arg-type]
+        assert deleted == []
+        assert await _relationships(conn, user) == 1
+
+    run_in_rollback(test)
+
+
+def test_delete_jobs_leaves_relationships_of_foreign_uids():
+    async def test(conn: Connection) -> None:
+        user, _ = await _user_with_job(conn)
+        deleted = await JobRepository(conn).delete_jobs([user])  # type: ignore[arg-type]
+        assert deleted == []
+        assert await _relationships(conn, user) == 1
+
+    run_in_rollback(test)
+
+
+def test_delete_users_with_mixed_uids_removes_only_deleted_users_relationships():
+    async def test(conn: Connection) -> None:
+        user, job = await _user_with_job(conn)
+        other, other_job = await _user_with_job(conn)
+        deleted = await UserRepository(conn).delete_users([user, other_job])  # type: ignore[arg-type]
+        assert deleted == [user]
+        assert await _relationships(conn, user) == 0
+        assert await _relationships(conn, other) == 1
+        assert await conn.fetchval("SELECT 1 FROM people.jobs WHERE uid = $1", job)
+
+    run_in_rollback(test)
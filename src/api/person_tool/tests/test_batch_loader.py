@@ -0,0 +1,136 @@
+import asyncio
+import contextvars
+
+import pytest
+
+from person_tool.factories.batch_loader import BatchLoader
+
+request_id: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "request_id", default=None
+)
+
+
+class Recorder:
+    def __init__(self, fail: BaseException | None = None) -> None:
+        self.calls: list[list[int]] = []
+        self.fail = fail
+
+    async def __call__(self, keys: list[int]) -> dict[int, str]:
+        self.calls.append(keys)
+        if self.fail is not None:
+            raise self.fail
+        # Odd keys are "missing rows"
+        return {k: f"v{k}" for k in keys if k % 2 == 0}
+
+
+def test_concurrent_loads_share_one_batch():
+    async def main():
+        batch_fn = Recorder()
+        loader = BatchLoader(batch_fn, window=0.01)
+        results = await asyncio.gather(*(loader.load(k) for k in (2, 4, 6)))
+        return batch_fn.calls, results
+
+    calls, results = asyncio.run(main())
+    assert calls == [[2, 4, 6]]
+    assert results == ["v2", "v4", "v6"]
+
+
+def test_duplicate_keys_are_fetched_once_and_fanned_out():
+    async def main():
+        batch_fn = Recorder()
+        loader = BatchLoader(batch_fn, window=0.01)
+        results = await asyncio.gather(loader.load(2), loader.load(2), loader.load(4))
+        return batch_fn.calls, results
+
+    calls, results = asyncio.run(main())
+    assert calls == [[2, 4]]
+    assert results == ["v2", "v2", "v4"]
+
+
+def test_missing_keys_resolve_to_none():
+    async def main():
+        loader = BatchLoader(Recorder(), window=0.01)
+        return await asyncio.gather(loader.load(1), loader.load(2))
+
+    assert asyncio.run(main()) == [None, "v2"]
+
+
+def test_max_batch_size_dispatches_without_waiting_for_the_window():
+    async def main():
+        batch_fn = Recorder()
+        loader = BatchLoader(batch_fn, window=10.0, max_batch_size=2)
+        results = await asyncio.wait_for(
+            asyncio.gather(loader.load(2), loader.load(4)), timeout=1.0
+        )
+        return batch_fn.calls, results
+
+    calls, results = asyncio.run(main())
+    assert calls == [[2, 4]]
+    assert results == ["v2", "v4"]
+
+
+def test_loads_after_a_dispatch_start_a_new_batch():
+    async def main():
+        batch_fn = Recorder()
+        loader = BatchLoader(batch_fn, window=0.001)
+        await loader.load(2)
+        await loader.load(4)
+        return batch_fn.calls
+
+    assert asyncio.run(main()) == [[2], [4]]
+
+
+def test_batch_errors_fan_out_to_every_waiter():
+    async def main():
+        loader = BatchLoader(Recorder(fail=RuntimeError("db down")), window=0.01)
+        return await asyncio.gather(
+            loader.load(2), loader.load(2), loader.load(4), return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+    assert len(results) == 3
+    assert all(isinstance(r, RuntimeError) and str(r) == "db down" for r in results)
+
+
+def test_cancelled_batch_cancels_its_waiters():
+    async def main():
+        loader = BatchLoader(Recorder(fail=asyncio.CancelledError()), window=0.01)
+        return await asyncio.gather(
+            loader.load(2), loader.load(4), return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, asyncio.CancelledError) for r in results)
+
+
+def test_a_cancelled_waiter_does_not_affect_the_others():
+    async def main():
+        loader = BatchLoader(Recorder(), window=0.01)
+        first = asyncio.create_task(loader.load(2))
+        second = asyncio.create_task(loader.load(4))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == "v4"
+
+
+def test_batch_runs_outside_the_callers_context():
+    seen: list[str | None] = []
+
+    async def batch_fn(keys: list[int]) -> dict[int, int]:
+        seen.append(request_id.get())
+        return {k: k for k in keys}
+
+    async def request(key: int) -> int | None:
+        request_id.set(f"request-{key}")
+        return await loader.load(key)
+
+    async def main():
+        return await asyncio.gather(request(1), request(2))
+
+    loader = BatchLoader(batch_fn, window=0.01)
+    assert asyncio.run(main()) == [1, 2]
+    assert seen == [None]
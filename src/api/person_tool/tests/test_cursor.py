@@ -0,0 +1,42 @@
+import base64
+from datetime import UTC, datetime
+from uuid import UUID
+
+import pytest
+
+from person_tool.utils.cursor import decode_cursor, encode_cursor
+
+CREATED_AT = datetime(2025, 3, 1, 12, 30, 15, 123456, tzinfo=UTC)
+UID = UUID("0195523a-8f2b-7c3d-9e4f-0123456789ab")
+
+
+def test_round_trip():
+    assert decode_cursor(encode_cursor(CREATED_AT, UID)) == (CREATED_AT, UID)
+
+
+def test_cursor_is_url_safe_and_unpadded():
+    cursor = encode_cursor(CREATED_AT, UID)
+    assert "=" not in cursor
+    assert not set(cursor) & set("+/")
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not a cursor!",
+        "",
+        base64.urlsafe_b64encode(b"no separator").decode(),
+        base64.urlsafe_b64encode(b"2025-03-01T12:00:00|not-a-uuid").decode(),
+        base64.urlsafe_b64encode(f"yesterday|{UID}".encode()).decode(),
+        base64.urlsafe_b64encode(b"\xff\xfe|\x00").decode(),
+    ],
+)
+def test_malformed_cursors_are_rejected(cursor: str):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor)
+
+
+def test_truncated_cursor_is_rejected():
+    cursor = encode_cursor(CREATED_AT, UID)
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor[: len(cursor) // 2])
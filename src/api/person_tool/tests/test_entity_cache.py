@@ -0,0 +1,130 @@
+from uuid import UUID
+
+import pytest
+
+from person_tool.factories.entity_cache import EntityCache
+
+A = UUID(int=1)
+B = UUID(int=2)
+C = UUID(int=3)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now: float = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def restore_registry():
+    # Caches register themselves by table; don't leave test ones behind
+    saved = dict(EntityCache.registry)
+    yield
+    EntityCache.registry.clear()
+    EntityCache.registry.update(saved)
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+def make_cache(clock: FakeClock, *, max_size: int = 2, ttl: float = 10.0):
+    return EntityCache("widgets", max_size=max_size, ttl=ttl, clock=clock)
+
+
+def test_get_returns_stored_value(clock):
+    cache = make_cache(clock)
+    cache.set(A, "a", generation=cache.generation)
+    assert cache.get(A) == "a"
+    assert cache.get(B) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = make_cache(clock, ttl=10.0)
+    cache.set(A, "a", generation=cache.generation)
+    clock.now += 9.999
+    assert cache.get(A) == "a"
+    clock.now += 0.001
+    assert cache.get(A) is None
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["size"] == 0
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = make_cache(clock, max_size=2)
+    cache.set(A, "a", generation=cache.generation)
+    cache.set(B, "b", generation=cache.generation)
+    # Touching A makes B the least recently used
+    assert cache.get(A) == "a"
+    cache.set(C, "c", generation=cache.generation)
+    assert cache.get(B) is None
+    assert cache.get(A) == "a"
+    assert cache.get(C) == "c"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_zero_max_size_disables_caching(clock):
+    cache = make_cache(clock, max_size=0)
+    cache.set(A, "a", generation=cache.generation)
+    assert cache.get(A) is None
+
+
+def test_set_with_stale_generation_is_dropped(clock):
+    cache = make_cache(clock)
+    generation = cache.generation
+    # A write lands between the read from the database and the cache fill
+    cache.invalidate(A)
+    cache.set(A, "stale", generation=generation)
+    assert cache.get(A) is None
+    cache.set(A, "fresh", generation=cache.generation)
+    assert cache.get(A) == "fresh"
+
+
+def test_invalidate_removes_entry(clock):
+    cache = make_cache(clock)
+    cache.set(A, "a", generation=cache.generation)
+    cache.invalidate(A)
+    assert cache.get(A) is None
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_clear_drops_entries_and_bumps_generation(clock):
+    cache = make_cache(clock)
+    generation = cache.generation
+    cache.set(A, "a", generation=generation)
+    cache.clear()
+    assert cache.get(A) is None
+    assert cache.generation != generation
+    cache.set(A, "a", generation=generation)
+    assert cache.get(A) is None
+
+
+def test_notify_invalidates_matching_table_only(clock):
+    cache = make_cache(clock)
+    cache.set(A, "a", generation=cache.generation)
+    cache.set(B, "b", generation=cache.generation)
+    cache.notify(f"gadgets:{A}")
+    assert cache.get(A) == "a"
+    cache.notify(f"widgets:{A}")
+    assert cache.get(A) is None
+    assert cache.get(B) == "b"
+
+
+def test_notify_ignores_malformed_uid(clock, caplog):
+    cache = make_cache(clock)
+    cache.set(A, "a", generation=cache.generation)
+    generation = cache.generation
+    cache.notify("widgets:not-a-uuid")
+    assert cache.get(A) == "a"
+    assert cache.generation == generation
+    assert "malformed" in caplog.text
+
+
+def test_cache_registers_by_table(clock):
+    cache = make_cache(clock)
+    assert EntityCache.registry["widgets"] is cache
@@ -0,0 +1,78 @@
+from dataclasses import dataclass
+from uuid import UUID
+
+import pytest
+
+from person_tool.utils.etag import (
+    collection_etag,
+    entity_etag,
+    if_match_versions,
+    if_none_match,
+)
+
+
+@dataclass
+class Row:
+    uid: UUID
+    version: str | None
+
+
+ROWS = [Row(UUID(int=1), "100"), Row(UUID(int=2), "101")]
+
+
+def test_entity_etag_is_strong_quoted_version():
+    assert entity_etag("1234") == '"1234"'
+
+
+def test_collection_etag_is_stable():
+    assert collection_etag(ROWS, "cursor") == collection_etag(list(ROWS), "cursor")
+
+
+@pytest.mark.parametrize(
+    "rows, extra",
+    [
+        ([Row(UUID(int=1), "100"), Row(UUID(int=2), "102")], ("cursor",)),
+        (list(reversed(ROWS)), ("cursor",)),
+        (ROWS[:1], ("cursor",)),
+        (ROWS, ("other",)),
+        (ROWS, (None,)),
+    ],
+)
+def test_collection_etag_changes_with_payload(rows, extra):
+    assert collection_etag(rows, *extra) != collection_etag(ROWS, "cursor")
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, False),
+        ("", False),
+        ('"1"', True),
+        ('W/"1"', True),
+        ('"2"', False),
+        ('"2", "1"', True),
+        (' "2" ,W/"1" ', True),
+        ("*", True),
+        ("1", False),
+    ],
+)
+def test_if_none_match(header, expected):
+    assert if_none_match(header, '"1"') is expected
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, None),
+        ("", None),
+        ("*", None),
+        ('"1", *', None),
+        ('"1"', ["1"]),
+        ('"1", "2"', ["1", "2"]),
+        ('W/"1"', []),
+        ('W/"1", "2"', ["2"]),
+        ('1, "', []),
+    ],
+)
+def test_if_match_versions(header, expected):
+    assert if_match_versions(header) == expected
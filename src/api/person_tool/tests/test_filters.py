@@ -0,0 +1,82 @@
+from datetime import UTC, datetime
+from uuid import UUID
+
+from person_tool.db.filters import (
+    created_range,
+    ilike_filters,
+    newest_first,
+)
+from person_tool.utils.uuid7 import uuid7_min
+
+AFTER = datetime(2025, 1, 1, tzinfo=UTC)
+BEFORE = datetime(2025, 2, 1, tzinfo=UTC)
+V7 = UUID("01941f29-7c00-7000-8000-000000000000")
+V4 = UUID("58ca9790-0d7b-4a8d-aa26-3f059e55ec78")
+
+
+def test_ilike_filters_skip_unset_values():
+    where, args = ilike_filters({"id": None, "title": "eng", "status": "open"})
+    assert where == ("title ILIKE '%' || $1 || '%' AND status ILIKE '%' || $2 || '%'")
+    assert args == ["eng", "open"]
+    assert ilike_filters({"id": None}) == ("TRUE", [])
+
+
+def test_created_range_without_bounds_is_unchanged():
+    assert created_range("x = $1", [1], created_after=None, created_before=None) == (
+        "x = $1",
+        [1],
+    )
+
+
+def test_created_range_matches_uuid7_keys_and_legacy_created_at():
+    where, args = created_range(
+        "x = $1", [1], created_after=AFTER, created_before=BEFORE
+    )
+    assert args == [1, uuid7_min(AFTER), uuid7_min(BEFORE), AFTER, BEFORE]
+    assert where == (
+        "x = $1 AND ((people.is_uuid7(uid) AND uid >= $2 AND uid < $3)"
+        " OR (NOT people.is_uuid7(uid) AND created_at >= $4 AND created_at < $5))"
+    )
+
+
+def test_newest_first_orders_uuid7_rows_by_key():
+    query, args = newest_first(
+        "SELECT j.uid, j.created_at FROM r JOIN j ON j.uid = r.job",
+        "TRUE",
+        [],
+        alias="j.",
+        key="r.job",
+        after=(AFTER, V7),
+        limit=5,
+    )
+    assert args == [V7, 5, 5, 0]
+    assert "people.is_uuid7(r.job) AND TRUE AND r.job < $1" in query
+    assert "ORDER BY r.job DESC LIMIT $2" in query
+    assert "NOT people.is_uuid7(r.job) AND TRUE" in query
+    assert "ORDER BY j.created_at DESC, j.uid DESC LIMIT $2" in query
+
+
+def test_newest_first_pages_both_branches():
+    query, args = newest_first(
+        "SELECT uid, created_at FROM t", "x = $1", [1], limit=10, offset=20
+    )
+    # Each branch stops at offset + limit; the outer query pages
+    assert args == [1, 30, 10, 20]
+    assert query.count("LIMIT $2") == 2
+    assert "LIMIT $3 OFFSET $4" in query
+
+
+def test_newest_first_legacy_cursor_skips_uuid7_branch():
+    query, args = newest_first(
+        "SELECT uid, created_at FROM t", "TRUE", [], after=(AFTER, V4), limit=5
+    )
+    assert args == [V4, AFTER, 5, 5, 0]
+    assert "people.is_uuid7(uid) AND TRUE AND FALSE" in query
+    assert "(created_at, uid) < ($2, $1)" in query
+
+
+def test_newest_first_without_limit_streams_the_union():
+    query, args = newest_first("SELECT uid, created_at FROM t", "TRUE", [])
+    assert args == []
+    assert "UNION ALL" in query
+    assert "LIMIT" not in query
@@ -0,0 +1,60 @@
+import asyncio
+
+from person_tool.db.health import HealthMonitor
+
+
+class FakeConnection:
+    def __init__(self) -> None:
+        self.queries: int = 0
+
+    def is_closed(self) -> bool:
+        return False
+
+    async def fetchval(self, query: str, *, timeout: float) -> int:
+        self.queries += 1
+        return 1
+
+    def terminate(self) -> None:
+        pass
+
+
+class FlakyPool:
+    """Fails to report its size once, then behaves."""
+
+    def __init__(self) -> None:
+        self.calls: int = 0
+
+    def get_size(self) -> int:
+        self.calls += 1
+        if self.calls == 1:
+            raise RuntimeError("boom")
+        return 2
+
+    def get_idle_size(self) -> int:
+        return 1
+
+    def get_max_size(self) -> int:
+        return 4
+
+
+def test_run_keeps_probing_after_a_probe_crashes():
+    conn = FakeConnection()
+    pool = FlakyPool()
+
+    async def connect() -> FakeConnection:
+        return conn
+
+    async def main() -> None:
+        monitor = HealthMonitor(
+            connect, lambda: pool, interval=0.001, timeout=1.0, max_staleness=1.0
+        )
+        task = asyncio.create_task(monitor.run())
+        async with asyncio.timeout(1):
+            while pool.calls < 3:
+                await asyncio.sleep(0.001)
+        task.cancel()
+        assert monitor.is_alive()
+        assert monitor.state.pool_size == 2
+
+    asyncio.run(main())
+    assert conn.queries >= 3
@@ -0,0 +1,75 @@
+import uuid
+
+from asyncpg import Connection  # type: ignore
+
+from person_tool.jobs.repository import JobRepository
+from person_tool.tests.test_batch_delete import _user_with_job, run_in_rollback
+
+
+async def _headcount(conn: Connection, job: uuid.UUID) -> int | None:
+    return await conn.fetchval(
+        "SELECT headcount FROM people.job_headcounts WHERE job_uid = $1", job
+    )
+
+
+async def _drift(conn: Connection, job: uuid.UUID) -> list[tuple]:
+    drift = await JobRepository(conn).get_stats_drift()  # type: ignore[arg-type]
+    return [tuple(r) for r in drift if r["key"] == str(job)]
+
+
+def test_headcount_counts_relationships_written_before_their_job():
+    async def test(conn: Connection) -> None:
+        user, _ = await _user_with_job(conn)
+        job: uuid.UUID = uuid.uuid4()
+        await conn.execute(
+            "INSERT INTO people.user_relationships"
+            " (primary_uid, secondary_uid, relationship_type)"
+            " VALUES ($1, $2, 'USER_JOB')",
+            user,
+            job,
+        )
+        await conn.execute(
+            "INSERT INTO people.jobs (uid, id, title, description, status)"
+            " VALUES ($1, $2, 'Test job', 'Test', 'open')",
+            job,
+            f"hc-{job.hex[:12]}",
+        )
+        assert await _headcount(conn, job) == 1
+        assert await _drift(conn, job) == []
+
+    run_in_rollback(test)
+
+
+def test_delete_jobs_leaves_no_headcount_row():
+    async def test(conn: Connection) -> None:
+        _, job = await _user_with_job(conn)
+        assert await _headcount(conn, job) == 1
+        assert await JobRepository(conn).delete_jobs([job]) == [job]  # type: ignore[arg-type]
+        assert await _headcount(conn, job) is None
+        assert await _drift(conn, job) == []
+
+    run_in_rollback(test)
+
+
+def test_relationships_deleted_after_their_job_leave_no_headcount_row():
+    async def test(conn: Connection) -> None:
+        _, job = await _user_with_job(conn)
+        await conn.execute("DELETE FROM people.jobs WHERE uid = $1", job)
+        await conn.execute(
+            "DELETE FROM people.user_relationships WHERE secondary_uid = $1", job
+        )
+        assert await _headcount(conn, job) is None
+
+    run_in_rollback(test)
+
+
+def test_stats_drift_reports_orphaned_headcounts():
+    async def test(conn: Connection) -> None:
+        job: uuid.UUID = uuid.uuid4()
+        await conn.execute(
+            "INSERT INTO people.job_headcounts (job_uid, headcount) VALUES ($1, 0)",
+            job,
+        )
+        assert await _drift(conn, job) == [("orphan", str(job), 0, 0)]
+
+    run_in_rollback(test)
@@ -0,0 +1,153 @@
+import asyncio
+import collections.abc as c
+
+import pytest
+
+from person_tool.bulk.parsing import (
+    INVALID_UTF8,
+    LINE_TOO_LONG,
+    Line,
+    ParsedRecord,
+    aiter_lines,
+    aiter_records,
+    is_supported,
+)
+
+
+async def _chunks(*parts: bytes) -> c.AsyncIterator[bytes]:
+    for part in parts:
+        yield part
+
+
+def parse(content_type: str, *parts: bytes) -> list[ParsedRecord]:
+    async def collect() -> list[ParsedRecord]:
+        return [r async for r in aiter_records(_chunks(*parts), content_type)]
+
+    return asyncio.run(collect())
+
+
+def lines(*parts: bytes, max_line: int = 100) -> list[Line]:
+    async def collect() -> list[Line]:
+        return [line async for line in aiter_lines(_chunks(*parts), max_line)]
+
+    return asyncio.run(collect())
+
+
+def texts(*parts: bytes) -> list[str | None]:
+    return [text for text, _ in lines(*parts)]
+
+
+@pytest.mark.parametrize(
+    "content_type, supported",
+    [
+        ("application/x-ndjson", True),
+        ("application/jsonl; charset=utf-8", True),
+        ("Text/CSV", True),
+        ("application/json", False),
+    ],
+)
+def test_is_supported(content_type, supported):
+    assert is_supported(content_type) is supported
+
+
+def test_lines_split_across_chunks():
+    assert texts(b"ab", b"c\r\nde", b"f\n", b"gh") == ["abc", "def", "gh"]
+
+
+def test_multibyte_character_split_across_chunks():
+    assert texts("é\n".encode()[:1], "é\n".encode()[1:]) == ["é"]
+
+
+def test_undecodable_line_is_rejected():
+    assert lines(b"ok\n\xff\nok\n") == [
+        ("ok", None),
+        (None, INVALID_UTF8),
+        ("ok", None),
+    ]
+
+
+def test_line_at_the_limit_is_kept():
+    assert lines(b"abc", b"de\nf", max_line=5) == [("abcde", None), ("f", None)]
+
+
+def test_over_long_line_is_rejected_within_one_chunk():
+    assert lines(b"abcdef\nok\n", max_line=5) == [(None, LINE_TOO_LONG), ("ok", None)]
+
+
+def test_over_long_partial_line_is_skipped_up_to_the_next_newline():
+    parts = (b"ok\nabc", b"def", b"ghi", b"jkl\nok")
+    assert lines(*parts, max_line=5) == [
+        ("ok", None),
+        (None, LINE_TOO_LONG),
+        ("ok", None),
+    ]
+
+
+def test_unterminated_over_long_line_is_rejected_once():
+    assert lines(b"abcdef", b"ghi", max_line=5) == [(None, LINE_TOO_LONG)]
+
+
+def test_ndjson_rejects_bad_rows_and_keeps_the_rest():
+    records = parse(
+        "application/x-ndjson",
+        b'{"id": "a"}\n',
+        b"\n",
+        b"{not json\n",
+        b"[1, 2]\n",
+        b'{"id": "\xff"}\n',
+        b'{"id": "b"}',
+    )
+    line, data, error = records.pop(1)
+    assert (line, data) == (3, None)
+    assert error.startswith("Invalid JSON")
+    assert records == [
+        (1, {"id": "a"}, None),
+        (4, None, "Expected a JSON object"),
+        (5, None, INVALID_UTF8),
+        (6, {"id": "b"}, None),
+    ]
+
+
+def test_csv_maps_rows_to_header():
+    records = parse("text/csv", b"id, email\na,a@example.com\nb,b@example.com\n")
+    assert records == [
+        (2, {"id": "a", "email": "a@example.com"}, None),
+        (3, {"id": "b", "email": "b@example.com"}, None),
+    ]
+
+
+def test_csv_quoted_field_spanning_lines_keeps_its_start_line():
+    records = parse("text/csv", b'id,note\na,"one\ntwo"\nb,x\n')
+    assert records == [
+        (2, {"id": "a", "note": "one\ntwo"}, None),
+        (4, {"id": "b", "note": "x"}, None),
+    ]
+
+
+def test_csv_rejects_wrong_column_count():
+    records = parse("text/csv", b"id,email\na\nb,b@example.com\n")
+    assert records == [
+        (2, None, "Expected 2 columns, got 1"),
+        (3, {"id": "b", "email": "b@example.com"}, None),
+    ]
+
+
+def test_csv_rejects_undecodable_row():
+    records = parse("text/csv", b"id,email\na,\xc3@example.com\nb,b@example.com\n")
+    assert records == [
+        (2, None, INVALID_UTF8),
+        (3, {"id": "b", "email": "b@example.com"}, None),
+    ]
+
+
+def test_csv_undecodable_line_inside_quotes_rejects_the_record():
+    records = parse("text/csv", b'id,note\na,"one\n\xff"\nb,x\n')
+    assert records[0] == (2, None, INVALID_UTF8)
+
+
+def test_csv_unterminated_quote_is_rejected():
+    records = parse("text/csv", b'id,note\na,x\nb,"open\n')
+    assert records == [
+        (2, {"id": "a", "note": "x"}, None),
+        (3, None, "Unterminated quoted field"),
+    ]
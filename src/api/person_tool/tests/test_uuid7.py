@@ -0,0 +1,97 @@
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from person_tool.utils import uuid7 as uuid7_module
+from person_tool.utils.uuid7 import uuid7, uuid7_batch, uuid7_min, uuid7_time
+
+
+@pytest.fixture(autouse=True)
+def reset_batch_state():
+    # uuid7_batch continues from the last id it handed out, process-wide
+    uuid7_module._last[:] = [0, 0]
+    yield
+    uuid7_module._last[:] = [0, 0]
+
+
+def test_uuid7_version_and_variant():
+    uid = uuid7()
+    assert uid.version == 7
+    assert uid.variant == uuid.RFC_4122
+
+
+def test_uuid7_embeds_the_given_ms():
+    assert uuid7(ms=1_700_000_000_123).int >> 80 == 1_700_000_000_123
+
+
+def test_batch_is_strictly_increasing_within_one_ms():
+    uids = uuid7_batch(1000, time_func=lambda: 1_700_000_000_000)
+    assert uids == sorted(uids)
+    assert len(set(uids)) == 1000
+
+
+def test_batch_version_and_variant_bits():
+    for uid in uuid7_batch(100):
+        assert uid.version == 7
+        assert uid.variant == uuid.RFC_4122
+
+
+def test_batch_as_bytes_matches_uuid_bytes():
+    raw = uuid7_batch(10, as_bytes=True, time_func=lambda: 1_700_000_000_000)
+    assert all(isinstance(b, bytes) and len(b) == 16 for b in raw)
+    uids = [uuid.UUID(bytes=b) for b in raw]
+    assert uids == sorted(uids)
+    assert all(u.version == 7 for u in uids)
+
+
+def test_consecutive_batches_keep_increasing():
+    first = uuid7_batch(50, time_func=lambda: 1_700_000_000_000)
+    second = uuid7_batch(50, time_func=lambda: 1_700_000_000_000)
+    assert first[-1] < second[0]
+
+
+def test_clock_going_backwards_continues_the_last_counter():
+    later = uuid7_batch(10, time_func=lambda: 1_700_000_000_500)
+    earlier = uuid7_batch(10, time_func=lambda: 1_700_000_000_000)
+    assert later[-1] < earlier[0]
+    # The stepped-back clock is ignored: the ids keep the later timestamp
+    assert all(u.int >> 80 >= 1_700_000_000_500 for u in earlier)
+
+
+def test_counter_overflow_advances_the_timestamp():
+    ms = 1_700_000_000_000
+    uuid7_module._last[:] = [ms, uuid7_module._COUNTER_MAX - 1]
+    uids = uuid7_batch(3, time_func=lambda: ms)
+    assert uids[0].int >> 80 == ms + 1
+    assert uids == sorted(uids)
+
+
+def test_uuid7_time_round_trips_the_ms():
+    moment = datetime(2025, 3, 1, 12, 30, 15, 123000, tzinfo=UTC)
+    ms = (moment - datetime(1970, 1, 1, tzinfo=UTC)) // timedelta(milliseconds=1)
+    assert uuid7_time(uuid7(ms=ms)) == moment
+
+
+def test_uuid7_min_is_the_smallest_id_of_its_ms():
+    moment = datetime(2025, 3, 1, 12, 0, tzinfo=UTC)
+    low = uuid7_min(moment)
+    assert uuid7_time(low) == moment
+    assert low.version == 7
+    assert all(low <= u for u in uuid7_batch(100, time_func=lambda: low.int >> 80))
+
+
+def test_uuid7_min_rounds_sub_ms_moments_up():
+    moment = datetime(2025, 3, 1, 12, 0, 0, 1500, tzinfo=UTC)
+    # An id minted in ms 1 has created_at 12:00:00.001 < moment, so it must sort
+    # below the bound; one minted in ms 2 is at or after it
+    assert uuid7_time(uuid7_min(moment)) == moment.replace(microsecond=2000)
+
+
+def test_uuid7_min_treats_naive_datetimes_as_utc():
+    naive = datetime(2025, 3, 1, 12, 0)
+    assert uuid7_min(naive) == uuid7_min(naive.replace(tzinfo=UTC))
+
+
+def test_uuid7_min_clamps_before_the_epoch():
+    assert uuid7_min(datetime(1960, 1, 1, tzinfo=UTC)).int >> 80 == 0
@@ -0,0 +1,72 @@
+import collections.abc as c
+import contextvars
+import time
+import typing as t
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from asyncpg.connection import LoggedQuery  # type: ignore
+
+Phase = t.Literal["pool_wait", "sql", "validation", "serialization"]
+
+
+@dataclass(slots=True)
+class RequestTimings:
+    """Seconds spent in each phase of one request."""
+
+    pool_wait: float = 0.0
+    sql: float = 0.0
+    queries: int = 0
+    validation: float = 0.0
+    serialization: float = 0.0
+
+    def server_timing(self, total: float) -> str:
+        return ", ".join(
+            (
+                f"pool-wait;dur={self.pool_wait * 1000:.2f}",
+                f'sql;dur={self.sql * 1000:.2f};desc="{self.queries} queries"',
+                f"validation;dur={self.validation * 1000:.2f}",
+                f"serialization;dur={self.serialization * 1000:.2f}",
+                f"total;dur={total * 1000:.2f}",
+            )
+        )
+
+
+request_timings: contextvars.ContextVar[RequestTimings | None] = contextvars.ContextVar(
+    "request_timings", default=None
+)
+
+
+def record_timing(phase: Phase, seconds: float) -> None:
+    timings: RequestTimings | None = request_timings.get()
+    if timings is not None:
+        setattr(timings, phase, getattr(timings, phase) + seconds)
+
+
+def record_query(query: LoggedQuery) -> None:
+    """
+    asyncpg query logger installed on every pooled connection. asyncpg calls it
+    with a copy of the querying task's context, so it finds that request.
+    """
+    timings: RequestTimings | None = request_timings.get()
+    if timings is not None:
+        timings.sql += query.elapsed
+        timings.queries += 1
+
+
+@contextmanager
+def timed(phase: Phase) -> c.Iterator[None]:
+    start: float = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(phase, time.perf_counter() - start)
+
+
+__all__ = [
+    "RequestTimings",
+    "record_query",
+    "record_timing",
+    "request_timings",
+    "timed",
+]
@@ -1,12 +1,51 @@
+import collections.abc as c
+from datetime import datetime
 from uuid import UUID
 
+from fastapi import status
+from fastapi.exceptions import HTTPException
+
+from person_tool.bulk.export import ExportFormat
+from person_tool.bulk.models import BatchDeleteResponse, ImportReport
+from person_tool.bulk.parsing import ParsedRecord
+from person_tool.config import settings
+from person_tool.db.core import ENTITY_CHANGED_CHANNEL, people_management_db
+from person_tool.db.counts import TotalCount
+from person_tool.db.replicas import requires_fresh_read
+from person_tool.factories.batch_loader import BatchLoader
+from person_tool.factories.entity_cache import EntityCache
 from person_tool.factories.service_factory import service_factory
-from person_tool.users.models import CreateUserRequest, UpdateUserRequest, UserResponse
+from person_tool.users.models import (
+    CreateUserRequest,
+    UpdateUserRequest,
+    UserBatchUpdateResponse,
+    UserPage,
+    UserResponse,
+    UserWithJobsResponse,
+)
+
+
+async def _load_users(uids: list[UUID]) -> dict[UUID, UserResponse]:
+    # Cache fills read the primary: a lagging replica could otherwise repopulate
+    # an entry right after its NOTIFY invalidation
+    async with service_factory(use_transaction=False, use_replica=False) as sf:
+        return await sf.user_service.get_users_by_ids(uids=uids)
+
+
+user_loader: BatchLoader[UUID, UserResponse] = BatchLoader(_load_users)
+user_cache: EntityCache[UserResponse] = EntityCache(
+    "users", max_size=settings.cache.max_size, ttl=settings.cache.ttl
+)
+people_management_db.add_listener(
+    ENTITY_CHANGED_CHANNEL, user_cache.notify, on_gap=user_cache.clear
+)
 
 
 class UserApplication:
     def __init__(self) -> None:
         self.service_factory = service_factory
+        self.user_loader = user_loader
+        self.user_cache = user_cache
 
     async def get_users(
         self,
@@ -14,6 +53,8 @@ class UserApplication:
         user_id: str | None,
         first_name: str | None,
         last_name: str | None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
         limit: int = 10,
         offset: int = 0,
     ) -> list[UserResponse]:
@@ -22,14 +63,86 @@ class UserApplication:
                 user_id=user_id,
                 first_name=first_name,
                 last_name=last_name,
+                created_after=created_after,
+                created_before=created_before,
                 limit=limit,
                 offset=offset,
             )
         return users
 
+    async def get_users_page(
+        self,
+        *,
+        user_id: str | None,
+        first_name: str | None,
+        last_name: str | None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+        after: tuple[datetime, UUID] | None,
+        limit: int = 10,
+    ) -> UserPage:
+        async with self.service_factory(use_transaction=False) as sf:
+            page: UserPage = await sf.user_service.get_users_page(
+                user_id=user_id,
+                first_name=first_name,
+                last_name=last_name,
+                created_after=created_after,
+                created_before=created_before,
+                after=after,
+                limit=limit,
+            )
+        return page
+
+    async def count_users(
+        self,
+        *,
+        user_id: str | None,
+        first_name: str | None,
+        last_name: str | None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+    ) -> TotalCount:
+        async with self.service_factory(use_transaction=False) as sf:
+            total: TotalCount = await sf.user_service.count_users(
+                user_id=user_id,
+                first_name=first_name,
+                last_name=last_name,
+                created_after=created_after,
+                created_before=created_before,
+                exact_limit=settings.database.exact_count_limit,
+            )
+        return total
+
     async def get_user_by_id(self, uid: UUID) -> UserResponse:
+        if requires_fresh_read():
+            # Read-your-writes: skip the shared cache and batch
+            async with self.service_factory(use_transaction=False) as sf:
+                return await sf.user_service.get_user_by_id(uid=uid)
+        user: UserResponse | None = self.user_cache.get(uid)
+        if user:
+            return user
+        generation: int = self.user_cache.generation
+        # Concurrent lookups share one `uid = ANY($1)` query and one checkout
+        user = await self.user_loader.load(uid)
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"User with uid: {uid} not found",
+            )
+        self.user_cache.set(uid, user, generation=generation)
+        return user
+
+    async def get_user_with_jobs(
+        self,
+        uid: UUID,
+        *,
+        after: tuple[datetime, UUID] | None,
+        limit: int = 50,
+    ) -> UserWithJobsResponse:
         async with self.service_factory(use_transaction=False) as sf:
-            user: UserResponse = await sf.user_service.get_user_by_id(uid=uid)
+            user: UserWithJobsResponse = await sf.user_service.get_user_with_jobs(
+                uid, after=after, limit=limit
+            )
         return user
 
     async def create_users(self, data: list[CreateUserRequest]) -> list[UserResponse]:
@@ -37,11 +150,63 @@ class UserApplication:
             users: list[UserResponse] = await sf.user_service.create_users(data=data)
         return users
 
-    async def update_user(self, data: UpdateUserRequest) -> UserResponse:
+    async def export_users(self, fmt: ExportFormat) -> c.AsyncIterator[bytes]:
+        # The connection stays checked out, in one read-only snapshot, for as
+        # long as the response is streaming
+        async with self.service_factory(use_transaction=True, readonly=True) as sf:
+            async for chunk in sf.user_service.export_users(fmt=fmt):
+                yield chunk
+
+    async def import_users(
+        self, records: c.AsyncIterator[ParsedRecord]
+    ) -> ImportReport:
         async with self.service_factory(use_transaction=True) as sf:
-            user: UserResponse = await sf.user_service.update_user(data=data)
+            report: ImportReport = await sf.user_service.import_users(records=records)
+        return report
+
+    async def get_user_version(self, uid: UUID) -> str | None:
+        """
+        Current row version for conditional GETs, from the cache when it holds
+        the row, otherwise with a version-only query.
+        """
+        if not requires_fresh_read():
+            cached: UserResponse | None = self.user_cache.get(uid)
+            if cached:
+                return cached.version
+        async with self.service_factory(use_transaction=False) as sf:
+            return await sf.user_service.get_user_version(uid=uid)
+
+    async def update_users(
+        self, data: list[UpdateUserRequest]
+    ) -> UserBatchUpdateResponse:
+        async with self.service_factory(use_transaction=True) as sf:
+            response: UserBatchUpdateResponse = await sf.user_service.update_users(
+                data=data
+            )
+        for user in response.updated:
+            self.user_cache.invalidate(user.uid)
+        return response
+
+    async def update_user(
+        self, data: UpdateUserRequest, if_match: list[str] | None = None
+    ) -> UserResponse:
+        async with self.service_factory(use_transaction=True) as sf:
+            user: UserResponse = await sf.user_service.update_user(
+                data=data, if_match=if_match
+            )
+        self.user_cache.invalidate(data.uid)
         return user
 
+    async def delete_users(self, uids: list[UUID]) -> BatchDeleteResponse:
+        async with self.service_factory(use_transaction=True) as sf:
+            response: BatchDeleteResponse = await sf.user_service.delete_users(
+                uids=uids
+            )
+        for uid in response.deleted:
+            self.user_cache.invalidate(uid)
+        return response
+
     async def delete_user(self, uid: UUID) -> None:
         async with self.service_factory(use_transaction=True) as sf:
             await sf.user_service.delete_user(uid=uid)
+        self.user_cache.invalidate(uid)
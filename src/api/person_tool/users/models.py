@@ -6,12 +6,14 @@ from uuid import UUID
 from pydantic import BaseModel, ConfigDict, EmailStr, Field  # type: ignore
 from pydantic.alias_generators import to_camel
 
+from person_tool.jobs.models import JobResponse
+
 
 class UserBase(BaseModel):
     id: str = Field(min_length=3, max_length=64, examples=["sl3789"])
     first_name: str = Field(min_length=1, max_length=100, examples=["Simon"])
     last_name: str = Field(min_length=1, max_length=100, examples=["Lidwell"])
-    email: EmailStr = Field(examples=["slidwell@example.com"])
+    email: EmailStr = Field(max_length=64, examples=["slidwell@example.com"])
 
     model_config = ConfigDict(
         extra="forbid", alias_generator=to_camel, populate_by_name=True
@@ -27,7 +29,7 @@ class UpdateUserRequest(BaseModel):
     id: str | None = Field(default=None, min_length=3, max_length=64)
     first_name: str | None = Field(default=None, min_length=1, max_length=100)
     last_name: str | None = Field(default=None, min_length=1, max_length=100)
-    email: EmailStr | None = None
+    email: EmailStr | None = Field(default=None, max_length=64)
 
     model_config = ConfigDict(
         extra="forbid", alias_generator=to_camel, populate_by_name=True
@@ -37,3 +39,24 @@ class UpdateUserRequest(BaseModel):
 class UserResponse(UserBase):
     uid: UUID
     created_at: datetime
+    # Row xmin, surfaced as the ETag rather than in the body
+    version: str | None = Field(default=None, exclude=True)
+
+
+class UserBatchUpdateResponse(BaseModel):
+    updated: list[UserResponse]
+    not_found: list[UUID]
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+
+class UserPage(BaseModel):
+    items: list[UserResponse]
+    next_cursor: str | None = None
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+
+class UserWithJobsResponse(UserResponse):
+    jobs: list[JobResponse]
+    next_cursor: str | None = None
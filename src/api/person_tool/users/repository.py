@@ -1,15 +1,53 @@
+import collections.abc as c
 import json
+from datetime import datetime
 from uuid import UUID
 
-from asyncpg import Connection  # type: ignore
 from asyncpg.protocol.protocol import Record  # type: ignore
 
-from person_tool.users.models import CreateUserRequest, UpdateUserRequest, UserResponse
+from person_tool.bulk.models import MAX_REPORTED_REJECTS, ImportReject
+from person_tool.db.counts import TotalCount, total_count
+from person_tool.db.filters import (
+    created_range,
+    ilike_filters,
+    newest_first,
+    newest_first_order,
+)
+from person_tool.db.keys import keyed, stamped
+from person_tool.db.statements import PreparedConnection
+from person_tool.timings import timed
+from person_tool.users.models import (
+    CreateUserRequest,
+    UpdateUserRequest,
+    UserResponse,
+    UserWithJobsResponse,
+)
+
+USERS_EXPORT_COLUMNS: tuple[str, ...] = (
+    "uid",
+    "id",
+    "first_name",
+    "last_name",
+    "email",
+    "created_at",
+)
+USERS_SELECT: str = (
+    "SELECT uid, id, first_name, last_name, email, created_at, xmin::text AS version"
+    " FROM people.users"
+)
+# Jobs attached to a user, for newest_first keyed on r.secondary_uid: uuid7
+# jobs then come off the (primary_uid, relationship_type, secondary_uid) index
+# in key order, and only the user's uuid4-keyed jobs are sorted
+USER_JOBS_SELECT: str = (
+    "SELECT j.uid, j.id, j.title, j.description, j.status, j.created_at"
+    " FROM people.user_relationships r"
+    " JOIN people.jobs j ON j.uid = r.secondary_uid"
+)
 
 
 class UserRepository:
-    def __init__(self, conn: Connection) -> None:
-        self.conn: Connection = conn
+    def __init__(self, conn: PreparedConnection) -> None:
+        self.conn: PreparedConnection = conn
 
     async def get_users(
         self,
@@ -17,84 +55,313 @@ class UserRepository:
         user_id: str | None,
         first_name: str | None,
         last_name: str | None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
         limit: int = 10,
         offset: int = 0,
     ) -> list[UserResponse] | None:
-        result: list[Record] = await self.conn.fetch(
-            """
-            SELECT uid, id, first_name, last_name, email, created_at
-            FROM people.users
-            WHERE ($1::text IS NULL OR id ILIKE '%' || $1 || '%')
-              AND ($2::text IS NULL OR first_name ILIKE '%' || $2 || '%')
-              AND ($3::text IS NULL OR last_name  ILIKE '%' || $3 || '%')
-            ORDER BY created_at DESC
-            LIMIT $4 OFFSET $5
-            """,
-            user_id,
-            first_name,
-            last_name,
-            limit,
-            offset,
+        where, args = ilike_filters(
+            {"id": user_id, "first_name": first_name, "last_name": last_name}
         )
+        query, args = newest_first(
+            USERS_SELECT,
+            where,
+            args,
+            created_after=created_after,
+            created_before=created_before,
+            limit=limit,
+            offset=offset,
+        )
+        result: list[Record] = await self.conn.fetch(query, *args)
         if not result:
             return None
-        return [UserResponse.model_validate(dict(r)) for r in result]
+        return [UserResponse.model_construct(**r) for r in result]
+
+    async def get_users_after(
+        self,
+        *,
+        user_id: str | None,
+        first_name: str | None,
+        last_name: str | None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+        after: tuple[datetime, UUID] | None,
+        limit: int = 10,
+    ) -> list[UserResponse] | None:
+        where, args = ilike_filters(
+            {"id": user_id, "first_name": first_name, "last_name": last_name}
+        )
+        query, args = newest_first(
+            USERS_SELECT,
+            where,
+            args,
+            created_after=created_after,
+            created_before=created_before,
+            after=after,
+            limit=limit,
+        )
+        result: list[Record] = await self.conn.fetch(query, *args)
+        if not result:
+            return None
+        return [UserResponse.model_construct(**r) for r in result]
+
+    async def count_users(
+        self,
+        *,
+        user_id: str | None,
+        first_name: str | None,
+        last_name: str | None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+        exact_limit: int,
+    ) -> TotalCount:
+        where, args = ilike_filters(
+            {"id": user_id, "first_name": first_name, "last_name": last_name}
+        )
+        where, args = created_range(
+            where, args, created_after=created_after, created_before=created_before
+        )
+        return await total_count(
+            self.conn, "people.users", where, args, exact_limit=exact_limit
+        )
 
     async def get_user_by_id(self, uid: UUID) -> UserResponse | None:
+        result: Record | None = await self.conn.fetchrow_prepared(
+            "users_get_by_id", uid
+        )
+        return UserResponse.model_construct(**result) if result else None
+
+    async def get_users_by_ids(self, uids: list[UUID]) -> list[UserResponse]:
+        result: list[Record] = await self.conn.fetch_prepared("users_get_by_ids", uids)
+        return [UserResponse.model_construct(**r) for r in result]
+
+    async def get_user_with_jobs(
+        self,
+        uid: UUID,
+        *,
+        after: tuple[datetime, UUID] | None,
+        limit: int = 50,
+    ) -> UserWithJobsResponse | None:
+        jobs, args = newest_first(
+            USER_JOBS_SELECT,
+            "r.primary_uid = u.uid AND r.relationship_type = 'USER_JOB'",
+            [uid],
+            alias="j.",
+            key="r.secondary_uid",
+            after=after,
+            limit=limit,
+        )
         result: Record | None = await self.conn.fetchrow(
-            """
-            SELECT uid, id, first_name, last_name, email, created_at
-            FROM people.users WHERE uid = $1
+            f"""
+            SELECT u.uid, u.id, u.first_name, u.last_name, u.email, u.created_at,
+                   COALESCE(page.jobs, '[]'::json) AS jobs
+            FROM people.users u
+            LEFT JOIN LATERAL (
+                SELECT json_agg(
+                    json_build_object(
+                        'uid', j.uid,
+                        'id', j.id,
+                        'title', j.title,
+                        'description', j.description,
+                        'status', j.status,
+                        'created_at', j.created_at
+                    )
+                    ORDER BY {newest_first_order("j.")}
+                ) AS jobs
+                FROM ({jobs}) j
+            ) page ON TRUE
+            WHERE u.uid = $1
             """,
-            uid,
+            *args,
         )
-        return UserResponse.model_validate(dict(result)) if result else None
+        if not result:
+            return None
+        with timed("validation"):
+            row: dict = dict(result)
+            row["jobs"] = json.loads(row["jobs"])
+            return UserWithJobsResponse.model_validate(row)
 
     async def create_users(
         self,
         data: list[CreateUserRequest],
     ) -> list[UserResponse]:
-        payload: str = json.dumps([d.model_dump() for d in data])
+        payload: str = json.dumps(keyed([d.model_dump() for d in data]))
         result: list[Record] = await self.conn.fetch(
             """
                 WITH payload AS (
                     SELECT * FROM jsonb_to_recordset($1::jsonb)
-                AS t(id text, first_name text, last_name text, email text)
+                AS t(uid uuid, id text, first_name text, last_name text, email text)
                 )
-                INSERT INTO people.users (id, first_name, last_name, email)
-                SELECT id, first_name, last_name, email
+                INSERT INTO people.users (uid, created_at, id, first_name, last_name, email)
+                SELECT uid, people.uuid7_time(uid), id, first_name, last_name, email
                 FROM payload
-                RETURNING uid, id, first_name, last_name, email, created_at;
+                RETURNING uid, id, first_name, last_name, email, created_at, xmin::text AS version;
                 """,
             payload,
         )
-        return [UserResponse.model_validate(dict(r)) for r in result]
+        return [UserResponse.model_construct(**r) for r in result]
+
+    async def iter_users(self) -> c.AsyncIterator[Record]:
+        """
+        Stream every user through a server-side cursor. Must run inside a
+        transaction.
+        """
+        query, args = newest_first(
+            f"SELECT {', '.join(USERS_EXPORT_COLUMNS)} FROM people.users", "TRUE", []
+        )
+        async for record in self.conn.cursor(query, *args, prefetch=1000):
+            yield record
+
+    async def create_import_table(self) -> None:
+        await self.conn.execute(
+            """
+            CREATE TEMP TABLE users_import (
+                uid        bytea NOT NULL,
+                line       int   NOT NULL,
+                id         text  NOT NULL,
+                first_name text  NOT NULL,
+                last_name  text  NOT NULL,
+                email      text  NOT NULL
+            ) ON COMMIT DROP
+            """
+        )
+
+    async def stage_users(self, rows: list[tuple]) -> None:
+        await self.conn.copy_records_to_table(
+            "users_import",
+            records=stamped(rows),
+            columns=(
+                "uid",
+                "line",
+                "id",
+                "first_name",
+                "last_name",
+                "email",
+            ),
+        )
+
+    async def merge_users_import(self) -> tuple[int, int, list[ImportReject]]:
+        """
+        Drop staged rows that collide on id/email with each other or with
+        existing users, then insert the rest.
+
+        Returns (inserted, rejected, first rejected rows).
+        """
+        rejected: list[Record] = await self.conn.fetch(
+            """
+            WITH collisions AS (
+                SELECT line, 'Duplicate id in import' AS reason
+                FROM (SELECT line, row_number() OVER (PARTITION BY id ORDER BY line) AS n
+                      FROM users_import) d
+                WHERE n > 1
+                UNION ALL
+                SELECT line, 'Duplicate email in import'
+                FROM (SELECT line, row_number() OVER (PARTITION BY email ORDER BY line) AS n
+                      FROM users_import) d
+                WHERE n > 1
+                UNION ALL
+                SELECT s.line, 'User id already exists'
+                FROM users_import s JOIN people.users u ON u.id = s.id
+                UNION ALL
+                SELECT s.line, 'User email already exists'
+                FROM users_import s JOIN people.users u ON u.email = s.email
+            ),
+            removed AS (
+                DELETE FROM users_import s
+                USING (SELECT DISTINCT ON (line) line, reason FROM collisions ORDER BY line) c
+                WHERE s.line = c.line
+                RETURNING s.line, s.id, c.reason
+            )
+            SELECT line, id, reason, count(*) OVER () AS total
+            FROM removed
+            ORDER BY line
+            LIMIT $1
+            """,
+            MAX_REPORTED_REJECTS,
+        )
+        status: str = await self.conn.execute(
+            """
+            INSERT INTO people.users (uid, created_at, id, first_name, last_name, email)
+            SELECT uid, people.uuid7_time(uid), id, first_name, last_name, email
+            FROM (
+                SELECT encode(uid, 'hex')::uuid AS uid, line, id, first_name, last_name, email
+                FROM users_import
+            ) s
+            ORDER BY line
+            ON CONFLICT DO NOTHING
+            """
+        )
+        return (
+            int(status.rsplit(" ", 1)[-1]),
+            rejected[0]["total"] if rejected else 0,
+            [
+                ImportReject(line=r["line"], id=r["id"], reason=r["reason"])
+                for r in rejected
+            ],
+        )
 
-    async def update_user(self, data: UpdateUserRequest) -> UserResponse | None:
-        row: Record | None = await self.conn.fetchrow(
+    async def update_users(self, data: list[UpdateUserRequest]) -> list[UserResponse]:
+        """
+        Apply many partial updates in one statement; unset fields keep their
+        current value. Uids with no matching row are simply absent from the result.
+        """
+        payload: str = json.dumps([d.model_dump(mode="json") for d in data])
+        result: list[Record] = await self.conn.fetch(
             """
-            UPDATE people.users
+            UPDATE people.users u
             SET
-                id         = COALESCE($2, id),
-                first_name = COALESCE($3, first_name),
-                last_name  = COALESCE($4, last_name),
-                email      = COALESCE($5, email)
-            WHERE uid = $1
-            RETURNING uid, id, first_name, last_name, email, created_at;
+                id         = COALESCE(p.id, u.id),
+                first_name = COALESCE(p.first_name, u.first_name),
+                last_name  = COALESCE(p.last_name, u.last_name),
+                email      = COALESCE(p.email, u.email)
+            FROM jsonb_to_recordset($1::jsonb)
+                AS p(uid uuid, id text, first_name text, last_name text, email text)
+            WHERE u.uid = p.uid
+            RETURNING u.uid, u.id, u.first_name, u.last_name, u.email, u.created_at,
+                      u.xmin::text AS version
             """,
+            payload,
+        )
+        return [UserResponse.model_construct(**r) for r in result]
+
+    async def update_user(
+        self, data: UpdateUserRequest, if_match: list[str] | None = None
+    ) -> UserResponse | None:
+        row: Record | None = await self.conn.fetchrow_prepared(
+            "users_update",
             data.uid,
             data.id,
             data.first_name,
             data.last_name,
             data.email,
+            if_match,
         )
-        return UserResponse.model_validate(dict(row)) if row else None
+        return UserResponse.model_construct(**row) if row else None
 
-    async def delete_user(self, uid: UUID) -> str:
-        result = await self.conn.execute(
+    async def get_user_version(self, uid: UUID) -> str | None:
+        return await self.conn.fetchval_prepared("users_get_version", uid)
+
+    async def delete_users(self, uids: list[UUID]) -> list[UUID]:
+        """
+        Delete every user in `uids`, and the relationships on either side of
+        them, in one statement. Returns the uids that were deleted.
+        """
+        result: list[Record] = await self.conn.fetch(
             """
-            DELETE FROM people.users WHERE uid = $1
+            WITH deleted AS (
+                DELETE FROM people.users WHERE uid = ANY($1::uuid[]) RETURNING uid
+            ), relationships AS (
+                -- Keyed on the rows actually deleted: a uid of another kind
+                -- must not take that entity's relationships with it
+                DELETE FROM people.user_relationships
+                WHERE primary_uid IN (SELECT uid FROM deleted)
+                   OR secondary_uid IN (SELECT uid FROM deleted)
+            )
+            SELECT uid FROM deleted
             """,
-            uid,
+            uids,
         )
-        return result
+        return [r["uid"] for r in result]
+
+    async def delete_user(self, uid: UUID) -> str:
+        return await self.conn.execute_prepared("users_delete", uid)
@@ -1,10 +1,25 @@
+import collections.abc as c
+from datetime import datetime
 from uuid import UUID
 
 from fastapi import status
 from fastapi.exceptions import HTTPException
 
-from person_tool.users.models import CreateUserRequest, UpdateUserRequest, UserResponse
-from person_tool.users.repository import UserRepository
+from person_tool.bulk.export import ExportFormat, encode_records
+from person_tool.bulk.ingest import stage_records
+from person_tool.bulk.models import BatchDeleteResponse, ImportReport
+from person_tool.bulk.parsing import ParsedRecord
+from person_tool.db.counts import TotalCount
+from person_tool.users.models import (
+    CreateUserRequest,
+    UpdateUserRequest,
+    UserBatchUpdateResponse,
+    UserPage,
+    UserResponse,
+    UserWithJobsResponse,
+)
+from person_tool.users.repository import USERS_EXPORT_COLUMNS, UserRepository
+from person_tool.utils.cursor import encode_cursor
 
 
 class UserService:
@@ -17,6 +32,8 @@ class UserService:
         user_id: str | None,
         first_name: str | None,
         last_name: str | None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
         limit: int = 10,
         offset: int = 0,
     ) -> list[UserResponse]:
@@ -24,6 +41,8 @@ class UserService:
             user_id=user_id,
             first_name=first_name,
             last_name=last_name,
+            created_after=created_after,
+            created_before=created_before,
             limit=limit,
             offset=offset,
         )
@@ -34,6 +53,56 @@ class UserService:
             )
         return users
 
+    async def get_users_page(
+        self,
+        *,
+        user_id: str | None,
+        first_name: str | None,
+        last_name: str | None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+        after: tuple[datetime, UUID] | None,
+        limit: int = 10,
+    ) -> UserPage:
+        users: list[UserResponse] | None = await self.repository.get_users_after(
+            user_id=user_id,
+            first_name=first_name,
+            last_name=last_name,
+            created_after=created_after,
+            created_before=created_before,
+            after=after,
+            limit=limit + 1,
+        )
+        if not users:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Users not found",
+            )
+        next_cursor: str | None = None
+        if len(users) > limit:
+            users = users[:limit]
+            next_cursor = encode_cursor(users[-1].created_at, users[-1].uid)
+        return UserPage(items=users, next_cursor=next_cursor)
+
+    async def count_users(
+        self,
+        *,
+        user_id: str | None,
+        first_name: str | None,
+        last_name: str | None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+        exact_limit: int,
+    ) -> TotalCount:
+        return await self.repository.count_users(
+            user_id=user_id,
+            first_name=first_name,
+            last_name=last_name,
+            created_after=created_after,
+            created_before=created_before,
+            exact_limit=exact_limit,
+        )
+
     async def get_user_by_id(self, uid: UUID) -> UserResponse:
         user: UserResponse | None = await self.repository.get_user_by_id(uid=uid)
         if not user:
@@ -43,19 +112,96 @@ class UserService:
             )
         return user
 
+    async def get_users_by_ids(self, uids: list[UUID]) -> dict[UUID, UserResponse]:
+        users: list[UserResponse] = await self.repository.get_users_by_ids(uids=uids)
+        return {user.uid: user for user in users}
+
+    async def get_user_with_jobs(
+        self,
+        uid: UUID,
+        *,
+        after: tuple[datetime, UUID] | None,
+        limit: int = 50,
+    ) -> UserWithJobsResponse:
+        user: UserWithJobsResponse | None = await self.repository.get_user_with_jobs(
+            uid, after=after, limit=limit + 1
+        )
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"User with uid: {uid} not found",
+            )
+        if len(user.jobs) > limit:
+            user.jobs = user.jobs[:limit]
+            user.next_cursor = encode_cursor(
+                user.jobs[-1].created_at, user.jobs[-1].uid
+            )
+        return user
+
     async def create_users(self, data: list[CreateUserRequest]) -> list[UserResponse]:
         response: list[UserResponse] = await self.repository.create_users(data=data)
         return response
 
-    async def update_user(self, data: UpdateUserRequest) -> UserResponse:
-        user: UserResponse | None = await self.repository.update_user(data=data)
+    def export_users(self, fmt: ExportFormat) -> c.AsyncIterator[bytes]:
+        return encode_records(
+            self.repository.iter_users(), columns=USERS_EXPORT_COLUMNS, fmt=fmt
+        )
+
+    async def import_users(
+        self, records: c.AsyncIterator[ParsedRecord]
+    ) -> ImportReport:
+        await self.repository.create_import_table()
+        report: ImportReport = await stage_records(
+            records,
+            model=CreateUserRequest,
+            columns=("id", "first_name", "last_name", "email"),
+            stage=self.repository.stage_users,
+        )
+        inserted, rejected, rejects = await self.repository.merge_users_import()
+        report.inserted = inserted
+        report.add_rejects(rejected, rejects)
+        return report
+
+    async def get_user_version(self, uid: UUID) -> str | None:
+        return await self.repository.get_user_version(uid=uid)
+
+    async def update_users(
+        self, data: list[UpdateUserRequest]
+    ) -> UserBatchUpdateResponse:
+        updated: list[UserResponse] = await self.repository.update_users(data=data)
+        found: set[UUID] = {user.uid for user in updated}
+        return UserBatchUpdateResponse(
+            updated=updated,
+            not_found=[d.uid for d in data if d.uid not in found],
+        )
+
+    async def update_user(
+        self, data: UpdateUserRequest, if_match: list[str] | None = None
+    ) -> UserResponse:
+        user: UserResponse | None = await self.repository.update_user(
+            data=data, if_match=if_match
+        )
         if not user:
+            if if_match is not None and await self.repository.get_user_version(
+                uid=data.uid
+            ):
+                raise HTTPException(
+                    status_code=status.HTTP_412_PRECONDITION_FAILED,
+                    detail=f"User with uid: {data.uid} has been modified",
+                )
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"User with uid: {data.uid} not found",
             )
         return user
 
+    async def delete_users(self, uids: list[UUID]) -> BatchDeleteResponse:
+        deleted: list[UUID] = await self.repository.delete_users(uids=uids)
+        found: set[UUID] = set(deleted)
+        return BatchDeleteResponse(
+            deleted=deleted, not_found=[uid for uid in uids if uid not in found]
+        )
+
     async def delete_user(self, uid: UUID) -> None:
         result: str = await self.repository.delete_user(uid=uid)
         if result != "DELETE 1":
@@ -1,25 +1,65 @@
 import typing as t
+from datetime import datetime
 from uuid import UUID
 
-from fastapi import APIRouter, Body, Depends, Path, Query, status
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Header,
+    Path,
+    Query,
+    Request,
+    Response,
+    status,
+)
 from fastapi.exceptions import HTTPException
+from fastapi.responses import StreamingResponse
 
+from person_tool.bulk.export import EXPORT_MEDIA_TYPES, ExportFormat
+from person_tool.bulk.models import (
+    MAX_BATCH_SIZE,
+    BatchDeleteResponse,
+    ImportReport,
+)
+from person_tool.bulk.parsing import aiter_records, is_supported
 from person_tool.dependencies import provide_user_application
+from person_tool.responses import (
+    ModelJSONResponse,
+    not_modified,
+    total_count_headers,
+)
 from person_tool.users.application import UserApplication
-from person_tool.users.models import CreateUserRequest, UpdateUserRequest, UserResponse
+from person_tool.users.models import (
+    CreateUserRequest,
+    UpdateUserRequest,
+    UserBatchUpdateResponse,
+    UserPage,
+    UserResponse,
+    UserWithJobsResponse,
+)
+from person_tool.utils.cursor import decode_cursor
+from person_tool.utils.etag import (
+    collection_etag,
+    entity_etag,
+    if_match_versions,
+    if_none_match,
+)
 
 router = APIRouter()
 
 
 @router.get(
     path="/",
+    response_model=list[UserResponse] | UserPage,
     status_code=status.HTTP_200_OK,
     summary="Get users by query params",
     responses={
         status.HTTP_200_OK: {
-            "model": list[UserResponse],
-            "description": "Gets a user from the db by uid",
+            "model": list[UserResponse] | UserPage,
+            "description": "Gets users from the db by query parameters",
         },
+        status.HTTP_400_BAD_REQUEST: {"description": "Invalid cursor"},
         status.HTTP_404_NOT_FOUND: {"description": "Users not found"},
     },
 )
@@ -34,24 +74,118 @@ async def get_users(
     last_name: t.Optional[str] = Query(
         default=None, alias="lastName", examples=["lidwell", "li", "ell"]
     ),
-    limit: int = 10,
-    offset: int = 0,
-) -> list[UserResponse]:
+    created_after: t.Annotated[
+        datetime | None,
+        Query(
+            alias="createdAfter",
+            description="Only rows created at or after this time (UTC if no offset)",
+        ),
+    ] = None,
+    created_before: t.Annotated[
+        datetime | None,
+        Query(
+            alias="createdBefore",
+            description="Only rows created before this time (UTC if no offset)",
+        ),
+    ] = None,
+    limit: int = Query(default=10, ge=1, le=1000),
+    offset: int = Query(default=0, ge=0),
+    cursor: str | None = Query(
+        default=None,
+        description="Keyset cursor. Pass an empty value for the first page, "
+        "then the returned nextCursor. Ignores offset.",
+    ),
+    total_count: bool = Query(
+        default=False,
+        alias="totalCount",
+        description="Add an X-Total-Count header: exact for small results, "
+        "estimated from table statistics otherwise. X-Total-Count-Exact says which.",
+    ),
+    if_none_match_header: str | None = Header(default=None, alias="If-None-Match"),
+) -> Response:
     """
     Get users by query params
     """
+
+    async def total_headers() -> dict[str, str]:
+        if not total_count:
+            return {}
+        return total_count_headers(
+            await application.count_users(
+                user_id=user_id,
+                first_name=first_name,
+                last_name=last_name,
+                created_after=created_after,
+                created_before=created_before,
+            )
+        )
+
+    if cursor is not None:
+        try:
+            after = decode_cursor(cursor) if cursor else None
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+            ) from e
+        page: UserPage = await application.get_users_page(
+            user_id=user_id,
+            first_name=first_name,
+            last_name=last_name,
+            created_after=created_after,
+            created_before=created_before,
+            after=after,
+            limit=limit,
+        )
+        etag: str = collection_etag(page.items, page.next_cursor)
+        totals: dict[str, str] = await total_headers()
+        if if_none_match(if_none_match_header, etag):
+            return not_modified(etag, totals)
+        return ModelJSONResponse(page, headers={"ETag": etag, **totals})
     response: list[UserResponse] = await application.get_users(
         user_id=user_id,
         first_name=first_name,
         last_name=last_name,
+        created_after=created_after,
+        created_before=created_before,
         limit=limit,
         offset=offset,
     )
-    return response
+    etag: str = collection_etag(response)
+    totals: dict[str, str] = await total_headers()
+    if if_none_match(if_none_match_header, etag):
+        return not_modified(etag, totals)
+    return ModelJSONResponse(response, headers={"ETag": etag, **totals})
+
+
+@router.get(
+    path="/export",
+    status_code=status.HTTP_200_OK,
+    summary="Export all users",
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {
+            "content": {"application/x-ndjson": {}, "text/csv": {}},
+            "description": "Streams every user as NDJSON or CSV",
+        },
+    },
+)
+async def export_users(
+    application: t.Annotated[UserApplication, Depends(provide_user_application)],
+    fmt: t.Annotated[ExportFormat, Query(alias="format")] = "ndjson",
+) -> StreamingResponse:
+    """
+    Stream all users, newest first, from a server-side cursor
+    """
+    return StreamingResponse(
+        application.export_users(fmt=fmt),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="users.{fmt}"'},
+    )
 
 
 @router.get(
     path="/{uid}",
+    response_model=UserResponse,
     status_code=status.HTTP_200_OK,
     summary="Get user by uid",
     responses={
@@ -59,35 +193,64 @@ async def get_users(
             "model": UserResponse,
             "description": "Gets a user from the db by uid",
         },
+        status.HTTP_304_NOT_MODIFIED: {"description": "User unchanged"},
         status.HTTP_404_NOT_FOUND: {"description": "Users not found"},
     },
 )
 async def get_user_by_id(
     application: t.Annotated[UserApplication, Depends(provide_user_application)],
     uid: UUID = Path(..., title="User id to retrieve"),
-) -> UserResponse:
+    if_none_match_header: str | None = Header(default=None, alias="If-None-Match"),
+) -> Response:
     """
     Retrieve a user by id
     """
+    if if_none_match_header:
+        version: str | None = await application.get_user_version(uid=uid)
+        if version and if_none_match(if_none_match_header, entity_etag(version)):
+            return not_modified(entity_etag(version))
     response: UserResponse = await application.get_user_by_id(uid=uid)
-    return response
+    headers: dict[str, str] = {}
+    if response.version:
+        headers["ETag"] = entity_etag(response.version)
+    return ModelJSONResponse(response, headers=headers)
 
 
 @router.get(
     path="/{uid}/jobs",
+    response_model=UserWithJobsResponse,
     status_code=status.HTTP_200_OK,
     summary="Get a user with their jobs",
     responses={
         status.HTTP_200_OK: {
-            "description": "Gets a user with all jobs attached to them"
+            "model": UserWithJobsResponse,
+            "description": "Gets a user with all jobs attached to them",
         },
+        status.HTTP_400_BAD_REQUEST: {"description": "Invalid cursor"},
         status.HTTP_404_NOT_FOUND: {"description": "User not found"},
     },
 )
 async def get_user_with_jobs_by_uid(
     application: t.Annotated[UserApplication, Depends(provide_user_application)],
-):
-    return NotImplementedError()
+    uid: t.Annotated[UUID, Path(title="User id to retrieve")],
+    limit: int = Query(default=50, ge=1, le=1000),
+    cursor: str | None = Query(
+        default=None, description="nextCursor from the previous page of jobs"
+    ),
+) -> ModelJSONResponse:
+    """
+    Retrieve a user and a page of their jobs in a single query
+    """
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from e
+    response: UserWithJobsResponse = await application.get_user_with_jobs(
+        uid, after=after, limit=limit
+    )
+    return ModelJSONResponse(response)
 
 
 @router.post(
@@ -120,6 +283,87 @@ async def create_users(
     return await application.create_users(data=data)
 
 
+@router.post(
+    path="/import",
+    status_code=status.HTTP_201_CREATED,
+    summary="Bulk import users",
+    responses={
+        status.HTTP_201_CREATED: {
+            "model": ImportReport,
+            "description": "Imports users from a streamed NDJSON or CSV body",
+        },
+        status.HTTP_415_UNSUPPORTED_MEDIA_TYPE: {
+            "description": "Body must be application/x-ndjson or text/csv"
+        },
+    },
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/x-ndjson": {"schema": {"type": "string"}},
+                "text/csv": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def import_users(
+    application: t.Annotated[UserApplication, Depends(provide_user_application)],
+    request: Request,
+) -> ImportReport:
+    """
+    Stream users from an NDJSON body (one object per line) or a CSV body with a
+    header row, staging them with COPY and merging them in one transaction.
+    Rows that fail validation or collide with existing data are reported by line.
+    """
+    content_type: str = request.headers.get("content-type", "")
+    if not is_supported(content_type):
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Body must be application/x-ndjson or text/csv",
+        )
+    return await application.import_users(
+        records=aiter_records(request.stream(), content_type)
+    )
+
+
+@router.patch(
+    path="/batch",
+    response_model=UserBatchUpdateResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Update many users",
+    responses={
+        status.HTTP_200_OK: {
+            "model": UserBatchUpdateResponse,
+            "description": "Updated users, and the uids that were not found",
+        },
+        status.HTTP_400_BAD_REQUEST: {
+            "description": f"Duplicate uids, or more than {MAX_BATCH_SIZE} updates"
+        },
+    },
+)
+async def update_users(
+    application: t.Annotated[UserApplication, Depends(provide_user_application)],
+    data: t.Annotated[
+        list[UpdateUserRequest], Body(title="Partial updates, one per uid")
+    ],
+) -> ModelJSONResponse:
+    """
+    Apply a batch of partial updates in one statement and transaction
+    """
+    if len(data) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot update more than {MAX_BATCH_SIZE} users at once",
+        )
+    if len({d.uid for d in data}) != len(data):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Each uid may only appear once per batch",
+        )
+    response: UserBatchUpdateResponse = await application.update_users(data=data)
+    return ModelJSONResponse(response)
+
+
 @router.patch(
     path="/",
     status_code=status.HTTP_202_ACCEPTED,
@@ -129,19 +373,61 @@ async def create_users(
             "description": "User updated",
         },
         status.HTTP_404_NOT_FOUND: {"description": "User not found"},
+        status.HTTP_412_PRECONDITION_FAILED: {
+            "description": "User changed since the If-Match ETag was issued"
+        },
     },
 )
 async def update_user(
     application: t.Annotated[UserApplication, Depends(provide_user_application)],
+    response: Response,
     data: UpdateUserRequest = Body(...),
+    if_match: str | None = Header(default=None, alias="If-Match"),
 ) -> UserResponse:
     """
-    Update a user
+    Update a user. With `If-Match`, only if it still has that ETag
     """
-    user: UserResponse = await application.update_user(data=data)
+    user: UserResponse = await application.update_user(
+        data=data, if_match=if_match_versions(if_match)
+    )
+    if user.version:
+        response.headers["ETag"] = entity_etag(user.version)
     return user
 
 
+@router.delete(
+    path="/batch",
+    response_model=BatchDeleteResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Delete many users",
+    responses={
+        status.HTTP_200_OK: {
+            "model": BatchDeleteResponse,
+            "description": "Deleted uids, and the uids that were not found",
+        },
+        status.HTTP_400_BAD_REQUEST: {
+            "description": f"More than {MAX_BATCH_SIZE} uids"
+        },
+    },
+)
+async def delete_users(
+    application: t.Annotated[UserApplication, Depends(provide_user_application)],
+    uids: t.Annotated[list[UUID], Body(title="User uids to delete")],
+) -> ModelJSONResponse:
+    """
+    Delete a batch of users, and their relationships, in one transaction
+    """
+    if len(uids) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot delete more than {MAX_BATCH_SIZE} users at once",
+        )
+    response: BatchDeleteResponse = await application.delete_users(
+        uids=list(dict.fromkeys(uids))
+    )
+    return ModelJSONResponse(response)
+
+
 @router.delete(
     path="/{uid}",
     status_code=status.HTTP_204_NO_CONTENT,
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import base64
+import binascii
+from datetime import datetime
+from uuid import UUID
+
+
+def encode_cursor(created_at: datetime, uid: UUID) -> str:
+    """
+    Encode the keyset position of the last row of a page into an opaque,
+    url-safe cursor string.
+    """
+    raw = f"{created_at.isoformat()}|{uid}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """
+    Decode a cursor produced by `encode_cursor` back into its
+    (created_at, uid) keyset position.
+
+    Raises ValueError if the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, uid = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), UUID(uid)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+__all__ = ("decode_cursor", "encode_cursor")
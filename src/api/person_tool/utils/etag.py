@@ -0,0 +1,64 @@
+import collections.abc as c
+import hashlib
+import typing as t
+
+
+class Versioned(t.Protocol):
+    uid: t.Any
+    version: str | None
+
+
+def entity_etag(version: str) -> str:
+    """Strong ETag for a single row, from its `xmin`."""
+    return f'"{version}"'
+
+
+def collection_etag(items: c.Iterable[Versioned], *extra: str | None) -> str:
+    """
+    Strong ETag for a page of rows: a digest of each row's uid and version,
+    plus anything else that shapes the payload (e.g. the next cursor).
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for item in items:
+        digest.update(f"{item.uid}:{item.version};".encode())
+    for value in extra:
+        digest.update(f"|{value or ''}".encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def _parse(header: str) -> list[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def if_none_match(header: str | None, etag: str) -> bool:
+    """True when `If-None-Match` matches `etag` (weak comparison, RFC 9110)."""
+    if not header:
+        return False
+    tags: list[str] = _parse(header)
+    return "*" in tags or etag in (tag.removeprefix("W/") for tag in tags)
+
+
+def if_match_versions(header: str | None) -> list[str] | None:
+    """
+    Row versions accepted by an `If-Match` header, or None when any version
+    will do (no header, or `*`). Weak tags never match (strong comparison),
+    so a header holding only weak tags yields an empty list.
+    """
+    if not header:
+        return None
+    tags: list[str] = _parse(header)
+    if "*" in tags:
+        return None
+    return [
+        tag[1:-1]
+        for tag in tags
+        if len(tag) >= 2 and tag.startswith('"') and tag.endswith('"')
+    ]
+
+
+__all__ = (
+    "collection_etag",
+    "entity_etag",
+    "if_match_versions",
+    "if_none_match",
+)
@@ -3,7 +3,10 @@ from __future__ import annotations
 import os
 import time
 import uuid
-from typing import Callable, Optional
+from datetime import UTC, datetime, timedelta
+from typing import Callable, Literal, Optional, overload
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
 
 
 def _time_ms() -> int:
@@ -114,8 +117,99 @@ def uuidfromvalues(unix_ts_ms: int, rand_a: int, rand_b: int):
     return final_bytes
 
 
+_VERSION_VARIANT = (0x7 << 76) | (0x2 << 62)
+_RAND_B_BITS = 62
+_RAND_B_MASK = (1 << _RAND_B_BITS) - 1
+# rand_a and rand_b together form a 74-bit counter. Seeding it with 64 random
+# bits leaves 2**74 - 2**64 of headroom for the increments within one ms
+_COUNTER_MAX = (1 << 74) - 1
+
+# (ms, counter) of the last id uuid7_batch handed out
+_last: list[int] = [0, 0]
+
+
+@overload
+def uuid7_batch(
+    n: int,
+    *,
+    as_bytes: Literal[False] = False,
+    time_func: Callable[[], int] = _time_ms,
+) -> list[uuid.UUID]: ...
+
+
+@overload
+def uuid7_batch(
+    n: int,
+    *,
+    as_bytes: Literal[True],
+    time_func: Callable[[], int] = _time_ms,
+) -> list[bytes]: ...
+
+
+def uuid7_batch(
+    n: int,
+    *,
+    as_bytes: bool = False,
+    time_func: Callable[[], int] = _time_ms,
+) -> list[uuid.UUID] | list[bytes]:
+    """
+    `n` uuid7s in strictly increasing order, from a single `os.urandom` read.
+
+    The 74 bits after the timestamp are a counter (RFC 9562, method 2): it
+    starts from a random 64-bit seed and each id adds a random 32-bit step,
+    so ids stay unguessable while sorting in the order they were handed out.
+    Calls landing in the same millisecond as the previous one, or after the
+    clock stepped back, continue its counter instead of reseeding; if the
+    counter ever fills up the timestamp is advanced by one ms.
+
+    `as_bytes=True` returns the raw 16-byte big-endian form (what
+    `UUID.bytes` would be) without building UUID objects at all.
+    """
+    rand: bytes = os.urandom(8 + 4 * n)
+    ms: int = time_func()
+    if ms <= _last[0]:
+        ms, counter = _last
+    else:
+        counter = int.from_bytes(rand[:8], "big")
+
+    high: int = (ms << 80) | _VERSION_VARIANT
+    values: list[int] = []
+    for step in memoryview(rand)[8:].cast("I"):
+        counter += step + 1
+        if counter > _COUNTER_MAX:
+            ms += 1
+            high = (ms << 80) | _VERSION_VARIANT
+            counter = step
+        values.append(
+            high | ((counter >> _RAND_B_BITS) << 64) | (counter & _RAND_B_MASK)
+        )
+    _last[:] = (ms, counter)
+
+    if as_bytes:
+        return [v.to_bytes(16, "big") for v in values]
+    return [uuid.UUID(int=v) for v in values]
+
+
+def uuid7_time(uid: uuid.UUID) -> datetime:
+    """The millisecond timestamp embedded in a uuid7, as an aware datetime."""
+    return _EPOCH + timedelta(milliseconds=uid.int >> 80)
+
+
+def uuid7_min(moment: datetime) -> uuid.UUID:
+    """
+    The smallest uuid7 minted at or after `moment` (naive datetimes are UTC).
+    `uid >= uuid7_min(t)` is `created_at >= t` and `uid < uuid7_min(t)` is
+    `created_at < t` for rows whose created_at is their key's timestamp.
+    """
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=UTC)
+    us: int = (moment - _EPOCH) // timedelta(microseconds=1)
+    ms: int = max(-(-us // 1000), 0)
+    return uuid.UUID(int=(ms << 80) | _VERSION_VARIANT)
+
+
 def format_byte_array_as_uuid(arr: bytes):
     return f"{arr[:4].hex()}-{arr[4:6].hex()}-{arr[6:8].hex()}-{arr[8:10].hex()}-{arr[10:].hex()}"
 
 
-__all__ = ("uuid7",)
+__all__ = ("uuid7", "uuid7_batch", "uuid7_min", "uuid7_time")